@@ -0,0 +1,7 @@
+"""
+Tank Battle: a top-down tank game with AI squads and an optional network server.
+
+Run the game with `python -m tank_game` (add --profile-startup for a per-stage startup report),
+the server with `python -m tank_game.server` and the client with `python -m tank_game.client`.
+Importing the package or its modules opens no window and loads no assets.
+"""
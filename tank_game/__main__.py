@@ -0,0 +1,18 @@
+import time
+start_time = time.perf_counter() # Startup is timed from here (the 'import' stage covers loading the game modules)
+
+import argparse
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tank Battle.")
+    parser.add_argument('--profile-startup', action='store_true', help="Print the time spent in each startup stage")
+    parser.add_argument('--metrics', metavar='PATH', help="Append each level's combat statistics to this CSV file")
+    args = parser.parse_args()
+
+    from . import game # Imported here so the profile's 'import' stage includes pygame and the game modules
+    game.run(start_time, profile_startup=args.profile_startup, metrics_path=args.metrics)
+
+
+if __name__ == '__main__':
+    main()
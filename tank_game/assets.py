@@ -0,0 +1,164 @@
+import os
+import json
+import hashlib
+import threading
+import time
+import pygame
+from .constants import *
+from .utilities import DummySound
+
+# ----------------------------------------------------
+# --- ASSET MANAGER CLASS ---
+# ----------------------------------------------------
+class AssetManager:
+    """
+    Loads the game's sounds and font on a background thread while the first frames are drawn.
+    Until loading finishes, sound() returns a DummySound and font() pygame's built-in font;
+    poll() tells the game loop when to swap the real assets in.
+    Decoded sound buffers (per mixer format) and the resolved system font path are kept in the
+    per-user cache directory, so later launches skip the decoding and the system font scan.
+    The cache holds only data: a JSON index plus one file of raw samples per sound.
+    """
+    def __init__(self, sound_paths, font_name, cache_dir=None):
+        self.sound_paths = sound_paths # name -> sound file path
+        self.font_name = font_name
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.index_path = os.path.join(self.cache_dir, 'index.json')
+        self.sounds = {} # name -> pygame.mixer.Sound, published by the loader when it is done
+        self.font_path = None # Resolved system font file (None: pygame's default font)
+        self.fonts = {} # (path, size) -> pygame.font.Font, created on the main thread
+        self.ready = threading.Event()
+        self.swapped = False
+        self.thread = None
+
+        # Loader statistics
+        self.load_time = None # Seconds the background load took
+        self.cache_hits = 0 # Assets restored from the cache instead of decoded/scanned
+
+    def start(self):
+        """Starts the background loader (returns immediately)."""
+        self.thread = threading.Thread(target=self._load, name="asset-loader", daemon=True)
+        self.thread.start()
+
+    def poll(self):
+        """Returns True once, on the first call after loading finished: time to swap the real assets in."""
+        if self.swapped or not self.ready.is_set():
+            return False
+        self.swapped = True
+        return True
+
+    def wait(self, timeout=None):
+        """Blocks until loading finished (for tools that need the real assets right away)."""
+        return self.ready.wait(timeout)
+
+    def sound(self, name):
+        """The loaded sound, or a silent placeholder while loading (or if the file is missing)."""
+        return self.sounds.get(name) or DummySound()
+
+    def font(self, size):
+        """The loaded font at `size`, or pygame's built-in font while loading."""
+        path = self.font_path if self.ready.is_set() else None
+        font = self.fonts.get((path, size))
+        if font is None:
+            font = self.fonts[(path, size)] = pygame.font.Font(path, size)
+        return font
+
+    # --- Loader thread ---
+    def _load(self):
+        start = time.perf_counter()
+        index = self._read_index()
+        new_index = {'version': ASSET_CACHE_VERSION, 'fonts': dict(index['fonts']), 'sounds': []}
+
+        # 1. Font: resolving a system font name scans every installed font, so the result is cached
+        font_path = index['fonts'].get(self.font_name)
+        if isinstance(font_path, str) and os.path.isfile(font_path):
+            self.cache_hits += 1
+        else:
+            font_path = pygame.font.match_font(self.font_name)
+            new_index['fonts'][self.font_name] = font_path
+
+        # 2. Sounds: the decoded (mixer-format) samples are cached per file version and mixer format
+        sounds = {}
+        mixer_format = pygame.mixer.get_init()
+        if mixer_format:
+            cached_sounds = set(index['sounds'])
+            for name, path in self.sound_paths.items():
+                try:
+                    stat = os.stat(path)
+                    key = f"{os.path.abspath(path)}|{stat.st_mtime_ns}|{stat.st_size}|{mixer_format}"
+                    raw = self._read_samples(key) if key in cached_sounds else None
+                    if raw is not None:
+                        sound = pygame.mixer.Sound(buffer=raw)
+                        self.cache_hits += 1
+                    else:
+                        sound = pygame.mixer.Sound(path)
+                        self._write_samples(key, sound.get_raw())
+                except (OSError, pygame.error) as e:
+                    print(f"Warning: Could not load sound '{path}'. Error: {e}")
+                    continue
+                new_index['sounds'].append(key)
+                sounds[name] = sound
+
+        if new_index != index:
+            self._write_index(new_index)
+
+        # Publish (single assignments, read by the main thread only after ready is set)
+        self.sounds = sounds
+        self.font_path = font_path
+        self.load_time = time.perf_counter() - start
+        self.ready.set()
+
+    # --- Cache files ---
+    def _samples_path(self, key):
+        """Raw sample file of a sound key (named from its hash, never from the index contents)."""
+        return os.path.join(self.cache_dir, hashlib.sha1(key.encode()).hexdigest() + '.raw')
+
+    def _read_samples(self, key):
+        try:
+            with open(self._samples_path(key), 'rb') as f:
+                return f.read() or None
+        except OSError:
+            return None
+
+    def _write_samples(self, key, raw):
+        self._write_file(self._samples_path(key), raw)
+
+    def _read_index(self):
+        """The JSON index ({'version', 'fonts': {name: path}, 'sounds': [key]}); an empty one if missing, stale or malformed."""
+        empty = {'version': ASSET_CACHE_VERSION, 'fonts': {}, 'sounds': []}
+        try:
+            with open(self.index_path, encoding='utf-8') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return empty
+        if (not isinstance(index, dict) or index.get('version') != ASSET_CACHE_VERSION or
+                not isinstance(index.get('fonts'), dict) or not isinstance(index.get('sounds'), list)):
+            return empty
+        return index
+
+    def _write_index(self, index):
+        self._write_file(self.index_path, json.dumps(index, indent=1).encode('utf-8'))
+        # Sample files of sounds no longer indexed (changed files, other mixer formats) are stale
+        keep = {os.path.basename(self._samples_path(key)) for key in index['sounds']}
+        try:
+            for file_name in os.listdir(self.cache_dir):
+                if file_name.endswith('.raw') and file_name not in keep:
+                    os.remove(os.path.join(self.cache_dir, file_name))
+        except OSError:
+            pass
+
+    def _write_file(self, path, data):
+        temp_path = path + '.tmp'
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path) # Never leave a half-written cache file behind
+        except OSError as e:
+            print(f"Warning: Could not write the asset cache. Error: {e}")
+
+def default_cache_dir():
+    """The game's folder in the per-user cache directory (%LOCALAPPDATA%, $XDG_CACHE_HOME or ~/.cache)."""
+    base = os.environ.get('LOCALAPPDATA') if os.name == 'nt' else None
+    base = base or os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, ASSET_CACHE_DIR_NAME)
@@ -0,0 +1,97 @@
+import math
+import pygame
+from .constants import *
+
+# ----------------------------------------------------
+# --- DISTANCE ATTENUATION ---
+# ----------------------------------------------------
+def distance_gain(x, y, listener_x, listener_y):
+    """Linear falloff of a sound at (x, y): 1.0 at the listener, 0.0 at MAX_SOUND_DISTANCE and beyond."""
+    dx = x - listener_x
+    dy = y - listener_y
+    distance_sq = dx * dx + dy * dy
+    if distance_sq >= MAX_SOUND_DISTANCE * MAX_SOUND_DISTANCE: # Out of earshot: skip the square root
+        return 0.0
+    return 1.0 - math.sqrt(distance_sq) / MAX_SOUND_DISTANCE
+
+# ----------------------------------------------------
+# --- AUDIO MANAGER CLASS ---
+# ----------------------------------------------------
+class AudioManager:
+    """
+    Per-frame sound mixing with a bounded cost: events are queued during the frame and flushed
+    once. The flush coalesces same-type events from the same area, culls the inaudible ones
+    before any mixer call, and plays the rest on a fixed pool of mixer channels, the most
+    important (priority, then loudness) first. A busy channel is only taken over by a more
+    important sound. Each channel gets its own volume and stereo pan, so sounds in flight are
+    never changed by later ones.
+    """
+    def __init__(self, sounds, channels=AUDIO_CHANNELS):
+        self.set_sounds(sounds)
+        self.channels = []
+        if pygame.mixer.get_init():
+            pygame.mixer.set_num_channels(max(channels, pygame.mixer.get_num_channels()))
+            self.channels = [pygame.mixer.Channel(i) for i in range(channels)]
+        self.voices = [None] * len(self.channels) # (priority, gain) of what each channel is playing
+        self.pending = {} # Coalescing key -> (sound_type, x, y)
+
+        # Counters for tuning
+        self.queued = 0 # Events queued
+        self.played = 0 # Events that reached the mixer
+
+    def set_sounds(self, sounds):
+        """Sets the sound played for each event type (e.g. once the real sounds finished loading)."""
+        # Only real mixer sounds can be played on a channel (DummySound placeholders are skipped)
+        self.sounds = {name: sound for name, sound in sounds.items() if isinstance(sound, pygame.mixer.Sound)}
+
+    def queue(self, sound_type, x, y):
+        """Queues a sound event at world position (x, y) for the next flush()."""
+        self.queued += 1
+        cell = AUDIO_COALESCE_DISTANCE
+        self.pending.setdefault((sound_type, int(x // cell), int(y // cell)), (sound_type, x, y))
+
+    def flush(self, listener_x, listener_y):
+        """Plays this frame's queued events relative to the listener, then clears the queue."""
+        pending = self.pending
+        self.pending = {}
+        if not self.channels:
+            return
+
+        # 1. Cull: unknown sounds and events too far away to hear
+        audible = []
+        for sound_type, x, y in pending.values():
+            sound = self.sounds.get(sound_type)
+            if sound is None:
+                continue
+            gain = distance_gain(x, y, listener_x, listener_y)
+            if gain >= AUDIO_MIN_GAIN:
+                audible.append((AUDIO_PRIORITIES.get(sound_type, 0), gain, sound, x - listener_x))
+
+        # 2. Most important first; at most one event per channel reaches the mixer
+        audible.sort(key=lambda event: (event[0], event[1]), reverse=True)
+        for priority, gain, sound, offset_x in audible[:len(self.channels)]:
+            index = self._pick_channel(priority, gain)
+            if index is None:
+                break # Every channel holds something more important (and the rest are less so)
+            pan = max(-1.0, min(1.0, offset_x / AUDIO_PAN_DISTANCE))
+            channel = self.channels[index]
+            channel.play(sound)
+            channel.set_volume(gain * min(1.0, 1.0 - pan), gain * min(1.0, 1.0 + pan))
+            self.voices[index] = (priority, gain)
+            self.played += 1
+
+    def _pick_channel(self, priority, gain):
+        """Index of a free channel, else of the least important busy one if it ranks below (priority, gain)."""
+        weakest = None
+        for index, channel in enumerate(self.channels):
+            if not channel.get_busy():
+                return index
+            if weakest is None or self.voices[index] < self.voices[weakest]:
+                weakest = index
+        if weakest is not None and self.voices[weakest] < (priority, gain):
+            return weakest
+        return None
+
+    def stats(self):
+        """Returns the counters as a dict (for debugging/HUD output)."""
+        return {'queued': self.queued, 'played': self.played, 'channels': len(self.channels)}
@@ -0,0 +1,84 @@
+import os
+import argparse
+import random
+import time
+import pygame
+from .constants import *
+from .sprites import EnemyTank, FriendlyAITank
+from .world import World
+from . import netcodec
+from .netcodec import snapshot_tanks, bullet_row, sound_event_rows, encode_frame, decode_frame, SnapshotHistory
+
+# ----------------------------------------------------
+# --- NETWORK CODEC BENCHMARK ---
+# ----------------------------------------------------
+# Runs a headless World with N AI tanks and encodes every tick the way server.py does:
+# a delta against the frame the client acknowledged `ack_lag` ticks ago, and a full frame for comparison.
+
+def run(num_tanks, ticks, ack_lag, seed):
+    random.seed(seed)
+    pygame.init()
+    world = World()
+    world.generate_chunks_around(0, 0)
+    planner = world.spawn_planner(spawn_area_size=4)
+    for i, (x, y) in enumerate(planner.place(num_tanks, SPAWN_MIN_DISTANCE)):
+        tank_class = FriendlyAITank if i % 2 else EnemyTank
+        world.add_tank(tank_class(x, y))
+
+    sender_history = SnapshotHistory()
+    receiver_history = SnapshotHistory()
+    totals = {'snapshot': 0.0, 'encode': 0.0, 'decode': 0.0, 'full_encode': 0.0}
+    delta_bytes = full_bytes = 0
+
+    for tick in range(1, ticks + 1):
+        world.update_ai()
+        world.update_bullets()
+        world.resolve_hits()
+        events = [row for row, _, _ in sound_event_rows(world.events.drain())]
+
+        start = time.perf_counter()
+        tanks = snapshot_tanks(world.tanks)
+        bullets = [bullet_row(bullet) for bullet in world.bullets]
+        totals['snapshot'] += time.perf_counter() - start
+        sender_history.add(tick, tanks)
+
+        base_tick = tick - ack_lag
+        base_tanks = sender_history.get(base_tick)
+        start = time.perf_counter()
+        payload = encode_frame(tick, tanks, bullets, events, base_tick, base_tanks)
+        totals['encode'] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        decoded_tick, decoded_tanks, _, _ = decode_frame(payload, receiver_history)
+        totals['decode'] += time.perf_counter() - start
+        receiver_history.add(decoded_tick, decoded_tanks)
+
+        start = time.perf_counter()
+        full_payload = encode_frame(tick, tanks, bullets, events)
+        totals['full_encode'] += time.perf_counter() - start
+
+        delta_bytes += len(payload)
+        full_bytes += len(full_payload)
+
+    world.shutdown()
+    print(f"{num_tanks} tanks, {ticks} ticks, ack lag {ack_lag}, NumPy {'on' if netcodec.np is not None else 'off'}")
+    print(f"  bytes/tick:   delta {delta_bytes / ticks:8.0f}   full {full_bytes / ticks:8.0f}")
+    for name, total in totals.items():
+        print(f"  {name + ' us/tick:':22} {total / ticks * 1e6:8.1f}")
+
+
+def main():
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy') # Headless
+    parser = argparse.ArgumentParser(description="Bytes and encode/decode time per tick of the world state codec.")
+    parser.add_argument('--tanks', type=int, default=200)
+    parser.add_argument('--ticks', type=int, default=600)
+    parser.add_argument('--ack-lag', type=int, default=3, help="Ticks between a frame and its acknowledgement")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--no-numpy', action='store_true', help="Use the pure-Python codec path")
+    args = parser.parse_args()
+    if args.no_numpy:
+        netcodec.np = None
+    run(args.tanks, args.ticks, args.ack_lag, args.seed)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+from .constants import *
+
+# ----------------------------------------------------
+# --- CHUNK ACTIVATION ---
+# ----------------------------------------------------
+class ChunkActivation:
+    """
+    Reference counts of the terrain chunks needed by the active units (tanks, bullets in flight, observers):
+    every unit holds the chunks within `radius` chunks of the one it is in. Only units that changed chunk
+    since the last update touch the counts, so an update costs one chunk lookup per unit.
+    A chunk whose count drops to zero becomes idle and is evicted once it has stayed idle for `evict_delay`
+    frames (checked every CHUNK_EVICT_INTERVAL frames, so evictions come in batches and a unit moving back
+    and forth across a chunk border does not unload and regenerate the same terrain).
+    Updated every CHUNK_ACTIVATION_INTERVAL frames: a unit cannot leave the neighbourhood it was counted in
+    between two updates.
+    """
+    def __init__(self, radius=CHUNK_LOAD_RADIUS, evict_delay=CHUNK_EVICT_DELAY):
+        self.radius = radius
+        self.evict_delay = evict_delay
+        self.refs = {} # (chunk_x, chunk_y) -> units whose neighbourhood includes the chunk
+        self.unit_chunks = {} # unit key -> chunk it was counted in at the last update
+        self.idle = {} # (chunk_x, chunk_y) -> frame its count dropped to zero (or it was loaded without one)
+        self.last_eviction_check = 0
+
+    def clear(self):
+        self.refs.clear()
+        self.unit_chunks.clear()
+        self.idle.clear()
+        self.last_eviction_check = 0
+
+    def _neighbourhood(self, chunk):
+        radius = self.radius
+        chunk_x, chunk_y = chunk
+        return [(x, y) for y in range(chunk_y - radius, chunk_y + radius + 1)
+                for x in range(chunk_x - radius, chunk_x + radius + 1)]
+
+    def update(self, units, frame):
+        """
+        Recounts from this frame's units, a list of (key, x, y) with a key that is stable while the unit
+        exists (the tank or bullet itself). Returns (needed, expired): chunks that gained their first
+        unit (to load unless already loaded) and idle chunks past the eviction delay (to unload).
+        """
+        refs = self.refs
+        previous = self.unit_chunks
+        current = {}
+        needed = []
+        released = []
+        for key, x, y in units:
+            chunk = (int(x) // CHUNK_SIZE, int(y) // CHUNK_SIZE)
+            current[key] = chunk
+            old_chunk = previous.pop(key, None)
+            if old_chunk == chunk:
+                continue
+            # The new neighbourhood is counted before the old one is released, so shared chunks never go idle
+            for neighbour in self._neighbourhood(chunk):
+                count = refs.get(neighbour, 0)
+                if not count:
+                    self.idle.pop(neighbour, None)
+                    needed.append(neighbour)
+                refs[neighbour] = count + 1
+            if old_chunk is not None:
+                released.append(old_chunk)
+        released.extend(previous.values()) # Units that are gone (destroyed tanks, expired bullets)
+        self.unit_chunks = current
+
+        for chunk in released:
+            for neighbour in self._neighbourhood(chunk):
+                count = refs[neighbour] - 1
+                if count:
+                    refs[neighbour] = count
+                else:
+                    del refs[neighbour]
+                    self.idle[neighbour] = frame
+
+        expired = []
+        if frame - self.last_eviction_check >= CHUNK_EVICT_INTERVAL:
+            self.last_eviction_check = frame
+            expired = [chunk for chunk, since in self.idle.items() if frame - since >= self.evict_delay]
+            for chunk in expired:
+                del self.idle[chunk]
+        return needed, expired
+
+    def loaded(self, chunk, frame):
+        """A chunk was loaded: if no unit needs it (e.g. the start area before anything spawned), it starts out idle."""
+        if chunk not in self.refs:
+            self.idle[chunk] = frame
+
+    def stats(self):
+        return {'referenced': len(self.refs), 'idle': len(self.idle), 'units': len(self.unit_chunks)}
@@ -0,0 +1,241 @@
+import argparse
+import asyncio
+import random
+import struct
+import sys
+import pygame
+from .constants import *
+from .sprites import Tank
+from .fastmath import atan2_deg
+from .render import BatchRenderer, camera_offsets
+from .spatial import WorldBounds, DEFAULT_WORLD_BOUNDS
+from .netproto import *
+from .netcodec import FLAG_ALIVE, FLAG_WRECK, FLAG_FRIENDLY, EVENT_TYPES, decode_frame, table_rows, SnapshotHistory
+
+# ----------------------------------------------------
+# --- CLIENT-SIDE WORLD MIRROR ---
+# ----------------------------------------------------
+class RemoteWorld:
+    """What a client knows about the server's world: terrain, tanks (by id) and bullets."""
+    def __init__(self):
+        self.terrain_features = []
+        self.tanks = {} # tank id -> Tank used only for drawing
+        self.bullets = [] # (x, y, fired_by_enemy) in world units
+        self.events = [] # (sound_type, x, y) of the last frame
+        self.my_tank_id = None
+        self.tick_rate = SERVER_TICK_RATE
+        self.bounds = DEFAULT_WORLD_BOUNDS # Of the current level (sent with every welcome)
+        self.last_tick = 0 # Acknowledged to the server with every input
+        self.history = SnapshotHistory() # Decoded tank tables (baselines of the next delta frames)
+
+    def apply(self, msg_type, payload):
+        """Applies one server message."""
+        if msg_type == MSG_WELCOME:
+            self.my_tank_id, self.tick_rate, *bounds = WELCOME.unpack(payload)
+            self.bounds = WorldBounds(*bounds)
+        elif msg_type == MSG_TERRAIN:
+            replace, rects = decode_terrain(payload)
+            if replace:
+                self.terrain_features = []
+            self.terrain_features.extend(pygame.Rect(rect) for rect in rects)
+        elif msg_type == MSG_STATE:
+            tick, table, bullet_rows, event_rows = decode_frame(payload, self.history)
+            self.history.add(tick, table)
+            self.last_tick = tick
+
+            rows = table_rows(table)
+            live_ids = {row[0] for row in rows}
+            for tank_id in [tank_id for tank_id in self.tanks if tank_id not in live_ids]:
+                del self.tanks[tank_id]
+            for row in rows:
+                self._apply_tank_row(row)
+            self.bullets = [(x / NET_POSITION_SCALE, y / NET_POSITION_SCALE, enemy) for x, y, enemy in bullet_rows]
+            self.events = [(EVENT_TYPES[kind], x / NET_POSITION_SCALE, y / NET_POSITION_SCALE)
+                           for kind, x, y, _ in event_rows]
+
+    def _apply_tank_row(self, row):
+        tank_id, x, y, angle, turret_angle, health, flags = row
+        tank = self.tanks.get(tank_id)
+        allegiance = 'Friendly' if flags & FLAG_FRIENDLY else 'Enemy'
+        if tank is None or tank.allegiance != allegiance:
+            tank = Tank(0, 0, allegiance)
+            self.tanks[tank_id] = tank
+        tank.x = x / NET_POSITION_SCALE
+        tank.y = y / NET_POSITION_SCALE
+        tank.angle = angle
+        tank.turret_angle = turret_angle
+        tank.health = health
+        tank.is_alive = bool(flags & FLAG_ALIVE)
+        tank.is_wreck = bool(flags & FLAG_WRECK)
+
+    def my_tank(self):
+        return self.tanks.get(self.my_tank_id)
+
+# ----------------------------------------------------
+# --- NETWORK CLIENT ---
+# ----------------------------------------------------
+class GameClient:
+    """Thin client: sends inputs, mirrors the server state. Rendering is optional (bots run headless)."""
+    def __init__(self, host=SERVER_HOST, port=SERVER_PORT):
+        self.host = host
+        self.port = port
+        self.world = RemoteWorld()
+        self.reader = None
+        self.writer = None
+        self.connected = False
+        self.bytes_received = 0
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        self.writer.write(pack_message(MSG_HELLO))
+        self.connected = True
+
+    async def receive_loop(self):
+        """Applies server messages until the connection closes."""
+        try:
+            while True:
+                msg_type, payload = await read_message(self.reader)
+                self.bytes_received += HEADER.size + len(payload)
+                self.world.apply(msg_type, payload)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except (KeyError, IndexError, ValueError, struct.error) as error: # Undecodable message (e.g. unknown baseline)
+            print(f"Client: bad message from the server ({error!r}), disconnecting.", file=sys.stderr)
+        finally:
+            self.connected = False
+            self.close()
+
+    def send_input(self, drive_system, pressed_actions, aim_angle, fire):
+        if self.connected:
+            self.writer.write(encode_input(drive_system, pressed_actions, aim_angle, fire, self.world.last_tick))
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+# ----------------------------------------------------
+# --- RENDERING ---
+# ----------------------------------------------------
+def draw_remote_world(screen, renderer, world, font, camera_offset_x, camera_offset_y):
+    screen.fill(GREEN)
+
+    # Terrain
+    for feature in world.terrain_features:
+        pygame.draw.rect(screen, BROWN, feature.move(camera_offset_x, camera_offset_y))
+
+    # World boundary
+    bounds = world.bounds
+    boundary = pygame.Rect(bounds.min_x + camera_offset_x, bounds.min_y + camera_offset_y, bounds.width, bounds.height)
+    pygame.draw.rect(screen, BOUNDARY_COLOR, boundary, 5)
+
+    # Bullets, then tanks (wrecks first, then live tanks)
+    renderer.draw_bullets(screen, [(x, y, RED if fired_by_enemy else YELLOW) for x, y, fired_by_enemy in world.bullets],
+                          camera_offset_x, camera_offset_y)
+    renderer.draw_tanks(screen, world.tanks.values(), camera_offset_x, camera_offset_y)
+
+    enemies = sum(1 for t in world.tanks.values() if t.allegiance == 'Enemy' and t.is_alive)
+    status = font.render(f"Tick {world.last_tick}  Enemies: {enemies}", True, WHITE)
+    screen.blit(status, (10, 10))
+
+# ----------------------------------------------------
+# --- CLIENT MODES ---
+# ----------------------------------------------------
+async def run_player(host, port):
+    """Interactive client: keyboard/mouse input, rendering with the camera on the player's tank."""
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption("Tank Battle (network client)")
+    font = pygame.font.Font(None, 24)
+    renderer = BatchRenderer()
+    clock = pygame.time.Clock()
+
+    client = GameClient(host, port)
+    await client.connect()
+    receive_task = asyncio.create_task(client.receive_loop())
+    drive_system = DEFAULT_DRIVE_SYSTEM
+    control_keys = {
+        DRIVE_SYSTEM_STANDARD: {'f': KEY_FORWARD, 'r': KEY_REVERSE, 'l': KEY_TURN_LEFT, 's': KEY_TURN_RIGHT},
+        DRIVE_SYSTEM_INDEPENDENT: {'lf': KEY_LEFT_FORWARD, 'lr': KEY_LEFT_REVERSE,
+                                   'rf': KEY_RIGHT_FORWARD, 'rr': KEY_RIGHT_REVERSE},
+    }
+
+    running = True
+    while running and client.connected:
+        fire = False
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                fire = True
+
+        my_tank = client.world.my_tank()
+        center = (my_tank.x, my_tank.y) if my_tank else (0, 0)
+        camera_offset_x, camera_offset_y = camera_offsets(*center, client.world.bounds)
+
+        # Input: held drive keys and the aim angle from the mouse (relative to the tank on screen)
+        keys = pygame.key.get_pressed()
+        pressed = [action for action, key in control_keys[drive_system].items() if keys[key]]
+        mouse_x, mouse_y = pygame.mouse.get_pos()
+        aim_angle = atan2_deg(-(mouse_y - (center[1] + camera_offset_y)), mouse_x - (center[0] + camera_offset_x))
+        client.send_input(drive_system, pressed, aim_angle, fire)
+
+        draw_remote_world(screen, renderer, client.world, font, camera_offset_x, camera_offset_y)
+        pygame.display.flip()
+
+        clock.tick(FPS * 2) # Keep the frame time short so the event loop stays responsive
+        await asyncio.sleep(0)
+
+    if running:
+        print("Client: disconnected from the server.", file=sys.stderr)
+    client.close()
+    receive_task.cancel()
+    pygame.quit()
+
+async def run_bot(host, port, duration, seed):
+    """Headless client sending random inputs (load testing). Returns the number of bytes received."""
+    rng = random.Random(seed)
+    client = GameClient(host, port)
+    await client.connect()
+    receive_task = asyncio.create_task(client.receive_loop())
+
+    loop = asyncio.get_running_loop()
+    end_time = loop.time() + duration
+    action = rng.choice(('f', 'l', 's', 'r'))
+    aim_angle = 0.0
+    while client.connected and loop.time() < end_time:
+        if rng.random() < 0.05:
+            action = rng.choice(('f', 'l', 's', 'r'))
+            aim_angle = rng.uniform(-180, 180)
+        client.send_input(DRIVE_SYSTEM_STANDARD, [action], aim_angle, rng.random() < 0.05)
+        await asyncio.sleep(1.0 / FPS)
+
+    client.close()
+    receive_task.cancel()
+    return client.bytes_received
+
+async def run_bots(host, port, count, duration):
+    received = await asyncio.gather(*(run_bot(host, port, duration, seed) for seed in range(count)))
+    for i, total in enumerate(received):
+        print(f"Bot {i}: received {total} bytes ({total / duration / 1024:.1f} KiB/s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tank Battle network client.")
+    parser.add_argument('--host', default=SERVER_HOST)
+    parser.add_argument('--port', type=int, default=SERVER_PORT)
+    parser.add_argument('--bots', type=int, default=0, help="Run this many headless random-input clients instead")
+    parser.add_argument('--duration', type=float, default=10.0, help="Seconds the bots stay connected")
+    args = parser.parse_args()
+
+    try:
+        if args.bots:
+            asyncio.run(run_bots(args.host, args.port, args.bots, args.duration))
+        else:
+            asyncio.run(run_player(args.host, args.port))
+    except ConnectionRefusedError:
+        print(f"Could not connect to {args.host}:{args.port}.", file=sys.stderr)
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,37 @@
+from .constants import *
+from .fastmath import sin_deg, cos_deg
+
+# ----------------------------------------------------
+# --- SEGMENT INTERSECTION TESTS ---
+# ----------------------------------------------------
+def segment_aabb(x0, y0, dx, dy, left, top, right, bottom):
+    """
+    Slab test of the segment (x0, y0) + t * (dx, dy), t in [0, 1], against an axis-aligned box.
+    Returns the parametric (t_enter, t_exit) of the part inside the box, or None if it misses.
+    """
+    t_enter, t_exit = 0.0, 1.0
+    for start, delta, low, high in ((x0, dx, left, right), (y0, dy, top, bottom)):
+        if delta == 0:
+            if start < low or start > high:
+                return None
+            continue
+        t_low = (low - start) / delta
+        t_high = (high - start) / delta
+        if t_low > t_high:
+            t_low, t_high = t_high, t_low
+        t_enter = max(t_enter, t_low)
+        t_exit = min(t_exit, t_high)
+        if t_enter > t_exit:
+            return None
+    return t_enter, t_exit
+
+def segment_obb(x0, y0, dx, dy, center_x, center_y, half_width, half_height, angle):
+    """
+    segment_aabb() against a box rotated by `angle` degrees (clockwise, like a tank body)
+    around its center: the segment is rotated into the box's frame instead.
+    """
+    cos_a, sin_a = cos_deg(angle), sin_deg(angle)
+    rel_x, rel_y = x0 - center_x, y0 - center_y
+    return segment_aabb(rel_x * cos_a + rel_y * sin_a, rel_y * cos_a - rel_x * sin_a,
+                        dx * cos_a + dy * sin_a, dy * cos_a - dx * sin_a,
+                        -half_width, -half_height, half_width, half_height)
@@ -0,0 +1,176 @@
+import os
+import pygame
+
+# --- SCREEN & GAME SETTINGS ---
+SCREEN_WIDTH = 1200
+SCREEN_HEIGHT = 800
+FPS = 60 # Simulation steps per second: every duration counted in frames below counts these steps
+SIM_STEP = 1.0 / FPS # Seconds of game time per simulation step
+MAX_RENDER_FPS = 240 # Cap on drawn frames per second; drawing interpolates between simulation steps (0 = no cap)
+MAX_SIM_STEPS_PER_FRAME = 5 # Beyond this the game slows down instead of falling further behind (CPU saturated)
+
+# --- GAME STATES ---
+STATE_GAMEPLAY = 0
+STATE_PAUSED = 1
+STATE_OPTIONS = 2
+MAX_LEVEL = 5 # Number of levels before the ultimate victory
+
+# --- DRIVE SYSTEMS ---
+DRIVE_SYSTEM_STANDARD = 'Standard'
+DRIVE_SYSTEM_INDEPENDENT = 'Independent'
+DEFAULT_DRIVE_SYSTEM = DRIVE_SYSTEM_INDEPENDENT
+
+# --- WORLD SETTINGS ---
+CHUNK_SIZE = 500  # Size of a single terrain chunk in world units
+FEATURE_DENSITY = 0.005 # Probability of placing an obstacle at a given coordinate ##0.0005 originally
+DEFAULT_WORLD_SIZE = 2000 # Width and height of a level's world (centered on 0, 0) unless LEVEL_WORLD_SIZES says otherwise
+LEVEL_WORLD_SIZES = {} # level -> world size, for levels played on larger maps (any size: terrain is kept only near units)
+CHUNK_LOAD_RADIUS = 1 # Chunks within this many chunks of a tank, bullet or observer are kept loaded
+CHUNK_ACTIVATION_INTERVAL = 8 # Frames between chunk activation updates (a tank moves 24 units meanwhile: well inside the
+                              # chunk of margin left around it after its size and a full bullet flight)
+CHUNK_EVICT_DELAY = 120 # Frames a chunk no unit needs stays loaded before it is unloaded (regenerated identically from the seed)
+CHUNK_EVICT_INTERVAL = 30 # Frames between checks for chunks to unload (evictions are batched into one terrain refresh)
+MAX_TERRAIN_EDITS = 4096 # Loaded/unloaded features logged for the renderer's chunk cache before it is simply rebuilt
+TERRAIN_CELL_SIZE = 100 # Cell size of the terrain collision grid (TerrainIndex)
+SPAWN_CELL_SIZE = 10 # Cell size of the occupancy grid the spawn planner samples from
+SPAWN_MIN_DISTANCE = 150 # Minimum distance between spawned tanks
+
+# --- MATH ---
+TRIG_TABLE_STEPS_PER_DEGREE = 10 # Resolution of the sin/cos lookup tables (fastmath.py)
+
+# --- TANK PARAMETERS ---
+TANK_WIDTH = 40
+TANK_HEIGHT = 60
+TANK_BOUNDING_RADIUS = (TANK_WIDTH ** 2 + TANK_HEIGHT ** 2) ** 0.5 / 2 # Half diagonal: holds the body at any angle
+TANK_ACCEL = 0.1
+TANK_MAX_SPEED = 3.0
+BASE_TURN_RATE = 1.0 # Degrees per frame
+MAX_HEALTH = 100
+
+# --- AI THREADING ---
+AI_WORKER_THREADS = min(16, os.cpu_count() or 1) # Threads for the AI sense/think phase (1 = serial)
+AI_PARALLEL_MIN_TANKS = 64 # Below this many AI tanks the think phase runs serially (thread overhead dominates)
+
+# --- AI LINE OF SIGHT ---
+LOS_CACHE_CELL_SIZE = 40 # Shooters/targets within the same cells share one line-of-sight answer per frame
+
+# --- TURRET PARAMETERS ---
+TURRET_ROTATION_SPEED = 1.5 # Degrees per frame
+
+# --- PLAYER CONTROLS (DEFAULT BINDINGS) ---
+# Standard Drive Keys
+KEY_FORWARD = pygame.K_w
+KEY_REVERSE = pygame.K_r
+KEY_TURN_LEFT = pygame.K_a
+KEY_TURN_RIGHT = pygame.K_s
+
+# Independent Track Drive Keys
+KEY_LEFT_FORWARD = pygame.K_q
+KEY_LEFT_REVERSE = pygame.K_a
+KEY_RIGHT_FORWARD = pygame.K_w
+KEY_RIGHT_REVERSE = pygame.K_r
+
+# Pause Key
+KEY_PAUSE = pygame.K_p
+KEY_OPTIONS = pygame.K_o
+
+
+# --- TURRET & WEAPONS ---
+TURRET_LENGTH = 40
+TURRET_LINE_WIDTH = 6
+FIRE_COOLDOWN_FRAMES = 180 # 1 second cooldown at 60 FPS ## changed from 60 to 180
+BULLET_SPEED = 10.0
+BULLET_RADIUS = 5
+BULLET_DAMAGE = 25
+BULLET_LIFESPAN = 200 # Frames (5 seconds) ## 300 frames is 5 seconds
+MAX_BULLET_RANGE = 400 # Max range before bullet despawns orig 600
+BULLET_BROADPHASE_CELL_SIZE = 200 # Cell size of the live-tank grid the bullet sweeps query
+
+# --- OBJECT POOLS ---
+BULLET_POOL_SIZE = 256 # Max number of dead bullets kept for reuse
+INDICATOR_POOL_SIZE = 64 # Max number of dead sound indicators kept for reuse
+
+# --- AREA OF INTEREST & LEVEL OF DETAIL ---
+INTEREST_CELL_SIZE = 500 # Cell size of the entity grid used for interest queries
+INTEREST_RADIUS = int((SCREEN_WIDTH ** 2 + SCREEN_HEIGHT ** 2) ** 0.5 / 2) + MAX_BULLET_RANGE # Viewport plus firing range
+LOD_TIER_DISTANCES = (INTEREST_RADIUS, 2 * INTEREST_RADIUS) # Tier boundaries (distance to the nearest observer)
+LOD_TIER_INTERVALS = (1, 4, 8) # Frames per AI update (and movement timestep) in each tier, nearest first
+
+# --- COLORS (R, G, B) ---
+BLACK = (0, 0, 0)
+WHITE = (255, 255, 255)
+RED = (200, 50, 50)
+YELLOW = (255, 255, 0)
+GREEN = (100, 150, 50) # Map Background
+BROWN = (139, 69, 19) # Terrain Features (Obstacles)
+DARK_GRAY = (50, 50, 50)
+PLAYER_COLOR = (50, 150, 200) # Blueish for player
+ENEMY_COLOR = (200, 50, 50) # Redish for enemies
+BOUNDARY_COLOR = (255, 0, 0)
+HP_BAR_GREEN = (0, 200, 0)
+WRECK_COLOR_BODY = (80, 80, 80)
+WRECK_COLOR_SMOKE = (150, 150, 150)
+
+# --- BATCHED DRAWING ---
+SPRITE_ROTATION_STEP = 1 # Degrees between the cached rotations of a tank body (render.py)
+
+# --- QUALITY GOVERNOR ---
+QUALITY_FRAME_BUDGET = SIM_STEP # Seconds of work per drawn frame the governor aims for
+QUALITY_WINDOW_FRAMES = 60 # Frames averaged before each decision (and after each tier change)
+QUALITY_DEGRADE_RATIO = 1.0 # Step down a tier when the average frame exceeds this share of the budget
+QUALITY_RESTORE_RATIO = 0.6 # Step back up when it is below this share (the gap is the hysteresis)
+QUALITY_MAX_RESTORE_HOLD = 1800 # Frames: longest wait before retrying a tier that just proved too slow
+QUALITY_TIERS = ( # Best first; the governor moves one tier at a time
+    {'name': 'High', 'indicator_labels': True, 'rotation_step': SPRITE_ROTATION_STEP, 'ai_intervals': LOD_TIER_INTERVALS, 'wreck_details': True},
+    {'name': 'Medium', 'indicator_labels': False, 'rotation_step': SPRITE_ROTATION_STEP, 'ai_intervals': LOD_TIER_INTERVALS, 'wreck_details': True},
+    {'name': 'Low', 'indicator_labels': False, 'rotation_step': 3, 'ai_intervals': (1, 8, 16), 'wreck_details': True},
+    {'name': 'Lowest', 'indicator_labels': False, 'rotation_step': 6, 'ai_intervals': (2, 8, 16), 'wreck_details': False},
+)
+
+# --- GAMEPLAY EVENTS ---
+EVENT_FIRE = 0 # A tank fired (source: the shooter)
+EVENT_HIT = 1 # A bullet hit a tank (source: the tank hit, other: the shooter)
+EVENT_KILL = 2 # A tank was destroyed (source: the destroyed tank, other: the shooter)
+EVENT_CHUNK_LOADED = 3 # A terrain chunk was generated (position: its center, no source)
+EVENT_NAMES = ('fire', 'hit', 'kill', 'chunk loaded')
+EVENT_BUFFER_SIZE = 1024 # Events held between two drains (the oldest are overwritten beyond this)
+EVENT_NO_SOURCE = -1
+
+# --- COMBAT STATISTICS ---
+METRICS_INITIAL_CAPACITY = 128 # Tank rows allocated up front (doubled when a level has more tank ids)
+METRICS_SAMPLE_INTERVAL = 15 # Simulation steps between movement samples (distance is measured along them)
+
+# --- SOUND & AUDIO SETTINGS ---
+SOUND_VOLUME = 0.2 # Must be between 0.0 and 1.0
+MAX_SOUND_DISTANCE = 2500 # Distance in world units at which sound is fully attenuated
+
+# --- AUDIO MIXER ---
+AUDIO_CHANNELS = 16 # Mixer channels the audio manager plays on (bounds the mixer work per frame)
+AUDIO_MIN_GAIN = 0.02 # Events quieter than this (after distance falloff) are culled
+AUDIO_COALESCE_DISTANCE = 100 # Same-type events within one cell of this size in one frame play once
+AUDIO_PAN_DISTANCE = SCREEN_WIDTH / 2 # Horizontal offset at which a sound plays in one speaker only
+AUDIO_PRIORITIES = {'explosion': 3, 'player hit': 3, 'hit': 2, 'fire': 1} # Higher takes channels first
+
+# --- SOUND INDICATORS (HUD) ---
+INDICATOR_MIN_LIFETIME = 40 # Frames an indicator stays on screen
+INDICATOR_MAX_ACTIVE = 24 # Max indicators on screen at once (oldest are dropped first)
+INDICATOR_COALESCE_FRAMES = 20 # Repeated events from the same source within this window reuse one indicator
+
+# --- NETWORK (server.py / client.py) ---
+SERVER_HOST = '127.0.0.1'
+SERVER_PORT = 5555
+SERVER_TICK_RATE = FPS # Simulation ticks per second on the server
+SERVER_MAX_WRITE_BUFFER = 256 * 1024 # Bytes queued for a client before its state updates are skipped
+NET_POSITION_SCALE = 8 # Fixed-point steps per world unit in network messages
+NET_SNAPSHOT_HISTORY = 64 # Frames kept as delta baselines (older acknowledgements get a full frame)
+NET_MAX_MESSAGE_SIZE = 16 * 1024 * 1024 # Longest server message a client accepts (a full terrain resend of a large world)
+NET_MAX_CLIENT_MESSAGE_SIZE = 64 # Longest message the server accepts from a client (inputs are a few bytes)
+NET_NUMPY_MIN_ROWS = 80 # Tanks from which delta frames are diffed with NumPy (smaller ones as tuples, see netcodec.py)
+
+# File paths ('sounds' folder lives next to this module)
+SOUND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sounds')
+SOUND_FIRE_PATH = os.path.join(SOUND_DIR, 'fire.wav')
+SOUND_EXPLOSION_PATH = os.path.join(SOUND_DIR, 'explosion.wav')
+SOUND_HIT_PATH = os.path.join(SOUND_DIR, 'hit.wav')
+ASSET_CACHE_DIR_NAME = 'tank_game' # Folder in the per-user cache directory for decoded sounds and resolved font paths
+ASSET_CACHE_VERSION = 2
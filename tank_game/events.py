@@ -0,0 +1,77 @@
+from .constants import *
+
+# ----------------------------------------------------
+# --- GAMEPLAY EVENT BUS ---
+# ----------------------------------------------------
+class EventBus:
+    """
+    Preallocated ring buffer of gameplay events (EVENT_FIRE, EVENT_HIT, EVENT_KILL, EVENT_CHUNK_LOADED),
+    each with its simulation frame, world position, source tank id and other tank id (the shooter of a
+    hit or kill).
+    The simulation only appends; flush() drains everything once (per drawn frame or server tick) and
+    hands the same batch to every subscribed consumer (audio, indicators, network, stats...), so the
+    simulation step never calls into audio or UI code.
+    """
+    def __init__(self, capacity=EVENT_BUFFER_SIZE):
+        self.capacity = capacity
+        # Parallel columns, written in place
+        self.kinds = [0] * capacity
+        self.frames = [0] * capacity
+        self.xs = [0.0] * capacity
+        self.ys = [0.0] * capacity
+        self.source_ids = [EVENT_NO_SOURCE] * capacity
+        self.other_ids = [EVENT_NO_SOURCE] * capacity
+        self.head = 0 # Slot of the oldest undrained event
+        self.count = 0 # Undrained events
+        self.consumers = []
+
+        # Counters for tuning
+        self.totals = [0] * len(EVENT_NAMES) # Events emitted, per kind
+        self.dropped = 0 # Overwritten before being drained
+
+    def subscribe(self, consumer):
+        """Registers consumer(events), called by flush() with a list of (kind, frame, x, y, source_id, other_id)."""
+        self.consumers.append(consumer)
+
+    def emit(self, kind, frame, x, y, source_id=EVENT_NO_SOURCE, other_id=EVENT_NO_SOURCE):
+        """Appends an event. When the buffer is full the oldest undrained event is overwritten."""
+        if self.count == self.capacity:
+            self.head = (self.head + 1) % self.capacity
+            self.count -= 1
+            self.dropped += 1
+        slot = (self.head + self.count) % self.capacity
+        self.kinds[slot] = kind
+        self.frames[slot] = frame
+        self.xs[slot] = x
+        self.ys[slot] = y
+        self.source_ids[slot] = source_id
+        self.other_ids[slot] = other_id
+        self.count += 1
+        self.totals[kind] += 1
+
+    def drain(self):
+        """Returns the undrained events, oldest first, as (kind, frame, x, y, source_id, other_id) and empties the buffer."""
+        capacity = self.capacity
+        slots = [(self.head + i) % capacity for i in range(self.count)]
+        events = [(self.kinds[i], self.frames[i], self.xs[i], self.ys[i], self.source_ids[i], self.other_ids[i])
+                  for i in slots]
+        self.head = (self.head + self.count) % capacity
+        self.count = 0
+        return events
+
+    def flush(self):
+        """Drains the buffer once and passes the batch to every consumer (nothing is called when it is empty)."""
+        if not self.count:
+            return
+        events = self.drain()
+        for consumer in self.consumers:
+            consumer(events)
+
+    def clear(self):
+        """Discards the undrained events (consumers are kept)."""
+        self.head = 0
+        self.count = 0
+
+    def stats(self):
+        totals = {name: total for name, total in zip(EVENT_NAMES, self.totals)}
+        return {'totals': totals, 'pending': self.count, 'dropped': self.dropped}
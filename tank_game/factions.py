@@ -0,0 +1,53 @@
+# ----------------------------------------------------
+# --- FACTION REGISTRY ---
+# ----------------------------------------------------
+class FactionRegistry:
+    """
+    Live members and spawn/death counts per allegiance ('Friendly', 'Enemy').
+    Updated only when a tank spawns, is destroyed or leaves the world, so win/loss checks,
+    HUD counts and AI target lists are lookups instead of per-frame scans of every tank.
+    """
+    def __init__(self):
+        self.live = {} # allegiance -> {tank: None} (an insertion-ordered set: target order stays deterministic)
+        self.spawned = {} # allegiance -> tanks added since the last clear()
+        self.dead = {} # allegiance -> tanks destroyed since the last clear()
+        self.member_lists = {} # allegiance -> cached list(live[allegiance]), dropped on every change
+
+    def clear(self):
+        self.live.clear()
+        self.spawned.clear()
+        self.dead.clear()
+        self.member_lists.clear()
+
+    def add(self, tank):
+        """A tank spawned (or respawned)."""
+        self.live.setdefault(tank.allegiance, {})[tank] = None
+        self.spawned[tank.allegiance] = self.spawned.get(tank.allegiance, 0) + 1
+        self.member_lists.pop(tank.allegiance, None)
+
+    def killed(self, tank):
+        """A tank was destroyed: it stops being a live member and counts as dead."""
+        if self.live.get(tank.allegiance, {}).pop(tank, False) is None:
+            self.dead[tank.allegiance] = self.dead.get(tank.allegiance, 0) + 1
+            self.member_lists.pop(tank.allegiance, None)
+
+    def remove(self, tank):
+        """A live tank left the world without being destroyed (e.g. its player disconnected)."""
+        if self.live.get(tank.allegiance, {}).pop(tank, False) is None:
+            self.member_lists.pop(tank.allegiance, None)
+
+    def members(self, allegiance):
+        """Live tanks of an allegiance, in spawn order. The list is shared: do not modify it."""
+        members = self.member_lists.get(allegiance)
+        if members is None:
+            members = self.member_lists[allegiance] = list(self.live.get(allegiance, ()))
+        return members
+
+    def live_count(self, allegiance):
+        return len(self.live.get(allegiance, ()))
+
+    def spawned_count(self, allegiance):
+        return self.spawned.get(allegiance, 0)
+
+    def dead_count(self, allegiance):
+        return self.dead.get(allegiance, 0)
@@ -0,0 +1,74 @@
+import math
+from .constants import *
+
+try:
+    import numpy as np
+except ImportError: # Only the batched table lookups need NumPy
+    np = None
+
+# ----------------------------------------------------
+# --- TRIG LOOKUP TABLES ---
+# ----------------------------------------------------
+# All game angles are in degrees, so the tables are indexed by angle * steps_per_degree.
+# Rounding to the table grid moves the angle by at most half a step, so the worst-case error of
+# sin_deg/cos_deg is 2 * sin(step / 4) for a step of 1 / steps_per_degree degrees (error_bound()).
+
+_steps = TRIG_TABLE_STEPS_PER_DEGREE
+_size = 360 * _steps
+_sin_table = []
+_cos_table = []
+_np_sin_table = None
+_np_cos_table = None
+
+RAD_TO_DEG = 180.0 / math.pi
+
+def set_resolution(steps_per_degree):
+    """(Re)builds the sin/cos tables with the given number of entries per degree."""
+    global _steps, _size, _sin_table, _cos_table, _np_sin_table, _np_cos_table
+    _steps = steps_per_degree
+    _size = 360 * steps_per_degree
+    _sin_table = [math.sin(math.radians(i / steps_per_degree)) for i in range(_size)]
+    _cos_table = [math.cos(math.radians(i / steps_per_degree)) for i in range(_size)]
+    if np is not None:
+        _np_sin_table = np.array(_sin_table)
+        _np_cos_table = np.array(_cos_table)
+
+def sin_deg(angle):
+    """Table-driven sine of an angle in degrees."""
+    return _sin_table[round(angle * _steps) % _size]
+
+def cos_deg(angle):
+    """Table-driven cosine of an angle in degrees."""
+    return _cos_table[round(angle * _steps) % _size]
+
+def atan2_deg(y, x):
+    """atan2 in degrees (one multiply instead of a math.degrees() call)."""
+    return math.atan2(y, x) * RAD_TO_DEG
+
+def sin_cos_deg_array(angles):
+    """Batched table lookup for a NumPy array of angles in degrees. Returns (sin, cos) arrays."""
+    index = np.rint(angles * _steps).astype(np.int64) % _size
+    return _np_sin_table[index], _np_cos_table[index]
+
+def heading_vector(angle):
+    """
+    Unit movement vector of a tank body facing `angle` (0 = up, clockwise, screen y down).
+    Same as (cos(angle - 90), sin(angle - 90)).
+    """
+    index = round(angle * _steps) % _size
+    return _sin_table[index], -_cos_table[index]
+
+def error_bound(steps_per_degree=None):
+    """Worst-case sin/cos table error at a resolution (default: the current one)."""
+    return 2.0 * math.sin(math.radians(0.25 / (steps_per_degree or _steps)))
+
+def max_error(samples=100000):
+    """Returns the largest sin/cos error against the math module over evenly spaced angles."""
+    worst = 0.0
+    for i in range(samples):
+        angle = -720.0 + 1440.0 * i / samples
+        rad = math.radians(angle)
+        worst = max(worst, abs(sin_deg(angle) - math.sin(rad)), abs(cos_deg(angle) - math.cos(rad)))
+    return worst
+
+set_resolution(TRIG_TABLE_STEPS_PER_DEGREE)
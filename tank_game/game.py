@@ -0,0 +1,802 @@
+import time
+import pygame
+from .constants import *
+from .indicators import IndicatorSystem
+from .fastmath import sin_deg, cos_deg
+from .world import World, get_world_bounds_for_level
+from .audio import AudioManager, distance_gain
+from .assets import AssetManager
+from .render import BatchRenderer, camera_offsets, interpolate
+from .quality import QualityGovernor
+
+# Importing this module does no work: the window, assets and world are created by the
+# init_* stages below when run() starts (`python -m tank_game`, see __main__.py).
+screen = None
+clock = None
+renderer = None
+quality = None
+assets = None
+audio = None
+debug_font = large_font = medium_font = small_font = None
+
+# ----------------------------------------------------
+# --- STARTUP STAGES ---
+# ----------------------------------------------------
+class StartupProfile:
+    """Wall-clock time of each startup stage, printed by run(profile_startup=True)."""
+    def __init__(self, start_time):
+        self.start_time = start_time
+        self.last_time = start_time
+        self.stages = []
+
+    def mark(self, name):
+        """Records the time since the previous mark as stage `name`."""
+        now = time.perf_counter()
+        self.stages.append((name, now - self.last_time))
+        self.last_time = now
+
+    def report(self):
+        print("Startup profile:")
+        for name, seconds in self.stages:
+            print(f"  {name:<16}{seconds * 1000:8.1f} ms")
+        print(f"  {'total':<16}{(self.last_time - self.start_time) * 1000:8.1f} ms")
+
+def init_display():
+    """Opens the game window."""
+    global screen, clock, renderer, quality
+    pygame.display.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption("Tank Battle - Refactored!")
+    clock = pygame.time.Clock()
+    renderer = BatchRenderer() # Glyphs are built on first use, in the display's pixel format
+    quality = QualityGovernor() # Lowers the drawing and AI detail while frames run over budget
+
+def init_assets():
+    """Starts the background asset loader and binds the placeholder fonts and sounds."""
+    global assets, audio
+    # Loaded on a background thread while the first frames are drawn; placeholders until then
+    pygame.font.init()
+    pygame.mixer.init()
+    assets = AssetManager({'fire': SOUND_FIRE_PATH, 'explosion': SOUND_EXPLOSION_PATH, 'hit': SOUND_HIT_PATH}, 'Arial')
+    assets.start()
+    audio = AudioManager({}) # Every game sound is queued during the frame and mixed once per frame
+    apply_assets()
+
+def apply_assets():
+    """Binds the fonts and sounds (placeholders at startup, the loaded ones once the loader is done)."""
+    global debug_font, large_font, medium_font, small_font
+    debug_font = assets.font(30)
+    large_font = assets.font(72)
+    medium_font = assets.font(40)
+    small_font = assets.font(24) # New font for options
+
+    # Base volumes are set once; distance and pan are applied per channel by the audio manager
+    fire_sound = assets.sound('fire')
+    explosion_sound = assets.sound('explosion')
+    hit_sound = assets.sound('hit')
+    fire_sound.set_volume(SOUND_VOLUME)
+    explosion_sound.set_volume(SOUND_VOLUME)
+    hit_sound.set_volume(SOUND_VOLUME * 0.7)
+    audio.set_sounds({'fire': fire_sound, 'explosion': explosion_sound, 'hit': hit_sound, 'player hit': hit_sound})
+
+def apply_quality():
+    """Applies the quality governor's current tier to the renderer and the AI update rates."""
+    settings = quality.settings
+    renderer.rotation_step = settings['rotation_step']
+    renderer.wreck_details = settings['wreck_details']
+    world.lod_intervals = settings['ai_intervals']
+
+def init_world():
+    """Creates the simulation world and the sound indicator HUD."""
+    global world, bullets, tanks, friendly_tanks, all_friendly_tanks, indicator_system
+    world = World()
+    bullets = world.bullets
+    tanks = world.tanks
+    friendly_tanks = world.friendly_tanks
+    all_friendly_tanks = world.all_friendly_tanks
+    indicator_system = IndicatorSystem() # Aged once per simulation step, drawn once per drawn frame
+    # The simulation only records events; they are drained once per frame into sounds and indicators
+    world.events.subscribe(queue_event_sounds)
+    world.events.subscribe(show_event_indicators)
+
+def queue_event_sounds(events):
+    """Event bus consumer: queues each event's sound for this frame's audio flush (which culls the inaudible)."""
+    player_id = player_tank.tank_id
+    for kind, _, x, y, source_id, _ in events:
+        if kind == EVENT_FIRE:
+            audio.queue('fire', x, y)
+        elif kind == EVENT_HIT:
+            audio.queue('player hit' if source_id == player_id else 'hit', x, y)
+        elif kind == EVENT_KILL:
+            audio.queue('explosion', x, y)
+
+def show_event_indicators(events):
+    """Event bus consumer: sound indicators for the other tanks' shots and for every hit within earshot."""
+    listener_x, listener_y = player_tank.x, player_tank.y
+    player_id = player_tank.tank_id
+    for kind, _, x, y, source_id, _ in events:
+        if kind == EVENT_FIRE and source_id != player_id:
+            volume = distance_gain(x, y, listener_x, listener_y) * SOUND_VOLUME
+            if volume > 0.0:
+                indicator_system.add('fire', x, y, volume, listener_x, listener_y, source_id)
+        elif kind == EVENT_HIT:
+            # Hit sound is non-positional, so its indicator is always centered/fading
+            volume = distance_gain(x, y, listener_x, listener_y)
+            if volume > 0.0:
+                sound_type = 'player hit' if source_id == player_id else 'hit'
+                indicator_system.add(sound_type, x, y, volume, listener_x, listener_y, source_id)
+
+def is_visible_on_screen(world_x, world_y, camera_offset_x, camera_offset_y):
+    """Checks if a world coordinate is currently within the screen bounds."""
+    # Convert world coordinates to screen coordinates
+    screen_x = world_x + camera_offset_x
+    screen_y = world_y + camera_offset_y
+    
+    # Check if the point is within the screen (with a small buffer)
+    buffer = 0 # Add a small buffer around the screen edge
+    
+    return (screen_x > -buffer and screen_x < SCREEN_WIDTH + buffer and
+            screen_y > -buffer and screen_y < SCREEN_HEIGHT + buffer)
+
+# --- GLOBAL GAME STATE VARIABLES ---
+# The simulation state lives in the World (shared with the headless server); these are aliases set by init_world()
+world = None
+bullets = None
+tanks = None
+friendly_tanks = None
+all_friendly_tanks = None
+indicator_system = None
+player_tank = None # Will be initialized in initialize_game
+game_over = False
+game_result = ""
+restart_button_rect = None # Stores the rect of the restart button for click detection
+#INDICATOR_BASE_LIFETIME_FRAMES = int(FPS * 0.75) # Base lifetime of the sound indicator is 3 seconds
+
+# NEW: Level Management
+current_level = 1 # Start at Level 1 (MAX_LEVEL is in constants.py)
+
+# NEW GAME STATE VARIABLES
+game_state = STATE_GAMEPLAY
+
+# NEW: Sound Indicator List
+active_sound_indicators = [] # Stores [IndicatorSprite, x, y] tuples
+
+# NEW GAME STATE VARIABLES
+game_state = STATE_GAMEPLAY
+# Rects for options menu buttons
+options_button_rects = {}
+is_rebinding = False
+rebinding_key_name = ""
+
+
+def next_level():
+    """Advances to the next level."""
+    global current_level, game_over
+    
+    current_level += 1
+    
+    if current_level > MAX_LEVEL:
+        # Game finished all levels
+        game_over = True
+        game_result = f"ULTIMATE VICTORY! You conquered all {MAX_LEVEL} levels!"
+        return
+
+    print(f"Starting Level {current_level}...")
+    # NOTE: You must update reset_game to accept and use the start_level parameter.
+    reset_game(start_level=current_level)
+
+# ----------------------------------------------------
+# --- GAME SETUP FUNCTIONS ---
+# ----------------------------------------------------
+def initialize_game(keep_player=False):
+    """Initializes all game objects and world state."""
+    global player_tank, current_level
+    
+    # Reset groups and lists (the world takes this level's size and a new terrain seed)
+    world.clear(get_world_bounds_for_level(current_level))
+    
+    # Generate initial terrain (Center chunks)
+    world.generate_chunks_around(0, 0)
+
+    # Initialize Player Tank (If not keeping the old one)
+    if not keep_player or player_tank is None:
+        player_tank = world.spawn_player()
+    else:
+        # Re-spawn the existing player tank for the new level
+        world.spawn_player(player_tank)
+
+    # Initialize Other Tanks (Friendlies remain constant)
+    world.populate(current_level)
+        
+    return player_tank
+
+def reset_game(start_level = 1):
+    """Resets the game state and reinitializes game objects."""
+    global game_over, game_result, player_tank, game_state, current_level
+
+    # Reset level to start_level (1 for a true restart)
+    current_level = start_level
+    
+    # Preserve player tank's control settings across resets
+    old_drive_system = player_tank.drive_system if player_tank else DEFAULT_DRIVE_SYSTEM
+    old_control_keys = player_tank.control_keys if player_tank else {}
+
+    # Reinitialize all game objects
+    player_tank = initialize_game(keep_player=True)
+    
+    # Restore player tank's control settings
+    player_tank.drive_system = old_drive_system
+    if old_control_keys:
+        player_tank.control_keys = old_control_keys
+
+    # Reset game state flags
+    game_over = False
+    game_result = ""
+    game_state = STATE_GAMEPLAY
+
+    # RESET INDICATORS (returns them to the pool)
+    indicator_system.clear()
+
+def next_level():
+    """Advances to the next level."""
+    global current_level, game_over
+    
+    current_level += 1
+    
+    if current_level > MAX_LEVEL:
+        # Game finished all levels
+        game_over = True
+        game_result = f"ULTIMATE VICTORY! You conquered all {MAX_LEVEL} levels!"
+        return
+
+    print(f"Starting Level {current_level}...")
+    reset_game(start_level=current_level)
+
+# ----------------------------------------------------
+# --- UI DRAWING FUNCTIONS ---
+# ----------------------------------------------------
+
+# NEW FUNCTION: Draws a crosshair at the end of the turret line, indicating target direction
+def draw_turret_crosshair(surface, tank):
+    """Draws a crosshair at the projected point of the turret's line of sight."""
+    
+    # Tank's (interpolated) screen position, set by the renderer
+    center_screen_x, center_screen_y = tank.rect.center
+
+    # Calculate the end point of the turret line
+    # Use a longer length to make the crosshair more visible
+    crosshair_length = TURRET_LENGTH + 50 
+    
+    end_x = center_screen_x + crosshair_length * cos_deg(tank.turret_angle)
+    end_y = center_screen_y - crosshair_length * sin_deg(tank.turret_angle)
+    
+    # Draw the crosshair (small perpendicular lines)
+    cross_size = 8
+    
+    # Horizontal line (relative to the tank)
+    pygame.draw.line(surface, YELLOW, (end_x - cross_size, end_y), (end_x + cross_size, end_y), 2)
+    
+    # Vertical line (relative to the tank)
+    pygame.draw.line(surface, YELLOW, (end_x, end_y - cross_size), (end_x, end_y + cross_size), 2)
+
+# NEW FUNCTION: Draws a circle indicating the max bullet range
+def draw_max_range_circle(surface, tank):
+    """Draws a circle around the player indicating the bullet's maximum range."""
+    
+    # Center of the circle is the player's (interpolated) screen position, set by the renderer
+    center_screen_x, center_screen_y = tank.rect.center
+    
+    # Radius is the max bullet range in screen pixels
+    radius = MAX_BULLET_RANGE + 30
+    
+    # Draw a dashed or simple circle
+    pygame.draw.circle(surface, RED, (center_screen_x, center_screen_y), radius, 1)
+
+
+def draw_button(surface, text, font, center_x, center_y, color, back_color):
+    """Utility function to draw a clickable button."""
+    text_surface = font.render(text, True, color)
+    text_rect = text_surface.get_rect(center=(center_x, center_y))
+    
+    padding_x, padding_y = 20, 10
+    button_rect = pygame.Rect(
+        text_rect.left - padding_x, 
+        text_rect.top - padding_y, 
+        text_rect.width + padding_x * 2, 
+        text_rect.height + padding_y * 2
+    )
+    
+    pygame.draw.rect(surface, back_color, button_rect, border_radius=5)
+    surface.blit(text_surface, text_rect.topleft)
+    return button_rect
+
+def draw_pause_menu():
+    """Draws the transparent pause overlay and menu options."""
+    global options_button_rects
+    options_button_rects = {} # Clear rects for current menu
+    
+    overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+    overlay.fill((0, 0, 0, 180)) 
+    screen.blit(overlay, (0, 0))
+    
+    if 'large_font' in locals() and large_font:
+        pause_text = large_font.render("PAUSED", True, WHITE)
+        pause_rect = pause_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 100))
+        screen.blit(pause_text, pause_rect)
+
+    center_x = SCREEN_WIDTH // 2
+    y_start = SCREEN_HEIGHT // 2
+    
+    # Resume Button
+    resume_rect = draw_button(screen, "Resume (P)", medium_font, center_x, y_start, WHITE, PLAYER_COLOR)
+    options_button_rects['resume'] = resume_rect # <<< Store for click detection
+    
+    # Options Button
+    options_rect = draw_button(screen, "Options (O)", medium_font, center_x, y_start + 70, WHITE, DARK_GRAY)
+    
+    # Store for click detection
+    options_button_rects['options'] = options_rect
+
+def get_key_name(key_code):
+    """Converts a pygame key code into a human-readable string."""
+    try:
+        return pygame.key.name(key_code).upper()
+    except:
+        return f"Key {key_code}"
+
+def draw_options_menu():
+    """Draws the options screen for drive system and keybinding."""
+    global options_button_rects, is_rebinding, rebinding_key_name
+    
+    overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+    overlay.fill((0, 0, 0, 220)) 
+    screen.blit(overlay, (0, 0))
+
+    if 'large_font' in locals() and large_font:
+        title_text = large_font.render("Options", True, WHITE)
+        title_rect = title_text.get_rect(center=(SCREEN_WIDTH // 2, 100))
+        screen.blit(title_text, title_rect)
+
+    center_x = SCREEN_WIDTH // 2
+    y_current = 200
+    options_button_rects = {} # Clear for new button placements
+
+    # --- Drive System Selection ---
+    
+    # Render the Drive System label using medium font
+    drive_text = medium_font.render("Drive System:", True, WHITE)
+    screen.blit(drive_text, (center_x - 300, y_current))
+    
+    # 1. Standard Drive Button
+    text = f"Standard (WASD)"
+    color = YELLOW if player_tank.drive_system == DRIVE_SYSTEM_STANDARD else WHITE
+    back_color = PLAYER_COLOR if player_tank.drive_system == DRIVE_SYSTEM_STANDARD else DARK_GRAY
+    rect = draw_button(screen, text, small_font, center_x, y_current + 5, color, back_color)
+    options_button_rects['drive_standard'] = rect
+    
+    # Move to the next line
+    y_current += 70 
+    
+    # 2. Independent Track Drive Button
+    text = f"Independent Track (Arrows)"
+    color = YELLOW if player_tank.drive_system == DRIVE_SYSTEM_INDEPENDENT else WHITE
+    back_color = PLAYER_COLOR if player_tank.drive_system == DRIVE_SYSTEM_INDEPENDENT else DARK_GRAY
+    rect = draw_button(screen, text, small_font, center_x, y_current + 5, color, back_color)
+    options_button_rects['drive_independent'] = rect # <<< THIS IS THE BUTTON
+
+    y_current += 70 # Advance y_current again for the Key Rebinding section
+    
+    # ... (rest of the function for Key Rebinding continues)
+
+    # --- Key Rebinding Section ---
+    if is_rebinding:
+        rebind_text = large_font.render(f"Press new key for: {rebinding_key_name}", True, RED)
+        rebind_rect = rebind_text.get_rect(center=(SCREEN_WIDTH // 2, y_current + 50))
+        screen.blit(rebind_text, rebind_rect)
+        y_current += 150
+    else:
+        # Drawing the keybinding options
+        key_map = player_tank.control_keys[player_tank.drive_system]
+        keys_to_bind = list(key_map.keys())
+        key_names = {
+            'f': "Forward", 'r': "Reverse", 'l': "Turn Left", 's': "Turn Right",
+            'lf': "Left Track Forward", 'lr': "Left Track Reverse", 
+            'rf': "Right Track Forward", 'rr': "Right Track Reverse"
+        }
+        
+        col_start = SCREEN_WIDTH // 4
+        
+        for i, key_id in enumerate(keys_to_bind):
+            row = i // 2
+            col = i % 2
+            
+            x = col_start + col * (SCREEN_WIDTH // 2)
+            y = y_current + row * 60
+            
+            key_code = key_map[key_id]
+            key_text = get_key_name(key_code)
+            
+            label = small_font.render(f"{key_names[key_id]}:", True, WHITE)
+            screen.blit(label, (x - 100, y))
+            
+            # Key Button
+            text = key_text
+            back_color = PLAYER_COLOR
+            rect = draw_button(screen, text, small_font, x + 150, y, WHITE, back_color)
+            options_button_rects[f'bind_{key_id}'] = rect
+            
+        y_current += (len(keys_to_bind) // 2) * 60 + 50
+        
+    # --- Back Button ---
+    back_rect = draw_button(screen, "Back (P/O/ESC)", medium_font, center_x, SCREEN_HEIGHT - 100, WHITE, RED)
+    options_button_rects['back'] = back_rect
+
+
+# ----------------------------------------------------
+# --- GAME LOOP ---
+# ----------------------------------------------------
+def run(start_time=None, profile_startup=False, metrics_path=None):
+    """
+    Runs the startup stages and then the game loop until the window is closed.
+    With metrics_path, every finished level's combat statistics are appended to that CSV file.
+    """
+    global game_state, game_over, game_result, restart_button_rect, is_rebinding, rebinding_key_name
+    global player_tank
+
+    profile = StartupProfile(time.perf_counter() if start_time is None else start_time)
+    profile.mark('import')
+    init_display()
+    profile.mark('display')
+    init_assets()
+    profile.mark('assets')
+    init_world()
+    profile.mark('world')
+    player_tank = initialize_game()
+    profile.mark('initial level')
+
+    running = True
+    first_frame = True
+    accumulator = 0.0 # Real time not yet simulated (seconds)
+    last_frame_time = time.perf_counter()
+    while running:
+        frame_start = time.perf_counter()
+
+        # Swap the real fonts and sounds in as soon as the background loader is done
+        if assets.poll():
+            apply_assets()
+            print(f"Assets loaded in {assets.load_time * 1000:.0f} ms ({assets.cache_hits} from cache).")
+    
+        # ------------------ EVENT HANDLING ------------------
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+        
+            # --- Universal Controls: Pause/Options/Escape ---
+            if event.type == pygame.KEYDOWN:
+                if event.key == KEY_PAUSE:
+                    if game_state == STATE_GAMEPLAY:
+                        if not game_over: game_state = STATE_PAUSED
+                    elif game_state == STATE_PAUSED:
+                        game_state = STATE_GAMEPLAY
+                    elif game_state == STATE_OPTIONS:
+                        # 'P' key acts as 'Back' from options
+                        game_state = STATE_PAUSED
+                elif event.key == KEY_OPTIONS or event.key == pygame.K_ESCAPE:
+                    if game_state == STATE_PAUSED:
+                        game_state = STATE_OPTIONS
+                    elif game_state == STATE_OPTIONS:
+                        # 'O' or 'ESC' acts as 'Back' from options
+                        game_state = STATE_PAUSED
+                    
+                # --- Key Rebinding Capture ---
+                if game_state == STATE_OPTIONS and is_rebinding and event.key not in [KEY_PAUSE, KEY_OPTIONS, pygame.K_ESCAPE, pygame.K_LSHIFT, pygame.K_RSHIFT, pygame.K_LCTRL, pygame.K_RCTRL, pygame.K_LALT, pygame.K_RALT]:
+                    # Assign the new key
+                    current_map = player_tank.control_keys[player_tank.drive_system]
+                    # Find the key_id (e.g., 'f', 'lf') from the rebinding_key_name
+                    key_name_to_id = {
+                        "Forward": 'f', "Reverse": 'r', "Turn Left": 'l', "Turn Right": 's',
+                        "Left Track Forward": 'lf', "Left Track Reverse": 'lr', 
+                        "Right Track Forward": 'rf', "Right Track Reverse": 'rr'
+                    }
+                    key_id = key_name_to_id.get(rebinding_key_name)
+                
+                    if key_id:
+                        current_map[key_id] = event.key
+                
+                    is_rebinding = False
+                    rebinding_key_name = ""
+
+
+            # --- Mouse Clicks ---
+            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                mouse_pos = event.pos
+            
+                if game_state == STATE_GAMEPLAY and not game_over:
+                    # Player fire() is called here
+                    if player_tank.fire(bullets):
+                        world.emit(EVENT_FIRE, player_tank)
+                
+                elif game_over and restart_button_rect: # Check if the action button is present
+                    # restart_button_rect is now a tuple: (rect, action)
+                    rect, action = restart_button_rect
+                
+                    if rect.collidepoint(mouse_pos):
+                        if action == 'reset':
+                            print("Restarting game...")
+                            reset_game()
+                        elif action == 'next_level':
+                            print(f"Advancing to Level {current_level + 1}...")
+                            next_level()
+                        continue
+                
+                elif game_state == STATE_PAUSED:
+                    if 'resume' in options_button_rects and options_button_rects['resume'].collidepoint(mouse_pos):
+                        game_state = STATE_GAMEPLAY
+                    elif 'options' in options_button_rects and options_button_rects['options'].collidepoint(mouse_pos):
+                        game_state = STATE_OPTIONS
+                    
+                elif game_state == STATE_OPTIONS:
+                
+                    # Back button
+                    if 'back' in options_button_rects and options_button_rects['back'].collidepoint(mouse_pos):
+                        game_state = STATE_PAUSED
+                    
+                    # Drive System Selection
+                    elif 'drive_standard' in options_button_rects and options_button_rects['drive_standard'].collidepoint(mouse_pos):
+                        player_tank.drive_system = DRIVE_SYSTEM_STANDARD
+                    elif 'drive_independent' in options_button_rects and options_button_rects['drive_independent'].collidepoint(mouse_pos):
+                        player_tank.drive_system = DRIVE_SYSTEM_INDEPENDENT
+                
+                    # Key Rebinding Buttons
+                    elif not is_rebinding:
+                        for key_name_id, rect in options_button_rects.items():
+                            if key_name_id.startswith('bind_') and rect.collidepoint(mouse_pos):
+                                key_id = key_name_id.split('_')[1]
+                                # Start rebinding process
+                                key_names = {
+                                    'f': "Forward", 'r': "Reverse", 'l': "Turn Left", 's': "Turn Right",
+                                    'lf': "Left Track Forward", 'lr': "Left Track Reverse", 
+                                    'rf': "Right Track Forward", 'rr': "Right Track Reverse"
+                                }
+                                is_rebinding = True
+                                rebinding_key_name = key_names.get(key_id, key_id.upper())
+                                break
+
+
+        keys = pygame.key.get_pressed()
+        mouse_pos = pygame.mouse.get_pos()
+    
+        # ------------------ UPDATE LOGIC (FIXED TIMESTEP) ------------------
+        # The simulation always advances in steps of 1/FPS s (all frame-based constants count these
+        # steps); real time accumulates and is consumed in whole steps, however often frames are drawn.
+        now = time.perf_counter()
+        if not game_over and game_state == STATE_GAMEPLAY:
+            accumulator += now - last_frame_time
+        else:
+            accumulator = 0.0 # Paused or over: nothing to catch up on when play resumes
+        last_frame_time = now
+        sim_steps = 0
+        while accumulator >= SIM_STEP and not game_over and game_state == STATE_GAMEPLAY:
+            if sim_steps == MAX_SIM_STEPS_PER_FRAME:
+                accumulator = 0.0 # CPU saturated: slow the game down instead of falling further behind
+                break
+            accumulator -= SIM_STEP
+            sim_steps += 1
+            world.save_poses() # Start of the step the renderer interpolates from
+
+            # --- Listener Position (Player's World Coordinates) ---
+            listener_x = player_tank.x
+            listener_y = player_tank.y
+        
+            # Player Update
+            player_tank.update(keys, mouse_pos, world.terrain_index)
+
+            # --- NEW: Handle player's own fire sound ---
+    ##        player_fire_event = player_tank.fire(bullets)
+    ##        if player_fire_event:
+    ##            # Unpack the sound event: [sound_type, x, y, volume]
+    ##            s_type, s_x, s_y, s_vol = player_fire_event
+    ##            new_indicator = SoundIndicator(s_type, s_x, s_y, s_vol, listener_x, listener_y)
+    ##            indicator_group.add(new_indicator)
+        
+        
+            # AI Update (think/apply/move/act for all AI tanks; full rate only near the player)
+            world.update_interest([(listener_x, listener_y)])
+            world.update_ai()
+            world.sample_metrics()
+
+
+            # --- CAMERA OFFSET CALCULATION (clamped to the world boundaries) ---
+            camera_offset_x, camera_offset_y = camera_offsets(listener_x, listener_y, world.bounds)
+        
+            if game_state == STATE_GAMEPLAY:
+                # Update bullets ONLY in gameplay state.
+                world.update_bullets()
+
+                # --- COMBAT: BULLET COLLISION AND DAMAGE ---
+                # Damage is applied by the world; the hit and kill events become sounds and indicators
+                # when the event bus is flushed after the simulation steps
+                world.resolve_hits()
+
+                # --- AGE SOUND INDICATORS (once per simulation step, independent of bullet count) ---
+                # Their screen positions are computed when drawing, from the interpolated camera
+                indicator_system.update()
+                        
+                # --- GAME STATE CHECK ---
+                if player_tank.is_wreck and not game_over:
+                    game_over = True
+                    game_result = "DEFEAT! Your tank was destroyed."
+            
+                enemies_left = world.enemies_left()
+            
+                # MODIFIED: Check for level completion instead of Game Over
+                if enemies_left == 0 and world.factions.spawned_count('Enemy') > 0 and not game_over:
+                    # All enemies defeated! Advance to the next level.
+                    if current_level < MAX_LEVEL:
+                        game_result = f"LEVEL {current_level} COMPLETE!"
+                        game_over = True # Set flag to display the temporary 'Level Complete' screen
+                    else:
+                        # Final Level Complete - Triggers Ultimate Victory
+                        game_over = True
+                        game_result = f"VICTORY! All enemies destroyed."
+
+                if game_over and metrics_path:
+                    world.write_metrics(metrics_path, current_level) # Once: the simulation stops while game_over
+
+
+            # --- DYNAMIC CHUNK LOADING (around every tank and bullet, plus the camera once the player is destroyed) ---
+            observers = [] if player_tank.is_alive else [(SCREEN_WIDTH/2 - camera_offset_x, SCREEN_HEIGHT/2 - camera_offset_y)]
+            world.update_chunks(observers)
+
+        # --- EVENTS: this frame's gameplay events, drained once into sounds and indicators ---
+        world.events.flush()
+
+        # --- AUDIO: mix this frame's sound events (bounded number of mixer calls) ---
+        audio.flush(player_tank.x, player_tank.y)
+
+        # ------------------ DRAWING ------------------
+        # Poses are drawn `alpha` of the way from the last simulation step to the current one,
+        # so motion stays smooth at any frame rate; the camera follows the interpolated player.
+        alpha = min(1.0, accumulator / SIM_STEP)
+        drawn_player_x = interpolate(player_tank.prev_x, player_tank.x, alpha)
+        drawn_player_y = interpolate(player_tank.prev_y, player_tank.y, alpha)
+        camera_offset_x, camera_offset_y = camera_offsets(drawn_player_x, drawn_player_y, world.bounds)
+        # Draw the ground, terrain features and baked wrecks (cached chunk surfaces)
+        renderer.draw_terrain(screen, world, camera_offset_x, camera_offset_y)
+    
+        # Draw world boundaries
+        boundary_rect_screen = pygame.Rect(
+            world.bounds.min_x + camera_offset_x, 
+            world.bounds.min_y + camera_offset_y, 
+            world.bounds.width, 
+            world.bounds.height
+        )
+        line_thickness = 5
+        pygame.draw.line(screen, BOUNDARY_COLOR, boundary_rect_screen.topleft, boundary_rect_screen.topright, line_thickness)
+        pygame.draw.line(screen, BOUNDARY_COLOR, boundary_rect_screen.bottomleft, boundary_rect_screen.bottomright, line_thickness)
+        pygame.draw.line(screen, BOUNDARY_COLOR, boundary_rect_screen.topleft, boundary_rect_screen.bottomleft, line_thickness)
+        pygame.draw.line(screen, BOUNDARY_COLOR, boundary_rect_screen.topright, boundary_rect_screen.bottomright, line_thickness)
+
+
+        # Draw bullets, then all tanks (wrecks first, then live tanks), batched by primitive
+        renderer.draw_bullets(screen, [(b.prev_x + (b.x - b.prev_x) * alpha, b.prev_y + (b.y - b.prev_y) * alpha, b.color)
+                                       for b in bullets], camera_offset_x, camera_offset_y)
+        renderer.draw_tanks(screen, tanks, camera_offset_x, camera_offset_y, alpha)
+
+        # NEW: Draw Player-specific UI only when in gameplay state
+        if player_tank.is_alive and game_state == STATE_GAMEPLAY:
+            draw_turret_crosshair(screen, player_tank)
+            draw_max_range_circle(screen, player_tank)
+
+        # NEW: Draw sound indicators (MUST be last to be on top of everything)
+        if game_state == STATE_GAMEPLAY:
+            indicator_system.draw(screen, small_font if quality.settings['indicator_labels'] else None,
+                                  drawn_player_x, drawn_player_y, camera_offset_x, camera_offset_y)
+    
+        # Draw debug/info text
+        real_fps = clock.get_fps() 
+    
+        enemies_left = world.enemies_left()
+        drive_mode_text = f"Drive: {player_tank.drive_system}"
+        mode_text = f"HP: {player_tank.health} | Enemies Left: {enemies_left}"
+    
+        angle_speed_text = f"Angle: {player_tank.angle:.2f} | Speed: {player_tank.speed:.2f}"
+        fps_text = f"FPS: {real_fps:.2f} | Quality: {quality.settings['name']}"
+        cooldown_text = f"Ready in: {max(0, player_tank.fire_cooldown) / FPS:.2f}s"
+        level_text = f"Current level: {current_level}"
+    
+        if debug_font:
+            text_surface_drive = debug_font.render(drive_mode_text, True, BLACK)
+            text_surface_mode = debug_font.render(mode_text, True, BLACK)
+        
+            text_surface_angle_speed = debug_font.render(angle_speed_text, True, BLACK)
+            text_surface_fps = debug_font.render(fps_text, True, BLACK)
+            text_surface_cooldown = medium_font.render(cooldown_text, True, RED if player_tank.fire_cooldown > 0 else PLAYER_COLOR)
+            text_level = debug_font.render(level_text, True, BLACK)
+    
+            screen.blit(text_surface_drive, (10, 10))
+            screen.blit(text_surface_mode, (10, 40))
+        
+            screen.blit(text_surface_angle_speed, (10, 100))
+            screen.blit(text_surface_fps, (10, 130))
+            screen.blit(text_surface_cooldown, (240, 155))
+            screen.blit(text_level, (10, 70))
+    
+        # --- GAME OVER SCREEN & RESTART/NEXT LEVEL BUTTON ---
+        if game_over:
+            # 1. Draw Overlay and Result Text
+            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+            overlay.fill((0, 0, 0, 180)) 
+            screen.blit(overlay, (0, 0))
+        
+            result_surface = large_font.render(game_result, True, WHITE)
+            result_rect = result_surface.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 30))
+            screen.blit(result_surface, result_rect)
+
+            # 2. Determine Action and Draw Button (The fix is entirely in this section)
+        
+            # Check if the player won the level (not ultimate victory)
+            # Note: current_level and MAX_LEVEL must be defined global variables
+            is_level_complete = "COMPLETE" in game_result and current_level < MAX_LEVEL
+        
+            if is_level_complete:
+                # Level Complete, show 'Next Level'
+                button_text = f"Proceed to Level {current_level + 1}"
+                button_color = HP_BAR_GREEN
+                action = 'next_level'
+            elif "VICTORY" in game_result:
+                # Ultimate Victory
+                button_text = "Play Again (Level 1)"
+                button_color = PLAYER_COLOR
+                action = 'reset'
+            else:
+                # Defeat screen
+                button_text = "Restart Game (Level 1)"
+                button_color = RED
+                action = 'reset'
+            
+            # Draw the button using the draw_button utility from utilities.py
+            # This function returns the rect, solving the original NameError.
+            button_rect = draw_button(
+                screen, button_text, medium_font, 
+                SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 80, 
+                WHITE, button_color
+            )
+        
+            # Store the rect and the intended action for click detection
+            # restart_button_rect is a tuple: (rect, action)
+            restart_button_rect = (button_rect, action) 
+
+        # --- Continue with other states ---
+        elif game_state == STATE_PAUSED:
+            draw_pause_menu()
+            # Ensure restart_button_rect is cleared when not in game_over state
+            restart_button_rect = None
+        
+        elif game_state == STATE_OPTIONS:
+            draw_options_menu()
+            # Ensure restart_button_rect is cleared when not in game_over state
+            restart_button_rect = None
+        
+        else:
+            # Reset button rect when game is active to prevent accidental clicks
+            restart_button_rect = None
+
+        # Update the entire screen
+        pygame.display.flip()
+        if first_frame:
+            first_frame = False
+            profile.mark('first frame')
+            print(f"First frame after {(profile.last_time - profile.start_time) * 1000:.0f} ms.")
+            if profile_startup:
+                profile.report()
+    
+        # Quality governor: measured work per frame (the limiter's wait below does not count)
+        if quality.record(time.perf_counter() - frame_start):
+            apply_quality()
+
+        # Limit the render rate (the simulation rate is fixed above)
+        clock.tick(MAX_RENDER_FPS)
+
+    world.shutdown()
+    pygame.quit()
@@ -0,0 +1,269 @@
+import pygame
+import math
+from .constants import *
+from .pools import ObjectPool
+from .fastmath import sin_deg, cos_deg, atan2_deg
+
+# ----------------------------------------------------
+# --- SOUND INDICATOR SPRITE CLASS ---
+# ----------------------------------------------------
+class SoundIndicator(pygame.sprite.Sprite):
+    def __init__(self, sound_type, x, y, volume, listener_x, listener_y):
+        super().__init__()
+        self.pool = None # Set by ObjectPool.acquire() for pooled indicators
+        self.source_key = None # Set by IndicatorSystem.add() for coalescing
+        self.last_event_frame = 0
+        self.reset(sound_type, x, y, volume, listener_x, listener_y)
+
+    def reset(self, sound_type, x, y, volume, listener_x, listener_y):
+        """(Re)initializes the indicator state. Called by __init__ and by the indicator pool."""
+        self.x, self.y = x, y # World position of the sound source
+        self.sound_type = sound_type
+
+        # FIX: Implement the requested 3-second base lifetime + a volume-dependent bonus.
+        # This replaces the old, buggy logic that incorrectly set self.max_lifetime to a fixed 40 frames.
+        
+        # Volume bonus: 0 seconds for silent, up to 1 second for max volume.
+        volume_bonus_seconds = volume * 1.0 
+        volume_bonus_frames = int(FPS * volume_bonus_seconds)
+        
+        # The new max lifetime is the base (3s) + the volume bonus (0-1s).
+        #self.max_lifetime = INDICATOR_BASE_LIFETIME_FRAMES + volume_bonus_frames
+        
+        # Set max_lifetime to at least the minimum, guaranteeing visibility
+        #self.max_lifetime = max(INDICATOR_MIN_LIFETIME, base_lifetime)...
+        self.max_lifetime = INDICATOR_MIN_LIFETIME # <-- BUGGY LINE REMOVED
+        
+        self.lifetime = self.max_lifetime 
+        self.initial_volume = volume 
+        self.alpha = 20
+        self.angle = 0
+        self.dir_x, self.dir_y = 1.0, 0.0
+
+        #initiate
+        self.screen_x = 0
+        self.screen_y = 0
+        
+        # Determine visual style
+        if sound_type == 'explosion':
+            self.color = RED
+            self.label = "BOOM!"
+            self.indicator_size = 15
+        elif sound_type == 'fire':
+            self.color = YELLOW
+            self.label = "FIRE"
+            self.indicator_size = 10
+        elif sound_type == 'hit':
+            self.color = WHITE
+            self.label = "HIT"
+            self.indicator_size = 8
+        elif sound_type == 'player hit':
+            self.color = RED
+            self.label = "PLAYER HIT"
+            self.indicator_size = 8
+        else:
+            self.color = WHITE
+            self.label = "?"
+            self.indicator_size = 5
+
+    def refresh(self, x, y, volume):
+        """Restarts the indicator for a repeated event from the same source (coalescing)."""
+        self.x, self.y = x, y
+        self.initial_volume = max(self.initial_volume, volume)
+        self.lifetime = self.max_lifetime
+
+    def kill(self):
+        """Removes the indicator from all groups and returns it to its pool."""
+        was_alive = self.alive()
+        super().kill()
+        if was_alive and self.pool:
+            self.pool.release(self)
+
+    def update(self):
+        """Ages the indicator by one simulation step; fading follows the remaining lifetime."""
+        self.lifetime -= 1
+        if self.lifetime <= 0:
+            self.kill()
+            return
+
+        # Fading: opacity based on remaining lifetime
+        self.alpha = int(255 * (self.lifetime / self.max_lifetime))
+
+    def place(self, listener_x, listener_y, center_x, center_y):
+        """Calculates the screen position/rotation around (center_x, center_y), the listener's drawn screen position."""
+        # ----------------------------------------------------
+        # --- NEW: CHECK VISIBILITY AND KILL IF SOURCE IS ON-SCREEN ---
+        # ----------------------------------------------------
+        # Use the utility function to check if the sound source's world position (self.x, self.y) 
+        # is currently visible to the player.
+        """if self.sound_type != 'hit': 
+            if is_visible_on_screen(self.x, self.y, camera_offset_x, camera_offset_y):
+                self.kill() # Immediately remove the indicator if the source is seen
+                return """
+        
+##        if is_visible_on_screen(self.x, self.y, camera_offset_x, camera_offset_y):
+##                self.kill() # Immediately remove the indicator if the source is seen
+##                return
+            
+        # Calculate vector from listener (player) to sound source
+        dx = self.x - listener_x
+        dy = self.y - listener_y
+        distance = math.hypot(dx, dy)
+        
+        # Calculate angle of the sound source relative to the screen/player center
+        # atan2(y, x) for angle from positive x-axis, then convert to degrees
+        self.angle = atan2_deg(-dy, dx) # -dy because Pygame y-axis is inverted
+        #self.angle = math.degrees(math.atan2(dy, -dx)) # -dy because Pygame y-axis is inverted
+        #print(self.angle)
+
+        # Determine how far to place the indicator on the screen (clamped to edge)
+        # Use a distance greater than MAX_BULLET_RANGE to ensure it appears outside the range circle
+        
+        # Max distance on screen before clamping to the edge for the HUD element
+        hud_radius = min(SCREEN_WIDTH, SCREEN_HEIGHT) * 0.45 
+        
+        # Place the indicator further out if the source is far, but clamp at the HUD radius
+        distance_factor = min(1.0, distance / MAX_SOUND_DISTANCE) 
+        
+        # Use the HUD radius to place the indicator on the screen
+        indicator_dist_from_center = hud_radius * (0.8 + 0.2 * distance_factor) # Place it slightly inside the edge
+        
+        # Calculate screen position based on angle and distance from the listener on screen
+        # Unit direction (table lookup), reused by draw()
+        self.dir_x = cos_deg(self.angle)
+        self.dir_y = sin_deg(self.angle)
+        
+        self.screen_x = center_x + indicator_dist_from_center * self.dir_x
+        self.screen_y = center_y - indicator_dist_from_center * self.dir_y
+        
+        
+    def draw(self, surface, arrow_surface, font):
+        """Draws the indicator triangle into the shared arrow_surface and its text onto surface."""
+        
+        # Don't draw if not enough opacity or has expired
+        if self.lifetime <= 0 or self.alpha < 10:
+            #print("not drawn")
+            return
+            
+        current_color = (self.color[0], self.color[1], self.color[2], self.alpha)
+        
+        # 1. Draw the Directional Triangle (Arrow)
+        arrow_size = self.indicator_size
+        
+        # Calculate the base of the triangle (perpendicular to the direction vector)
+        dir_x, dir_y = self.dir_x, self.dir_y
+        
+        # The center of the indicator is self.screen_x, self.screen_y
+        
+        # The base of the arrow faces the player
+        # Perpendicular (angle + 90 degrees): cos -> -sin, sin -> cos
+        base_x, base_y = -dir_y, dir_x
+        
+        p1_x = self.screen_x + arrow_size * dir_x
+        p1_y = self.screen_y - arrow_size * dir_y
+
+        p2_x = self.screen_x + arrow_size * base_x
+        p2_y = self.screen_y - arrow_size * base_y
+        
+        p3_x = self.screen_x - arrow_size * base_x
+        p3_y = self.screen_y + arrow_size * base_y
+        
+        # The per-pixel alpha surface is shared by all indicators and blitted once by IndicatorSystem.draw()
+        pygame.draw.polygon(arrow_surface, current_color, [(p1_x, p1_y), (p2_x, p2_y), (p3_x, p3_y)])
+        
+        # 2. Draw the Text Label (Fading)
+        if font:
+            # Render with a slight distance away from the triangle
+            text_x = self.screen_x + (arrow_size + 5) * dir_x
+            text_y = self.screen_y - (arrow_size + 5) * dir_y
+            
+            # Text should be rendered with opacity (not directly supported by pygame.font)
+            # We'll stick to full opacity text and let the triangle fade, or use an overlay trick
+            
+            # Simple text rendering (no fade on text to simplify)
+            text_surface = font.render(self.label, True, self.color)
+            text_rect = text_surface.get_rect(center=(int(text_x), int(text_y)))
+            surface.blit(text_surface, text_rect)
+
+
+# ----------------------------------------------------
+# --- INDICATOR SYSTEM ---
+# ----------------------------------------------------
+class IndicatorSystem:
+    """
+    Owns all active sound indicators. Aged once per simulation step and placed and drawn once per drawn
+    frame, coalesces repeated events from the same source and caps the number of active indicators.
+    """
+    def __init__(self, max_active=INDICATOR_MAX_ACTIVE, coalesce_frames=INDICATOR_COALESCE_FRAMES):
+        self.group = pygame.sprite.Group()
+        self.pool = ObjectPool(SoundIndicator, INDICATOR_POOL_SIZE)
+        self.max_active = max_active
+        self.coalesce_frames = coalesce_frames
+        self.frame = 0
+        
+        # (source id, sound_type) -> indicator, used for coalescing
+        self.by_source = {}
+        
+        # One full-screen alpha surface shared by all indicator arrows (allocated once)
+        self.arrow_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+
+    def add(self, sound_type, x, y, volume, listener_x, listener_y, source_id=EVENT_NO_SOURCE):
+        """Shows an indicator for a sound event, merging it into a recent one from the same source (tank id)."""
+        # Without a source, events coalesce by rounded position instead
+        if source_id == EVENT_NO_SOURCE:
+            source_id = (int(x) // TANK_WIDTH, int(y) // TANK_WIDTH)
+        key = (source_id, sound_type)
+        
+        existing = self.by_source.get(key)
+        if (existing is not None and existing.alive() and existing.source_key == key and
+                self.frame - existing.last_event_frame <= self.coalesce_frames):
+            existing.refresh(x, y, volume)
+            existing.last_event_frame = self.frame
+            return existing
+        
+        # Cap: make room by dropping the indicator closest to expiring
+        if len(self.group) >= self.max_active:
+            oldest = min(self.group, key=lambda indicator: indicator.lifetime)
+            oldest.kill()
+        
+        indicator = self.pool.acquire(sound_type, x, y, volume, listener_x, listener_y)
+        indicator.source_key = key
+        indicator.last_event_frame = self.frame
+        self.group.add(indicator)
+        self.by_source[key] = indicator
+        return indicator
+
+    def update(self):
+        """Ages every indicator by one simulation step. Must be called once per step (lifetimes count steps)."""
+        self.frame += 1
+        for indicator in self.group.sprites():
+            indicator.update()
+        
+        # Forget sources whose indicator has died (or been recycled for another source)
+        stale = [key for key, indicator in self.by_source.items()
+                 if not indicator.alive() or indicator.source_key != key]
+        for key in stale:
+            del self.by_source[key]
+
+    def draw(self, surface, font, listener_x, listener_y, camera_offset_x, camera_offset_y):
+        """
+        Places all active indicators around the listener's drawn position (interpolated, with the camera
+        offset of this drawn frame) and draws them, blitting the shared arrow surface once.
+        """
+        if not self.group:
+            return
+        center_x, center_y = listener_x + camera_offset_x, listener_y + camera_offset_y
+        self.arrow_surface.fill((0, 0, 0, 0))
+        for indicator in self.group:
+            indicator.place(listener_x, listener_y, center_x, center_y)
+            indicator.draw(surface, self.arrow_surface, font)
+        surface.blit(self.arrow_surface, (0, 0))
+
+    def clear(self):
+        """Removes all indicators, returning them to the pool."""
+        for indicator in self.group.sprites():
+            indicator.kill()
+        self.by_source.clear()
+
+    def __len__(self):
+        return len(self.group)
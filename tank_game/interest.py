@@ -0,0 +1,65 @@
+from .constants import *
+from .spatial import SpatialGrid
+
+# ----------------------------------------------------
+# --- AREA OF INTEREST & LEVEL OF DETAIL ---
+# ----------------------------------------------------
+class InterestManager:
+    """
+    Sorts entities into level-of-detail tiers by their distance to the nearest observer
+    (a player, or the local camera). Tier 0 (within the interest radius) is what some
+    observer can perceive: it is simulated every frame and replicated to clients.
+    Higher tiers are simulated at LOD_TIER_INTERVALS rates by the World.
+    """
+    def __init__(self, tier_distances=LOD_TIER_DISTANCES, cell_size=INTEREST_CELL_SIZE):
+        self.tier_distances = tier_distances
+        self.radius = tier_distances[0] # Interest radius (tier 0)
+        self.grid = SpatialGrid(cell_size)
+        self.observers = []
+        self.tiers = None # id(entity) -> tier for entities near an observer (None = no observers given, all tier 0)
+
+    def update(self, entities, observers):
+        """Re-bins the entities and recomputes their tiers. observers is a list of (x, y) positions."""
+        self.grid.rebuild(entities)
+        self.observers = list(observers)
+        tiers = {}
+        # Farthest boundary first: nearer tiers overwrite, entities beyond every boundary stay unlisted
+        for tier in range(len(self.tier_distances) - 1, -1, -1):
+            for x, y in self.observers:
+                for entity in self.grid.query_radius(x, y, self.tier_distances[tier]):
+                    tiers[id(entity)] = tier
+        self.tiers = tiers
+
+    def clear(self):
+        self.grid.rebuild([])
+        self.observers = []
+        self.tiers = None
+
+    def tier(self, entity):
+        """LOD tier of an entity as of the last update (0 = perceived by an observer)."""
+        if self.tiers is None:
+            return 0
+        return self.tiers.get(id(entity), len(self.tier_distances))
+
+    def is_active(self, entity):
+        """True if the entity is within the interest radius of any observer."""
+        return self.tier(entity) == 0
+
+    def tier_at(self, x, y):
+        """LOD tier of a world position (for entities that are not binned, like bullets)."""
+        if self.tiers is None:
+            return 0
+        nearest_sq = min(((x - ox) ** 2 + (y - oy) ** 2 for ox, oy in self.observers), default=float('inf'))
+        for tier, distance in enumerate(self.tier_distances):
+            if nearest_sq <= distance * distance:
+                return tier
+        return len(self.tier_distances)
+
+    def visible_from(self, x, y, radius=None):
+        """Entities (as binned by the last update) within the interest radius of a position."""
+        return self.grid.query_radius(x, y, self.radius if radius is None else radius)
+
+
+def within_distance(x1, y1, x2, y2, distance):
+    """Squared-distance range check (no square root)."""
+    return (x1 - x2) ** 2 + (y1 - y2) ** 2 <= distance * distance
@@ -0,0 +1,90 @@
+import pygame
+from .constants import *
+from .fastmath import sin_cos_deg_array
+
+try:
+    import numpy as np
+except ImportError: # Without NumPy every AI tank uses the scalar Tank.update_movement()
+    np = None
+
+# ----------------------------------------------------
+# --- BATCHED AI MOVEMENT ---
+# ----------------------------------------------------
+def step_ai_tanks(ai_tanks, terrain_index, timesteps=None):
+    """
+    Moves all AI tanks using NumPy array operations.
+    Same rules as the AI branch of Tank.update_movement(): throttle, speed-dependent
+    turning, integration, one batched terrain query, then world-bound clamping.
+    Each tank's drive input is read from its ai_keys dict. timesteps gives each tank's
+    step in frames (distant level-of-detail tiers move less often, in larger steps).
+    """
+    if timesteps is None:
+        timesteps = [1] * len(ai_tanks)
+    moving = [(tank, dt) for tank, dt in zip(ai_tanks, timesteps) if tank.is_alive]
+    if not moving:
+        return
+    ai_tanks = [tank for tank, _ in moving]
+
+    if np is None:
+        # Scalar fallback: a large timestep is taken as that many single-frame steps
+        for tank, dt in moving:
+            for _ in range(dt):
+                tank.update_movement(tank.ai_keys, is_player=False, terrain=terrain_index)
+        return
+
+    n = len(ai_tanks)
+    dt = np.fromiter((dt for _, dt in moving), dtype=np.float64, count=n)
+    x = np.fromiter((tank.x for tank in ai_tanks), dtype=np.float64, count=n)
+    y = np.fromiter((tank.y for tank in ai_tanks), dtype=np.float64, count=n)
+    angle = np.fromiter((tank.angle for tank in ai_tanks), dtype=np.float64, count=n)
+    speed = np.fromiter((tank.speed for tank in ai_tanks), dtype=np.float64, count=n)
+    forward = np.fromiter((tank.ai_keys.get(pygame.K_w, False) for tank in ai_tanks), dtype=bool, count=n)
+    reverse = np.fromiter((tank.ai_keys.get(pygame.K_r, False) for tank in ai_tanks), dtype=bool, count=n)
+    turn_left = np.fromiter((tank.ai_keys.get(pygame.K_a, False) for tank in ai_tanks), dtype=bool, count=n)
+    turn_right = np.fromiter((tank.ai_keys.get(pygame.K_s, False) for tank in ai_tanks), dtype=bool, count=n)
+
+    # 1. Throttle (Acceleration/Deceleration), scaled by the timestep
+    max_reverse_speed = TANK_MAX_SPEED / 2.0
+    decelerated = np.where(speed > 0, np.maximum(0.0, speed - TANK_ACCEL / 2 * dt),
+                           np.minimum(0.0, speed + TANK_ACCEL / 2 * dt))
+    speed = np.where(forward, np.minimum(speed + TANK_ACCEL * dt, TANK_MAX_SPEED),
+                     np.where(reverse, np.maximum(speed - TANK_ACCEL * dt, -max_reverse_speed), decelerated))
+
+    # 2. Steering (turn rate grows as speed drops)
+    abs_speed = np.abs(speed)
+    dynamic_turn_rate = BASE_TURN_RATE * (1.0 + (TANK_MAX_SPEED - abs_speed) / TANK_MAX_SPEED)
+    turn = dynamic_turn_rate * np.where(speed > 0, 1.0, -1.0) * dt
+    can_turn = abs_speed > 0.01
+    angle = angle - np.where(can_turn & turn_left, turn, 0.0) + np.where(can_turn & turn_right & ~turn_left, turn, 0.0)
+
+    # 3. Potential movement
+    # Heading (table lookup): (cos(angle - 90), sin(angle - 90)) == (sin(angle), -cos(angle))
+    sin_angle, cos_angle = sin_cos_deg_array(angle)
+    new_x = x + speed * dt * sin_angle
+    new_y = y - speed * dt * cos_angle
+
+    # 4. Collision Detection (one batched query against the terrain index)
+    colliding = terrain_index.collide_batch(new_x, new_y, TANK_WIDTH, TANK_HEIGHT)
+    speed[colliding] = 0.0
+    x = np.where(colliding, x, new_x)
+    y = np.where(colliding, y, new_y)
+
+    # 5. World Boundary Clamping
+    half_width, half_height = TANK_WIDTH / 2, TANK_HEIGHT / 2
+    bounds = terrain_index.bounds
+    clamped_x = np.clip(x, bounds.min_x + half_width, bounds.max_x - half_width)
+    clamped_y = np.clip(y, bounds.min_y + half_height, bounds.max_y - half_height)
+    stopped = colliding | (clamped_x != x) | (clamped_y != y)
+    speed[stopped] = 0.0
+
+    # 6. Write the results back to the sprites
+    for i, tank in enumerate(ai_tanks):
+        tank.x = float(clamped_x[i])
+        tank.y = float(clamped_y[i])
+        tank.angle = float(angle[i])
+        tank.speed = float(speed[i])
+        if stopped[i]:
+            if colliding[i]:
+                tank.blocked_frames += int(dt[i])
+            tank.left_track_speed = 0.0
+            tank.right_track_speed = 0.0
@@ -0,0 +1,214 @@
+import os
+import csv
+import math
+import time
+import argparse
+from .constants import *
+
+try:
+    import numpy as np
+except ImportError: # Without NumPy the counters are lists and samples are taken tank by tank
+    np = None
+
+# ----------------------------------------------------
+# --- COMBAT STATISTICS ---
+# ----------------------------------------------------
+# Per-tank counters live in one fixed array (a row per tank id, a column per field). Combat counters
+# come from the event bus batches (no work in the simulation step); movement is one vectorized sample
+# every METRICS_SAMPLE_INTERVAL steps (distance along the sampled positions, terrain-blocked frames from
+# each tank's own counter). At level end the rows, plus one total row per faction (tank_id -1), are
+# appended to a CSV file.
+
+METRIC_FIELDS = ('shots', 'hits', 'damage_dealt', 'damage_taken', 'kills', 'deaths',
+                 'distance', 'collision_frames', 'time_to_kill')
+METRIC_COLUMNS = ('match', 'level', 'frames', 'tank_id', 'faction') + METRIC_FIELDS
+FACTIONS = ('Friendly', 'Enemy')
+(SHOTS, HITS, DAMAGE_DEALT, DAMAGE_TAKEN, KILLS, DEATHS,
+ DISTANCE, COLLISION_FRAMES, TIME_TO_KILL) = range(len(METRIC_FIELDS))
+
+class MatchMetrics:
+    """
+    Combat statistics of one level. Subscribe consume() to the world's event bus, call add_tank() on
+    spawn and sample() periodically (and for a tank leaving the world); write() appends the level's
+    rows to a CSV file.
+    time_to_kill is the frames from a tank's first hit taken to its destruction (-1 if it survived).
+    """
+    def __init__(self, capacity=METRICS_INITIAL_CAPACITY):
+        self.capacity = 0
+        self.counters = None # [tank_id][field]
+        self.last_positions = None # [tank_id] -> (x, y) at the previous sample
+        self.factions = [] # [tank_id] -> index in FACTIONS (-1: unused id)
+        self.first_hit_frames = [] # [tank_id] -> frame of the first hit taken (-1: none yet)
+        self._allocate(capacity)
+        self.clear()
+
+    def _allocate(self, capacity):
+        """(Re)sizes the per-tank arrays, keeping the existing rows."""
+        grow = capacity - self.capacity
+        if np is not None:
+            counters = np.zeros((capacity, len(METRIC_FIELDS)))
+            positions = np.zeros((capacity, 2))
+            if self.capacity:
+                counters[:self.capacity] = self.counters
+                positions[:self.capacity] = self.last_positions
+            self.counters, self.last_positions = counters, positions
+        else:
+            self.counters = (self.counters or []) + [[0.0] * len(METRIC_FIELDS) for _ in range(grow)]
+            self.last_positions = (self.last_positions or []) + [[0.0, 0.0] for _ in range(grow)]
+        self.factions += [-1] * grow
+        self.first_hit_frames += [-1] * grow
+        self.capacity = capacity
+
+    def clear(self):
+        """Starts a new level (tank ids are reassigned by the world)."""
+        for tank_id in range(self.capacity):
+            self.counters[tank_id][:] = [0.0] * len(METRIC_FIELDS)
+            self.factions[tank_id] = -1
+            self.first_hit_frames[tank_id] = -1
+        self.used = 0 # Highest tank id seen + 1
+        self.match = f"{int(time.time() * 1000):x}-{os.getpid():x}" # Groups the rows written for this level
+
+    def add_tank(self, tank):
+        """Starts the row of a spawned tank."""
+        tank_id = tank.tank_id
+        if tank_id >= self.capacity:
+            self._allocate(max(tank_id + 1, self.capacity * 2))
+        self.used = max(self.used, tank_id + 1)
+        self.factions[tank_id] = FACTIONS.index(tank.allegiance)
+        self.last_positions[tank_id][0] = tank.x
+        self.last_positions[tank_id][1] = tank.y
+
+    def consume(self, events):
+        """Event bus consumer: shots, hits, damage, kills and time to kill from one batch."""
+        counters = self.counters
+        for kind, frame, _, _, source_id, shooter_id in events:
+            if source_id < 0 or source_id >= self.used:
+                continue # Chunk events, tanks that were never added
+            if kind == EVENT_FIRE:
+                counters[source_id][SHOTS] += 1
+            elif kind == EVENT_HIT:
+                counters[source_id][DAMAGE_TAKEN] += BULLET_DAMAGE
+                if self.first_hit_frames[source_id] < 0:
+                    self.first_hit_frames[source_id] = frame
+                if 0 <= shooter_id < self.used:
+                    counters[shooter_id][HITS] += 1
+                    counters[shooter_id][DAMAGE_DEALT] += BULLET_DAMAGE
+            elif kind == EVENT_KILL:
+                counters[source_id][DEATHS] += 1
+                counters[source_id][TIME_TO_KILL] = frame - self.first_hit_frames[source_id]
+                if 0 <= shooter_id < self.used:
+                    counters[shooter_id][KILLS] += 1
+
+    def sample(self, tanks):
+        """Adds the distance moved since the last sample and takes over the tanks' terrain-blocked frame counts."""
+        if np is None:
+            for tank in tanks:
+                if not 0 <= tank.tank_id < self.used:
+                    continue
+                last = self.last_positions[tank.tank_id]
+                row = self.counters[tank.tank_id]
+                row[DISTANCE] += math.hypot(tank.x - last[0], tank.y - last[1])
+                row[COLLISION_FRAMES] = tank.blocked_frames
+                last[0], last[1] = tank.x, tank.y
+            return
+        tanks = [tank for tank in tanks if 0 <= tank.tank_id < self.used]
+        n = len(tanks)
+        if not n:
+            return
+        ids = np.fromiter((tank.tank_id for tank in tanks), dtype=np.intp, count=n)
+        positions = np.empty((n, 2))
+        positions[:, 0] = np.fromiter((tank.x for tank in tanks), dtype=np.float64, count=n)
+        positions[:, 1] = np.fromiter((tank.y for tank in tanks), dtype=np.float64, count=n)
+        step = positions - self.last_positions[ids]
+        self.counters[ids, DISTANCE] += np.hypot(step[:, 0], step[:, 1]) # Tank ids are unique: no np.add.at needed
+        self.counters[ids, COLLISION_FRAMES] = np.fromiter((tank.blocked_frames for tank in tanks), dtype=np.float64, count=n)
+        self.last_positions[ids] = positions
+
+    def faction_totals(self):
+        """{faction: totals per field} (time_to_kill: mean over the destroyed tanks, -1 if none)."""
+        totals = {}
+        for index, faction in enumerate(FACTIONS):
+            rows = [self.counters[tank_id] for tank_id in range(self.used) if self.factions[tank_id] == index]
+            if not rows:
+                continue
+            total = [sum(row[field] for row in rows) for field in range(len(METRIC_FIELDS))]
+            kill_times = [row[TIME_TO_KILL] for row in rows if row[DEATHS]]
+            total[TIME_TO_KILL] = sum(kill_times) / len(kill_times) if kill_times else -1
+            totals[faction] = total
+        return totals
+
+    def write(self, path, level, frames):
+        """Appends this level's tank rows and faction totals to a CSV file (the header only once)."""
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        with open(path, 'a', newline='') as file:
+            writer = csv.writer(file)
+            if new_file:
+                writer.writerow(METRIC_COLUMNS)
+            prefix = (self.match, level, frames)
+            for tank_id in range(self.used):
+                faction = self.factions[tank_id]
+                if faction < 0:
+                    continue
+                row = list(self.counters[tank_id])
+                if not row[DEATHS]:
+                    row[TIME_TO_KILL] = -1
+                writer.writerow(prefix + (tank_id, FACTIONS[faction]) + tuple(_format(value) for value in row))
+            for faction, total in self.faction_totals().items():
+                writer.writerow(prefix + (-1, faction) + tuple(_format(value) for value in total))
+
+def _format(value):
+    """Counters as integers when they are whole (keeps the file small and readable)."""
+    value = float(value)
+    return int(value) if value.is_integer() else round(value, 2)
+
+# ----------------------------------------------------
+# --- AGGREGATION ---
+# ----------------------------------------------------
+def load_faction_totals(path):
+    """
+    Reads the faction total rows of a metrics file as {faction: {field: values}} (one value per level).
+    With NumPy the numeric columns are parsed in one call, so thousands of matches load quickly.
+    """
+    with open(path, newline='') as file:
+        reader = csv.reader(file)
+        header = next(reader)
+        rows = [row for row in reader if row[header.index('tank_id')] == '-1']
+    faction_column = header.index('faction')
+    field_columns = [header.index(field) for field in METRIC_FIELDS]
+    result = {}
+    for faction in FACTIONS:
+        faction_rows = [row for row in rows if row[faction_column] == faction]
+        if np is not None:
+            values = np.array([[row[i] for i in field_columns] for row in faction_rows], dtype=np.float64)
+            values = values.reshape(len(faction_rows), len(METRIC_FIELDS))
+            result[faction] = {field: values[:, i] for i, field in enumerate(METRIC_FIELDS)}
+        else:
+            result[faction] = {field: [float(row[i]) for row in faction_rows]
+                               for field, i in zip(METRIC_FIELDS, field_columns)}
+    return result
+
+def summarize(path):
+    """Prints the per-level mean of every faction counter across all matches in a metrics file."""
+    for faction, fields in load_faction_totals(path).items():
+        levels = len(fields['shots'])
+        if not levels:
+            continue
+        print(f"{faction} ({levels} levels)")
+        for field, values in fields.items():
+            if field == 'time_to_kill':
+                values = [value for value in values if value >= 0] # Levels where nothing died have no time
+            mean = sum(values) / len(values) if len(values) else float('nan')
+            print(f"  {field:<18}{mean:12.2f}")
+        shots, hits = sum(fields['shots']), sum(fields['hits'])
+        print(f"  {'accuracy':<18}{(hits / shots if shots else 0.0):12.2%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarizes a combat statistics file written with --metrics.")
+    parser.add_argument('path')
+    args = parser.parse_args()
+    summarize(args.path)
+
+
+if __name__ == '__main__':
+    main()
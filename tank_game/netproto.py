@@ -0,0 +1,81 @@
+import struct
+from .constants import *
+
+# ----------------------------------------------------
+# --- WIRE PROTOCOL (server.py <-> client.py) ---
+# ----------------------------------------------------
+# Every message is a 5-byte header (type, payload length) followed by the payload.
+# All values are big-endian; positions are fixed-point with NET_POSITION_SCALE steps per world unit.
+
+MSG_HELLO = 1 # client -> server: join request (empty payload)
+MSG_WELCOME = 2 # server -> client: your tank id, the tick rate and the world bounds
+MSG_INPUT = 3 # client -> server: drive system, held actions, turret aim, last frame received
+MSG_TERRAIN = 4 # server -> client: terrain rects (replace all, or append)
+MSG_STATE = 5 # server -> client: one world state frame (see netcodec.py)
+
+HEADER = struct.Struct('!BI')
+WELCOME = struct.Struct('!HHiiii') # tank id, tick rate, world min x, min y, max x, max y
+INPUT = struct.Struct('!BHhI') # drive system (0 = standard, 1 = independent), action bits, aim angle * 10, acked tick
+TERRAIN_HEADER = struct.Struct('!BI') # 1 = replace all terrain, feature count
+TERRAIN_RECT = struct.Struct('!iiHH') # left, top, width, height
+
+# Input action bits (drive-system independent names, see PlayerTank.control_keys)
+INPUT_ACTIONS = ('f', 'r', 'l', 's', 'lf', 'lr', 'rf', 'rr')
+INPUT_FIRE = 1 << len(INPUT_ACTIONS)
+
+DRIVE_SYSTEMS = (DRIVE_SYSTEM_STANDARD, DRIVE_SYSTEM_INDEPENDENT)
+
+
+def pack_message(msg_type, payload=b''):
+    """Frames a payload with the message header."""
+    return HEADER.pack(msg_type, len(payload)) + payload
+
+async def read_message(reader, max_length=NET_MAX_MESSAGE_SIZE):
+    """
+    Reads one framed message from an asyncio StreamReader. Returns (msg_type, payload).
+    Raises ValueError for a payload longer than max_length (before reading it).
+    """
+    header = await reader.readexactly(HEADER.size)
+    msg_type, length = HEADER.unpack(header)
+    if length > max_length:
+        raise ValueError(f"message of {length} bytes exceeds the {max_length} byte limit")
+    payload = await reader.readexactly(length) if length else b''
+    return msg_type, payload
+
+# --- INPUT ---
+
+def encode_input(drive_system, pressed_actions, aim_angle, fire, acked_tick=0):
+    """pressed_actions is an iterable of action names from INPUT_ACTIONS; acked_tick is the last frame decoded."""
+    bits = 0
+    for action in pressed_actions:
+        bits |= 1 << INPUT_ACTIONS.index(action)
+    if fire:
+        bits |= INPUT_FIRE
+    aim = int(round(((aim_angle + 180) % 360 - 180) * 10))
+    return pack_message(MSG_INPUT, INPUT.pack(DRIVE_SYSTEMS.index(drive_system), bits, aim, acked_tick))
+
+def decode_input(payload):
+    """
+    Returns (drive_system, set of pressed action names, aim angle in degrees, fire flag, acked tick).
+    Raises ValueError for a malformed payload.
+    """
+    if len(payload) != INPUT.size:
+        raise ValueError(f"input of {len(payload)} bytes (expected {INPUT.size})")
+    drive, bits, aim, acked_tick = INPUT.unpack(payload)
+    if drive >= len(DRIVE_SYSTEMS):
+        raise ValueError(f"unknown drive system {drive}")
+    pressed = {action for i, action in enumerate(INPUT_ACTIONS) if bits & (1 << i)}
+    return DRIVE_SYSTEMS[drive], pressed, aim / 10.0, bool(bits & INPUT_FIRE), acked_tick
+
+# --- TERRAIN ---
+
+def encode_terrain(features, replace):
+    parts = [TERRAIN_HEADER.pack(1 if replace else 0, len(features))]
+    parts.extend(TERRAIN_RECT.pack(f.left, f.top, f.width, f.height) for f in features)
+    return pack_message(MSG_TERRAIN, b''.join(parts))
+
+def decode_terrain(payload):
+    """Returns (replace flag, list of (left, top, width, height))."""
+    replace, count = TERRAIN_HEADER.unpack_from(payload)
+    rects = [TERRAIN_RECT.unpack_from(payload, TERRAIN_HEADER.size + i * TERRAIN_RECT.size) for i in range(count)]
+    return bool(replace), rects
@@ -0,0 +1,49 @@
+from concurrent.futures import ThreadPoolExecutor
+from .constants import *
+
+# ----------------------------------------------------
+# --- AI UPDATE PIPELINE ---
+# ----------------------------------------------------
+class AIPipeline:
+    """
+    Runs the read-only sense/think phase of all AI tanks across a thread pool.
+
+    A frame is split into phases:
+      1. think   - tank.think(targets) for every AI tank (parallel, no shared writes)
+      2. apply   - tank.apply_decision(decision) in tank order (serial)
+      3. move    - batched movement (kinematics.step_ai_tanks)
+      4. sight   - one batched line-of-sight query for the tanks ready to fire (sightline.LineOfSight)
+      5. act     - tank.act(decision, ...) in tank order (serial: firing, recorded as events)
+    Decisions are returned in job order, so outcomes do not depend on the thread count.
+    Helps on free-threaded Python builds and when think() calls into NumPy kernels that release the GIL.
+    """
+    def __init__(self, workers=AI_WORKER_THREADS, min_parallel=AI_PARALLEL_MIN_TANKS):
+        self.workers = max(1, workers)
+        self.min_parallel = min_parallel
+        self.executor = ThreadPoolExecutor(max_workers=self.workers) if self.workers > 1 else None
+
+    @staticmethod
+    def _think_slice(jobs):
+        return [tank.think(*args) for tank, *args in jobs]
+
+    def think_all(self, jobs):
+        """
+        Runs tank.think(*args) for each (tank, *args) job, e.g. (tank, targets, frames).
+        Returns the decisions in the same order as jobs.
+        """
+        if self.executor is None or len(jobs) < self.min_parallel:
+            return self._think_slice(jobs)
+
+        # One contiguous slice per worker keeps the per-task overhead low
+        slice_size = -(-len(jobs) // self.workers)
+        slices = [jobs[i:i + slice_size] for i in range(0, len(jobs), slice_size)]
+        decisions = []
+        for result in self.executor.map(self._think_slice, slices):
+            decisions.extend(result)
+        return decisions
+
+    def shutdown(self):
+        """Stops the worker threads."""
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
@@ -0,0 +1,46 @@
+# ----------------------------------------------------
+# --- OBJECT POOL CLASS ---
+# ----------------------------------------------------
+class ObjectPool:
+    """
+    Free-list pool for short-lived sprites (bullets, sound indicators).
+    Pooled classes must accept their constructor arguments in reset() as well,
+    and hand themselves back with pool.release() when they die.
+    """
+    def __init__(self, factory, max_size):
+        self.factory = factory
+        self.max_size = max_size
+        self.free = []
+
+        # Counters for tuning max_size
+        self.hits = 0 # acquire() served from the free list
+        self.misses = 0 # acquire() had to construct a new object
+        self.discarded = 0 # release() dropped the object because the pool was full
+
+    def acquire(self, *args):
+        """Returns a recycled object re-initialized with args, or a new one if the pool is empty."""
+        if self.free:
+            obj = self.free.pop()
+            obj.reset(*args)
+            self.hits += 1
+        else:
+            obj = self.factory(*args)
+            obj.pool = self
+            self.misses += 1
+        return obj
+
+    def release(self, obj):
+        """Returns a dead object to the free list (dropped if the pool is already full)."""
+        if len(self.free) < self.max_size:
+            self.free.append(obj)
+        else:
+            self.discarded += 1
+
+    def stats(self):
+        """Returns the pool counters as a dict (for debugging/HUD output)."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'discarded': self.discarded,
+            'free': len(self.free),
+        }
@@ -0,0 +1,64 @@
+from collections import deque
+from .constants import *
+
+# ----------------------------------------------------
+# --- QUALITY GOVERNOR ---
+# ----------------------------------------------------
+class QualityGovernor:
+    """
+    Steps through QUALITY_TIERS from the rolling average of measured frame times: one tier down when
+    frames run over budget, one tier up when there is headroom again. Hysteresis comes from the gap
+    between the two thresholds, a full window of frames after every change, and a restore hold that
+    doubles each time a restored tier turns out to be too slow (so the tier does not oscillate).
+    """
+    def __init__(self, tiers=QUALITY_TIERS, budget=QUALITY_FRAME_BUDGET, window=QUALITY_WINDOW_FRAMES):
+        self.tiers = tiers
+        self.budget = budget
+        self.window = window
+        self.frame_times = deque(maxlen=window)
+        self.total_time = 0.0 # Sum of frame_times
+        self.tier = 0
+        self.frames_at_tier = 0
+        self.restore_hold = window # Frames at a tier before stepping back up
+        self.last_change = 0 # +1 = stepped down, -1 = stepped up
+        self.last_average = 0.0 # Average frame time behind the latest decision
+
+    @property
+    def settings(self):
+        """The current tier's settings (a QUALITY_TIERS entry)."""
+        return self.tiers[self.tier]
+
+    def average_frame_time(self):
+        return self.total_time / len(self.frame_times) if self.frame_times else 0.0
+
+    def record(self, frame_time):
+        """Adds one frame's work time (seconds, excluding the frame limiter). Returns True if the tier changed."""
+        if len(self.frame_times) == self.window:
+            self.total_time -= self.frame_times[0]
+        self.frame_times.append(frame_time)
+        self.total_time += frame_time
+        self.frames_at_tier += 1
+        if len(self.frame_times) < self.window:
+            return False
+
+        average = self.last_average = self.total_time / self.window
+        if average > self.budget * QUALITY_DEGRADE_RATIO and self.tier < len(self.tiers) - 1:
+            if self.last_change < 0 and self.frames_at_tier <= self.window:
+                self.restore_hold = min(self.restore_hold * 2, QUALITY_MAX_RESTORE_HOLD) # The restore did not hold
+            self._change(+1)
+            return True
+        if (average < self.budget * QUALITY_RESTORE_RATIO and self.tier > 0 and
+                self.frames_at_tier >= self.restore_hold):
+            self._change(-1)
+            return True
+        if self.last_change < 0 and self.frames_at_tier > self.window:
+            self.restore_hold = self.window # The last restore held: back to the normal wait
+            self.last_change = 0
+        return False
+
+    def _change(self, step):
+        self.tier += step
+        self.last_change = step
+        self.frames_at_tier = 0
+        self.frame_times.clear() # The next decision only sees frames drawn at the new tier
+        self.total_time = 0.0
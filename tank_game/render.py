@@ -0,0 +1,244 @@
+import pygame
+from .constants import *
+from .fastmath import sin_deg, cos_deg
+
+# ----------------------------------------------------
+# --- BATCHED DRAWING ---
+# ----------------------------------------------------
+# Bullets and tanks are drawn in passes grouped by primitive and color instead of one sprite at a time:
+# shared pre-rendered glyphs go out in a single Surface.blits() call per pass, and barrels and
+# health bars are drawn in tight loops over lists packed during the culling pass. Terrain and
+# wrecks are static, so they are drawn once into cached chunk surfaces.
+
+HEALTH_BAR_HEIGHT = 5
+HEALTH_BAR_OFFSET = 10 # Pixels between the top of the tank rect and its health bar
+MAX_CACHED_CHUNKS = 24 # Chunk surfaces kept before the off-screen ones are dropped
+
+def camera_offsets(center_x, center_y, bounds):
+    """Camera offsets centered on a world position, clamped to the world boundaries (a WorldBounds)."""
+    offset_x = max(SCREEN_WIDTH - bounds.max_x, min(-bounds.min_x, SCREEN_WIDTH // 2 - center_x))
+    offset_y = max(SCREEN_HEIGHT - bounds.max_y, min(-bounds.min_y, SCREEN_HEIGHT // 2 - center_y))
+    return offset_x, offset_y
+
+def interpolate(previous, current, alpha):
+    """Value `alpha` (0..1) of the way from the previous simulation step to the current one."""
+    return previous + (current - previous) * alpha
+
+def interpolate_angle(previous, current, alpha):
+    """Same for an angle in degrees, along the shorter arc."""
+    return previous + ((current - previous + 180) % 360 - 180) * alpha
+
+def _finish(glyph):
+    """Converts a glyph to the display's pixel format (faster blits) once a window exists."""
+    return glyph.convert_alpha() if pygame.display.get_surface() is not None else glyph
+
+def _circle_glyph(color, radius):
+    glyph = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+    pygame.draw.circle(glyph, color, (radius, radius), radius)
+    return _finish(glyph)
+
+def _body_glyph(body_color):
+    """Unrotated tank body: rounded hull between the two tracks."""
+    glyph = pygame.Surface((TANK_WIDTH, TANK_HEIGHT), pygame.SRCALPHA)
+    body_rect = pygame.Rect(TANK_WIDTH * 0.1, TANK_HEIGHT * 0.1, TANK_WIDTH * 0.8, TANK_HEIGHT * 0.8)
+    pygame.draw.rect(glyph, body_color, body_rect, border_radius=5)
+    track_width = TANK_WIDTH * 0.15
+    pygame.draw.rect(glyph, DARK_GRAY, pygame.Rect(0, 0, track_width, TANK_HEIGHT), border_radius=3)
+    pygame.draw.rect(glyph, DARK_GRAY, pygame.Rect(TANK_WIDTH - track_width, 0, track_width, TANK_HEIGHT), border_radius=3)
+    return glyph
+
+
+class BatchRenderer:
+    """
+    Draws bullets and tanks with a bounded number of Python-level draw calls.
+    Glyphs are built lazily and shared: one per bullet color, one per (body color, rotation step).
+    rotation_step and wreck_details may be changed between frames (see QualityGovernor).
+    """
+    def __init__(self, rotation_step=SPRITE_ROTATION_STEP):
+        self.rotation_step = rotation_step # Degrees between the drawn body rotations
+        self.wreck_details = True # Smoke and hole glyphs on wrecks (live-drawn and baked into the chunks)
+        self.bullet_glyphs = {} # color -> circle
+        self.body_glyphs = {} # body color -> unrotated body
+        self.rotated_bodies = {} # (body color, rotation step, index) -> (surface, half width, half height)
+        self.turret_glyph = None
+        self.wreck_glyph = None
+
+        # Static scenery: one opaque surface per chunk with its terrain and baked wrecks drawn in
+        self.chunk_surfaces = {} # (chunk_x, chunk_y) -> surface
+        self.terrain_version = None # World.terrain_version the cached chunks were drawn from
+        self.terrain_edits = 0 # Entries of World.terrain_edits already in the cached chunks
+        self.baked_wrecks = 0 # Entries of World.wrecks already stamped into the cached chunks
+        self.baked_wreck_details = None # wreck_details the cached chunks were stamped with
+
+    def bullet_glyph(self, color):
+        glyph = self.bullet_glyphs.get(color)
+        if glyph is None:
+            glyph = self.bullet_glyphs[color] = _circle_glyph(color, BULLET_RADIUS)
+        return glyph
+
+    def _rotated_body(self, body_color, angle):
+        step = self.rotation_step
+        key = (body_color, step, round(angle / step) % round(360 / step))
+        entry = self.rotated_bodies.get(key)
+        if entry is None:
+            body = self.body_glyphs.get(body_color)
+            if body is None:
+                body = self.body_glyphs[body_color] = _body_glyph(body_color)
+            rotated = _finish(pygame.transform.rotate(body, -key[2] * step))
+            entry = self.rotated_bodies[key] = (rotated, rotated.get_width() // 2, rotated.get_height() // 2)
+        return entry
+
+    def _build_shared_glyphs(self):
+        self.turret_glyph = _circle_glyph(DARK_GRAY, TANK_WIDTH // 4)
+        # Wreck details: smoke circle with a black hole in the middle
+        radius = TANK_WIDTH // 3
+        wreck = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        pygame.draw.circle(wreck, WRECK_COLOR_SMOKE, (radius, radius), radius)
+        pygame.draw.circle(wreck, BLACK, (radius, radius), TANK_WIDTH // 6)
+        self.wreck_glyph = _finish(wreck)
+
+    def _stamp_wreck(self, chunk_surface, chunk_left, chunk_top, wreck):
+        """Draws a wreck's final image into a chunk surface."""
+        body, half_width, half_height = self._rotated_body(WRECK_COLOR_BODY, wreck.angle)
+        x, y = int(wreck.x) - chunk_left, int(wreck.y) - chunk_top
+        chunk_surface.blit(body, (x - half_width, y - half_height))
+        if self.wreck_details:
+            radius = TANK_WIDTH // 3
+            chunk_surface.blit(self.wreck_glyph, (x - radius, y - radius))
+
+    def _chunk_surface(self, world, chunk_x, chunk_y):
+        """Draws a chunk's terrain features and the wrecks on it into a new chunk-sized surface."""
+        left, top = chunk_x * CHUNK_SIZE, chunk_y * CHUNK_SIZE
+        chunk_surface = pygame.Surface((CHUNK_SIZE, CHUNK_SIZE))
+        if pygame.display.get_surface() is not None:
+            chunk_surface = chunk_surface.convert()
+        chunk_surface.fill(GREEN)
+        for feature in world.terrain_index.query_rect(pygame.Rect(left, top, CHUNK_SIZE, CHUNK_SIZE)):
+            pygame.draw.rect(chunk_surface, BROWN, feature.move(-left, -top))
+        for wreck in world.wrecks_near_chunk(chunk_x, chunk_y):
+            self._stamp_wreck(chunk_surface, left, top, wreck)
+        return chunk_surface
+
+    def draw_terrain(self, surface, world, camera_offset_x, camera_offset_y):
+        """
+        Draws the ground, terrain features and wrecks of a World by blitting the visible chunk surfaces.
+        Chunks are drawn once and cached: loading or unloading terrain only invalidates the chunks it
+        overlaps, and newly destroyed tanks are stamped into the cached chunks they overlap.
+        """
+        if self.turret_glyph is None:
+            self._build_shared_glyphs()
+        chunks = self.chunk_surfaces
+        if world.terrain_version != self.terrain_version or self.wreck_details != self.baked_wreck_details:
+            chunks.clear() # Rebuilt lazily below, with everything so far
+            self.terrain_version = world.terrain_version
+            self.baked_wreck_details = self.wreck_details
+            self.terrain_edits = len(world.terrain_edits)
+            self.baked_wrecks = len(world.wrecks)
+
+        # Terrain loaded or unloaded since the last frame: its chunks are redrawn
+        for feature in world.terrain_edits[self.terrain_edits:]:
+            for chunk_y in range(feature.top // CHUNK_SIZE, (feature.bottom - 1) // CHUNK_SIZE + 1):
+                for chunk_x in range(feature.left // CHUNK_SIZE, (feature.right - 1) // CHUNK_SIZE + 1):
+                    chunks.pop((chunk_x, chunk_y), None)
+        self.terrain_edits = len(world.terrain_edits)
+
+        # Wrecks destroyed since the last frame
+        reach = int(TANK_BOUNDING_RADIUS) + 1
+        for wreck in world.wrecks[self.baked_wrecks:]:
+            x, y = int(wreck.x), int(wreck.y)
+            for chunk_y in range((y - reach) // CHUNK_SIZE, (y + reach) // CHUNK_SIZE + 1):
+                for chunk_x in range((x - reach) // CHUNK_SIZE, (x + reach) // CHUNK_SIZE + 1):
+                    chunk_surface = chunks.get((chunk_x, chunk_y))
+                    if chunk_surface is not None:
+                        self._stamp_wreck(chunk_surface, chunk_x * CHUNK_SIZE, chunk_y * CHUNK_SIZE, wreck)
+        self.baked_wrecks = len(world.wrecks)
+
+        offset_x, offset_y = int(camera_offset_x), int(camera_offset_y)
+        first_x, first_y = -offset_x // CHUNK_SIZE, -offset_y // CHUNK_SIZE
+        last_x, last_y = (SCREEN_WIDTH - 1 - offset_x) // CHUNK_SIZE, (SCREEN_HEIGHT - 1 - offset_y) // CHUNK_SIZE
+        batch = []
+        for chunk_y in range(first_y, last_y + 1):
+            for chunk_x in range(first_x, last_x + 1):
+                chunk_surface = chunks.get((chunk_x, chunk_y))
+                if chunk_surface is None:
+                    chunk_surface = chunks[(chunk_x, chunk_y)] = self._chunk_surface(world, chunk_x, chunk_y)
+                batch.append((chunk_surface, (chunk_x * CHUNK_SIZE + offset_x, chunk_y * CHUNK_SIZE + offset_y)))
+        surface.blits(batch, False)
+        if len(chunks) > MAX_CACHED_CHUNKS:
+            visible = {(x, y) for y in range(first_y, last_y + 1) for x in range(first_x, last_x + 1)}
+            for key in [key for key in chunks if key not in visible]:
+                del chunks[key]
+
+    def draw_bullets(self, surface, bullets, camera_offset_x, camera_offset_y):
+        """Draws (x, y, color) bullets in world units with one blits() call."""
+        glyphs = self.bullet_glyphs
+        offset_x = camera_offset_x - BULLET_RADIUS
+        offset_y = camera_offset_y - BULLET_RADIUS
+        batch = []
+        for x, y, color in bullets:
+            glyph = glyphs.get(color) or self.bullet_glyph(color)
+            batch.append((glyph, (int(x + offset_x), int(y + offset_y))))
+        surface.blits(batch, False)
+
+    def draw_tanks(self, surface, tanks, camera_offset_x, camera_offset_y, alpha=1.0):
+        """
+        Draws wrecks first, then live tanks: bodies, turrets, barrels and health bars, one pass each.
+        Poses are interpolated `alpha` of the way from the previous simulation step (see Tank.save_pose()).
+        Tanks outside the screen are skipped; drawn tanks get their screen rect updated (player aiming uses it).
+        """
+        if self.turret_glyph is None:
+            self._build_shared_glyphs()
+
+        # Culling pass: pack everything the draw passes need
+        margin = TANK_BOUNDING_RADIUS + TURRET_LENGTH + HEALTH_BAR_OFFSET
+        min_x, max_x = -margin - camera_offset_x, SCREEN_WIDTH + margin - camera_offset_x
+        min_y, max_y = -margin - camera_offset_y, SCREEN_HEIGHT + margin - camera_offset_y
+        half_width, half_height = TANK_WIDTH // 2, TANK_HEIGHT // 2
+        rotated_body = self._rotated_body
+        wreck_bodies, wreck_details = [], []
+        live_bodies, centers, barrels, health_bars = [], [], [], []
+        for tank in tanks:
+            x, y = tank.x, tank.y
+            if not (min_x < x < max_x and min_y < y < max_y):
+                continue
+            if alpha < 1.0:
+                x = tank.prev_x + (x - tank.prev_x) * alpha
+                y = tank.prev_y + (y - tank.prev_y) * alpha
+                angle = interpolate_angle(tank.prev_angle, tank.angle, alpha)
+                turret_angle = interpolate_angle(tank.prev_turret_angle, tank.turret_angle, alpha)
+            else:
+                angle, turret_angle = tank.angle, tank.turret_angle
+            center_x, center_y = int(x + camera_offset_x), int(y + camera_offset_y)
+            tank.rect.center = (center_x, center_y)
+            if tank.is_wreck:
+                body, body_half_width, body_half_height = rotated_body(WRECK_COLOR_BODY, angle)
+                wreck_bodies.append((body, (center_x - body_half_width, center_y - body_half_height)))
+                wreck_details.append((center_x, center_y))
+            elif tank.is_alive:
+                body, body_half_width, body_half_height = rotated_body(tank.color, angle)
+                live_bodies.append((body, (center_x - body_half_width, center_y - body_half_height)))
+                centers.append((center_x, center_y))
+                barrels.append((center_x + TURRET_LENGTH * cos_deg(turret_angle),
+                                center_y - TURRET_LENGTH * sin_deg(turret_angle)))
+                health_bars.append((center_x - half_width, center_y - half_height - HEALTH_BAR_OFFSET,
+                                    int(TANK_WIDTH * tank.health / tank.max_health)))
+
+        # Wrecks
+        surface.blits(wreck_bodies, False)
+        if self.wreck_details:
+            radius = TANK_WIDTH // 3
+            surface.blits([(self.wreck_glyph, (x - radius, y - radius)) for x, y in wreck_details], False)
+
+        # Live tanks
+        surface.blits(live_bodies, False)
+        radius = TANK_WIDTH // 4
+        surface.blits([(self.turret_glyph, (x - radius, y - radius)) for x, y in centers], False)
+        line = pygame.draw.line
+        for center, end in zip(centers, barrels):
+            line(surface, BLACK, center, end, TURRET_LINE_WIDTH)
+        fill = surface.fill
+        for left, top, _ in health_bars:
+            fill(RED, (left, top, TANK_WIDTH, HEALTH_BAR_HEIGHT))
+        for left, top, width in health_bars:
+            if width > 0:
+                fill(HP_BAR_GREEN, (left, top, width, HEALTH_BAR_HEIGHT))
@@ -0,0 +1,264 @@
+import os
+import argparse
+import asyncio
+import struct
+import pygame
+from .constants import *
+from .world import World, get_world_bounds_for_level
+from .spatial import WorldBounds
+from .netproto import *
+from .netcodec import snapshot_tanks, select_rows, bullet_row, sound_event_rows, encode_frame, SnapshotHistory
+from .interest import within_distance
+
+# ----------------------------------------------------
+# --- CLIENT CONNECTION ---
+# ----------------------------------------------------
+class ClientConnection:
+    """Server-side state of one connected player."""
+    def __init__(self, writer, tank):
+        self.writer = writer
+        self.tank = tank
+
+        # Latest input (held until the next input message arrives)
+        self.pressed_actions = set()
+        self.aim_angle = tank.turret_angle
+        self.fire_requested = False # Edge-triggered: consumed by the next tick
+
+        # Delta compression: the last frame this client decoded (0 = none, send a full frame),
+        # and the tank tables recently sent to it (each client gets only what it can perceive)
+        self.acked_tick = 0
+        self.history = SnapshotHistory()
+
+    def send(self, message):
+        self.writer.write(message)
+
+    def is_congested(self):
+        """True if the client is not reading fast enough (its state updates are skipped)."""
+        return self.writer.transport.get_write_buffer_size() > SERVER_MAX_WRITE_BUFFER
+
+# ----------------------------------------------------
+# --- GAME SERVER ---
+# ----------------------------------------------------
+class GameServer:
+    """
+    Authoritative asyncio game server: runs the World at a fixed tick rate,
+    applies the inputs of every connected player and sends each of them the part
+    of the world state within its interest radius, delta-compressed against the
+    last frame that client acknowledged.
+    """
+    def __init__(self, host=SERVER_HOST, port=SERVER_PORT, tick_rate=SERVER_TICK_RATE, level=1, metrics_path=None,
+                 world_size=None):
+        self.host = host
+        self.port = port
+        self.tick_rate = tick_rate
+        self.level = level
+        self.metrics_path = metrics_path # CSV file the combat statistics of every finished level are appended to
+        self.world_size = world_size # Scenario override of every level's world size (None: per-level sizes)
+        self.world = World()
+        self.world.events.subscribe(self._record_events)
+        self.clients = []
+        self.tick = 0
+        self.events = [] # (event row, x, y) of the current tick
+        self.running = False
+
+    # --- LEVEL MANAGEMENT ---
+
+    def start_level(self, level):
+        """(Re)builds the world for a level and respawns every connected player."""
+        self.level = level
+        bounds = WorldBounds.centered(self.world_size) if self.world_size else get_world_bounds_for_level(level)
+        self.world.clear(bounds)
+        self.world.generate_chunks_around(0, 0)
+        for client in list(self.clients):
+            try:
+                self.world.spawn_player(client.tank)
+            except ValueError as error: # No room left in this level's world
+                print(f"Server: player {client.tank.tank_id} dropped: {error}.")
+                self.clients.remove(client)
+                client.writer.close()
+                continue
+            client.acked_tick = 0
+            client.history.clear() # Tank ids are reassigned, so old baselines are useless
+        self.world.populate(level)
+
+        terrain = encode_terrain(self.world.terrain_index.features, replace=True)
+        for client in self.clients:
+            # Tank ids are reassigned by the World, so every player learns its new one
+            client.send(pack_message(MSG_WELCOME, WELCOME.pack(client.tank.tank_id, self.tick_rate, *self.world.bounds)))
+            client.send(terrain)
+        print(f"Server: level {level} started ({len(self.clients)} players).")
+
+    def _check_level_end(self):
+        """Advances on victory, restarts level 1 when every player tank is destroyed."""
+        if not self.clients:
+            return
+        victory = self.world.enemies_left() == 0
+        if not victory and any(client.tank.is_alive for client in self.clients):
+            return
+        if self.metrics_path:
+            self.world.write_metrics(self.metrics_path, self.level)
+        self.start_level(self.level + 1 if victory and self.level < MAX_LEVEL else 1)
+
+    # --- NETWORKING ---
+
+    async def handle_client(self, reader, writer):
+        """Runs for the lifetime of one client connection."""
+        try:
+            msg_type, _ = await read_message(reader, NET_MAX_CLIENT_MESSAGE_SIZE)
+            if msg_type != MSG_HELLO:
+                return
+
+            try:
+                tank = self.world.spawn_player()
+            except ValueError as error:
+                print(f"Server: refused {writer.get_extra_info('peername')}: {error}.")
+                return
+            client = ClientConnection(writer, tank)
+            self.clients.append(client)
+            client.send(pack_message(MSG_WELCOME, WELCOME.pack(client.tank.tank_id, self.tick_rate, *self.world.bounds)))
+            client.send(encode_terrain(self.world.terrain_index.features, replace=True))
+            print(f"Server: player {client.tank.tank_id} joined from {writer.get_extra_info('peername')}.")
+
+            while True:
+                msg_type, payload = await read_message(reader, NET_MAX_CLIENT_MESSAGE_SIZE)
+                if msg_type == MSG_INPUT:
+                    drive_system, pressed, aim_angle, fire, acked_tick = decode_input(payload)
+                    client.tank.drive_system = drive_system
+                    client.pressed_actions = pressed
+                    client.aim_angle = aim_angle
+                    client.fire_requested = client.fire_requested or fire
+                    client.acked_tick = max(client.acked_tick, acked_tick)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except (struct.error, IndexError, ValueError) as error: # Malformed message: the client is dropped
+            print(f"Server: bad message from {writer.get_extra_info('peername')}: {error}.")
+        finally:
+            for client in [c for c in self.clients if c.writer is writer]:
+                self.clients.remove(client)
+                self.world.remove_tank(client.tank) # Leaves the world (removed from every group)
+                print(f"Server: player {client.tank.tank_id} left.")
+            writer.close()
+
+    def _record_events(self, events):
+        """Event bus consumer: queues the sound events for this tick's frame (clients attenuate them)."""
+        self.events.extend(sound_event_rows(events))
+
+    def _broadcast_state(self):
+        """
+        Sends every client this tick's frame: the tanks and bullets within its interest radius and the
+        events within earshot, delta-encoded against the frame it last acknowledged.
+        """
+        world = self.world
+        tanks = snapshot_tanks(list(world.tanks) + world.wrecks)
+        bullets = [(bullet_row(bullet), bullet.x, bullet.y) for bullet in world.bullets]
+        interest = world.interest
+
+        for client in self.clients:
+            if client.is_congested():
+                continue # The client keeps acknowledging an older frame, so the next delta catches up
+            x, y = client.tank.x, client.tank.y
+            visible_ids = {entity.tank_id for entity in interest.visible_from(x, y)}
+            visible_ids.update(wreck.tank_id for wreck in world.wrecks_within(x, y, interest.radius))
+            visible_ids.add(client.tank.tank_id)
+            client_tanks = select_rows(tanks, visible_ids)
+            client_bullets = [row for row, bx, by in bullets if within_distance(x, y, bx, by, interest.radius)]
+            client_events = [row for row, ex, ey in self.events if within_distance(x, y, ex, ey, MAX_SOUND_DISTANCE)]
+
+            base_tanks = client.history.get(client.acked_tick)
+            base_tick = client.acked_tick if base_tanks is not None else 0
+            client.send(pack_message(MSG_STATE, encode_frame(self.tick, client_tanks, client_bullets, client_events,
+                                                             base_tick, base_tanks)))
+            client.history.add(self.tick, client_tanks)
+        self.events = []
+
+    # --- SIMULATION ---
+
+    def step(self):
+        """Advances the simulation by one tick."""
+        self.tick += 1
+        world = self.world
+
+        # 1. Player inputs
+        for client in self.clients:
+            tank = client.tank
+            control_keys = tank.control_keys[tank.drive_system]
+            keys = {code: (action in client.pressed_actions) for action, code in control_keys.items()}
+            tank.update_with_aim(keys, client.aim_angle, world.terrain_index)
+            if client.fire_requested:
+                if tank.fire(world.bullets):
+                    world.emit(EVENT_FIRE, tank)
+                client.fire_requested = False
+
+        # 2. AI, bullets and combat (their events are culled per client when sent)
+        world.update_ai()
+        world.sample_metrics()
+        world.update_bullets()
+        world.resolve_hits()
+
+        # 3. Terrain around every tank and bullet (and the view of destroyed players); after chunks are
+        #    unloaded every client gets the whole loaded terrain again (so its copy stays as small as the server's)
+        observers = [(client.tank.x, client.tank.y) for client in self.clients if not client.tank.is_alive]
+        new_features, unloaded = world.update_chunks(observers)
+        if unloaded:
+            terrain = encode_terrain(world.terrain_index.features, replace=True)
+        elif new_features:
+            terrain = encode_terrain(new_features, replace=False)
+        else:
+            terrain = None
+        if terrain is not None:
+            for client in self.clients:
+                client.send(terrain)
+
+        world.events.flush() # This tick's events, before a level change clears them
+        self._check_level_end()
+
+        # 4. Interest around every player: selects what each client receives, and which AI tanks
+        #    run at full rate next tick
+        world.update_interest([(client.tank.x, client.tank.y) for client in self.clients])
+        self._broadcast_state()
+
+    async def run(self):
+        """Starts listening and runs fixed-rate ticks until cancelled."""
+        pygame.init()
+        self.start_level(self.level)
+        server = await asyncio.start_server(self.handle_client, self.host, self.port)
+        print(f"Server: listening on {self.host}:{self.port} at {self.tick_rate} ticks/s.")
+
+        loop = asyncio.get_running_loop()
+        tick_length = 1.0 / self.tick_rate
+        next_tick = loop.time()
+        self.running = True
+        try:
+            async with server:
+                while self.running:
+                    self.step()
+                    next_tick += tick_length
+                    delay = next_tick - loop.time()
+                    if delay < -tick_length * 5:
+                        next_tick = loop.time() # Too far behind: drop ticks instead of bursting
+                        delay = 0
+                    await asyncio.sleep(max(0.0, delay))
+        finally:
+            self.world.shutdown()
+
+
+def main():
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy') # The server never opens a window
+    os.environ.setdefault('SDL_NO_SIGNAL_HANDLERS', '1') # SDL would turn SIGTERM into a QUIT event nobody reads
+    parser = argparse.ArgumentParser(description="Tank Battle authoritative game server.")
+    parser.add_argument('--host', default=SERVER_HOST)
+    parser.add_argument('--port', type=int, default=SERVER_PORT)
+    parser.add_argument('--tick-rate', type=int, default=SERVER_TICK_RATE)
+    parser.add_argument('--level', type=int, default=1)
+    parser.add_argument('--metrics', metavar='PATH', help="Append each level's combat statistics to this CSV file")
+    parser.add_argument('--world-size', type=int, help="World width and height for every level (default: per level)")
+    args = parser.parse_args()
+
+    server = GameServer(args.host, args.port, args.tick_rate, args.level, args.metrics, args.world_size)
+    try:
+        asyncio.run(server.run())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+from .constants import *
+
+# ----------------------------------------------------
+# --- LINE OF SIGHT SERVICE ---
+# ----------------------------------------------------
+class LineOfSight:
+    """
+    Line-of-sight queries against the terrain index, memoized per frame on the pair of
+    (shooter cell, target cell): within one tick, queries between the same two regions
+    (in either direction) reuse the first answer instead of casting another ray.
+    """
+    def __init__(self, terrain_index, cell_size=LOS_CACHE_CELL_SIZE):
+        self.terrain_index = terrain_index
+        self.cell_size = cell_size
+        self.cache = {} # ((cell_x, cell_y), (cell_x, cell_y)) -> clear
+
+        # Counters for tuning cell_size
+        self.hits = 0 # Answered from the cache
+        self.misses = 0 # Needed a raycast
+
+    def clear(self):
+        """Forgets all answers. Called once per frame, and when the terrain changes."""
+        self.cache.clear()
+
+    def is_clear(self, x0, y0, x1, y1):
+        """True if no terrain feature blocks the straight line between the two points."""
+        size = self.cell_size
+        a = (int(x0 // size), int(y0 // size))
+        b = (int(x1 // size), int(y1 // size))
+        key = (a, b) if a <= b else (b, a)
+        clear = self.cache.get(key)
+        if clear is None:
+            clear = not self.terrain_index.segment_blocked(x0, y0, x1, y1)
+            self.cache[key] = clear
+            self.misses += 1
+        else:
+            self.hits += 1
+        return clear
+
+    def check_many(self, pairs):
+        """Batched is_clear() for a list of (shooter, target) entities. Returns a list of bools."""
+        is_clear = self.is_clear
+        return [is_clear(shooter.x, shooter.y, target.x, target.y) for shooter, target in pairs]
+
+    def stats(self):
+        """Returns the cache counters as a dict (for debugging/HUD output)."""
+        return {'hits': self.hits, 'misses': self.misses, 'cached': len(self.cache)}
@@ -0,0 +1,248 @@
+import pygame
+from collections import namedtuple
+from .constants import *
+from .collision import segment_aabb
+
+try:
+    import numpy as np
+except ImportError: # collide_batch() is only called when NumPy is available
+    np = None
+
+# ----------------------------------------------------
+# --- WORLD BOUNDS ---
+# ----------------------------------------------------
+class WorldBounds(namedtuple('WorldBounds', 'min_x min_y max_x max_y')):
+    """The playable area of a level in world units. Nothing is allocated per unit of area: terrain is kept by chunk."""
+    __slots__ = ()
+
+    @classmethod
+    def centered(cls, size):
+        """A size x size world centered on (0, 0)."""
+        return cls(-(size // 2), -(size // 2), size - size // 2, size - size // 2)
+
+    @property
+    def width(self):
+        return self.max_x - self.min_x
+
+    @property
+    def height(self):
+        return self.max_y - self.min_y
+
+    def overlaps(self, left, top, right, bottom):
+        return left < self.max_x and self.min_x < right and top < self.max_y and self.min_y < bottom
+
+    def contains(self, rect):
+        return (rect.left >= self.min_x and rect.right <= self.max_x and
+                rect.top >= self.min_y and rect.bottom <= self.max_y)
+
+DEFAULT_WORLD_BOUNDS = WorldBounds.centered(DEFAULT_WORLD_SIZE)
+
+# ----------------------------------------------------
+# --- TERRAIN INDEX CLASS ---
+# ----------------------------------------------------
+class TerrainIndex:
+    """
+    Uniform grid over the terrain feature rects (world coordinates).
+    Each cell stores the indices of the features overlapping it, so collision
+    queries only test the few features near the query instead of the whole list.
+    Also carries the world bounds, the other limit on movement and bullet flight.
+    """
+    def __init__(self, cell_size=TERRAIN_CELL_SIZE, bounds=DEFAULT_WORLD_BOUNDS):
+        self.cell_size = cell_size
+        self.bounds = bounds
+        self.features = [] # Flat list of pygame.Rect (also used for drawing)
+        self.cells = {} # (cell_x, cell_y) -> list of feature indices
+        self.slots = {} # id(feature) -> its index in features
+        self._bounds = None # Cached (N, 4) array of left, top, right, bottom for batched queries
+
+    def _cell_range(self, left, top, right, bottom):
+        """Returns the inclusive cell ranges covered by a world-space box."""
+        size = self.cell_size
+        return (int(left // size), int(top // size),
+                int((right - 1) // size), int((bottom - 1) // size))
+
+    def _link(self, index, feature):
+        x0, y0, x1, y1 = self._cell_range(feature.left, feature.top, feature.right, feature.bottom)
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                self.cells.setdefault((cx, cy), []).append(index)
+
+    def _unlink(self, index, feature):
+        x0, y0, x1, y1 = self._cell_range(feature.left, feature.top, feature.right, feature.bottom)
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = self.cells[(cx, cy)]
+                cell.remove(index)
+                if not cell:
+                    del self.cells[(cx, cy)]
+
+    def add(self, features):
+        """Adds newly generated features (e.g. a freshly generated chunk) to the index."""
+        for feature in features:
+            index = len(self.features)
+            self.features.append(feature)
+            self.slots[id(feature)] = index
+            self._link(index, feature)
+        if features:
+            self._bounds = None
+
+    def remove(self, features):
+        """
+        Removes indexed features (e.g. an unloaded chunk's) without a rebuild: each one's slot is filled with
+        the last feature, so only the cells of the removed and moved features are touched.
+        """
+        for feature in features:
+            index = self.slots.pop(id(feature))
+            self._unlink(index, feature)
+            last = self.features.pop()
+            if last is not feature:
+                self._unlink(len(self.features), last)
+                self.features[index] = last
+                self.slots[id(last)] = index
+                self._link(index, last)
+        if features:
+            self._bounds = None
+
+    def rebuild(self, features):
+        """Replaces the indexed features."""
+        self.features = []
+        self.cells = {}
+        self.slots = {}
+        self._bounds = None
+        self.add(features)
+
+    def query_rect(self, rect):
+        """Returns the features that may overlap rect (broad phase only, no duplicates)."""
+        x0, y0, x1, y1 = self._cell_range(rect.left, rect.top, rect.right, rect.bottom)
+        found = set()
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                found.update(self.cells.get((cx, cy), ()))
+        return [self.features[i] for i in found]
+
+    def collides(self, rect):
+        """Returns True if rect overlaps any terrain feature."""
+        x0, y0, x1, y1 = self._cell_range(rect.left, rect.top, rect.right, rect.bottom)
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                for i in self.cells.get((cx, cy), ()):
+                    if rect.colliderect(self.features[i]):
+                        return True
+        return False
+
+    def segment_blocked(self, x0, y0, x1, y1):
+        """
+        Returns True if the segment from (x0, y0) to (x1, y1) crosses a terrain feature.
+        Walks only the grid cells the segment passes through, in order (DDA), so it stops at the first hit.
+        """
+        size = self.cell_size
+        dx, dy = x1 - x0, y1 - y0
+        cx, cy = int(x0 // size), int(y0 // size)
+        step_x = 1 if dx > 0 else -1
+        step_y = 1 if dy > 0 else -1
+        # Parametric position (t in [0, 1]) of the next vertical/horizontal cell boundary, and the step between them
+        if dx:
+            next_x = ((cx + (step_x > 0)) * size - x0) / dx
+            delta_x = size / abs(dx)
+        else:
+            next_x = delta_x = float('inf')
+        if dy:
+            next_y = ((cy + (step_y > 0)) * size - y0) / dy
+            delta_y = size / abs(dy)
+        else:
+            next_y = delta_y = float('inf')
+
+        tested = set()
+        while True:
+            for i in self.cells.get((cx, cy), ()):
+                if i not in tested:
+                    tested.add(i)
+                    feature = self.features[i]
+                    if segment_aabb(x0, y0, dx, dy, feature.left, feature.top, feature.right, feature.bottom) is not None:
+                        return True
+            if next_x < next_y:
+                if next_x > 1:
+                    return False
+                cx += step_x
+                next_x += delta_x
+            else:
+                if next_y > 1:
+                    return False
+                cy += step_y
+                next_y += delta_y
+
+    def _bounds_array(self):
+        """Returns the (N, 4) left/top/right/bottom array of all features, building it on demand."""
+        if self._bounds is None:
+            self._bounds = np.array([(f.left, f.top, f.right, f.bottom) for f in self.features],
+                                    dtype=np.float64).reshape(-1, 4)
+        return self._bounds
+
+    def collide_batch(self, xs, ys, width, height):
+        """
+        Batched version of collides() for many boxes of the same size centered on (xs, ys).
+        Boxes are truncated like pygame.Rect would. Returns a boolean NumPy array.
+        """
+        n = len(xs)
+        lefts = np.trunc(xs - width / 2)
+        tops = np.trunc(ys - height / 2)
+        rights = lefts + width
+        bottoms = tops + height
+        hit = np.zeros(n, dtype=bool)
+        if not self.features:
+            return hit
+
+        # 1. Broad phase: gather (box, feature) candidate pairs from the grid
+        pair_box = []
+        pair_feature = []
+        size = self.cell_size
+        cells = self.cells
+        for i in range(n):
+            for cx in range(int(lefts[i] // size), int((rights[i] - 1) // size) + 1):
+                for cy in range(int(tops[i] // size), int((bottoms[i] - 1) // size) + 1):
+                    cell = cells.get((cx, cy))
+                    if cell:
+                        pair_box.extend([i] * len(cell))
+                        pair_feature.extend(cell)
+        if not pair_box:
+            return hit
+
+        # 2. Narrow phase: one vectorized overlap test for all pairs (same rule as Rect.colliderect)
+        box = np.array(pair_box)
+        bounds = self._bounds_array()[pair_feature]
+        overlap = ((lefts[box] < bounds[:, 2]) & (bounds[:, 0] < rights[box]) &
+                   (tops[box] < bounds[:, 3]) & (bounds[:, 1] < bottoms[box]))
+        hit[box[overlap]] = True
+        return hit
+
+# ----------------------------------------------------
+# --- ENTITY GRID CLASS ---
+# ----------------------------------------------------
+class SpatialGrid:
+    """
+    Uniform grid over moving entities (anything with world x, y), rebuilt once per frame.
+    Radius queries only visit the cells the query circle overlaps.
+    """
+    def __init__(self, cell_size=INTEREST_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {} # (cell_x, cell_y) -> list of entities
+
+    def rebuild(self, entities):
+        """Re-bins all entities at their current positions."""
+        size = self.cell_size
+        cells = {}
+        for entity in entities:
+            cells.setdefault((int(entity.x // size), int(entity.y // size)), []).append(entity)
+        self.cells = cells
+
+    def query_radius(self, x, y, radius):
+        """Returns the entities within radius of (x, y)."""
+        size = self.cell_size
+        radius_sq = radius * radius
+        found = []
+        for cx in range(int((x - radius) // size), int((x + radius) // size) + 1):
+            for cy in range(int((y - radius) // size), int((y + radius) // size) + 1):
+                for entity in self.cells.get((cx, cy), ()):
+                    if (entity.x - x) ** 2 + (entity.y - y) ** 2 <= radius_sq:
+                        found.append(entity)
+        return found
@@ -0,0 +1,95 @@
+import random
+from .constants import *
+
+# ----------------------------------------------------
+# --- SPAWN PLANNER ---
+# ----------------------------------------------------
+class SpawnPlanner:
+    """
+    Places tanks in the free space of a square spawn area around the world center.
+    The free space is rasterized once from the terrain features into an occupancy grid whose
+    cells are free only if a tank centered anywhere inside them clears every feature. Positions
+    are then drawn from the cells in random order without replacement (blocked ones skipped),
+    Poisson-disk style: a candidate closer than the spacing to an already placed (or occupied)
+    position is discarded.
+    """
+    def __init__(self, features, spawn_area_size, bounds, cell_size=SPAWN_CELL_SIZE):
+        half_width, half_height = TANK_WIDTH / 2, TANK_HEIGHT / 2
+        half_size = (spawn_area_size * CHUNK_SIZE) // 2
+
+        # Tank centers inside the spawn area (and far enough inside the world for the whole body)
+        self.left = max(-half_size, bounds.min_x + half_width)
+        self.top = max(-half_size, bounds.min_y + half_height)
+        right = min(half_size, bounds.max_x - half_width)
+        bottom = min(half_size, bounds.max_y - half_height)
+        self.cell_size = cell_size
+        self.columns = max(0, int((right - self.left) // cell_size))
+        rows = max(0, int((bottom - self.top) // cell_size))
+
+        # Occupancy: block every cell of centers whose tank box could touch a feature
+        # (the feature grown by half a tank, plus a unit for the Rect truncation)
+        blocked = bytearray(self.columns * rows)
+        for feature in features:
+            x0 = max(0, int((feature.left - half_width - 1 - self.left) // cell_size))
+            x1 = min(self.columns - 1, int((feature.right + half_width + 1 - self.left) // cell_size))
+            y0 = max(0, int((feature.top - half_height - 1 - self.top) // cell_size))
+            y1 = min(rows - 1, int((feature.bottom + half_height + 1 - self.top) // cell_size))
+            if x1 < x0:
+                continue # Beside the spawn area (a reversed slice would resize the grid)
+            for row in range(y0, y1 + 1):
+                start = row * self.columns
+                blocked[start + x0:start + x1 + 1] = b'\x01' * (x1 - x0 + 1)
+        self.blocked = blocked
+
+    def place(self, count, min_dist, occupied=(), rng=random):
+        """
+        Returns `count` positions at least min_dist apart from each other and from the `occupied`
+        (x, y) positions. If the free space cannot hold them all at that spacing, the spacing is
+        relaxed step by step, but never below the distance at which two tanks could overlap.
+        Raises ValueError if even that does not fit.
+        """
+        points = list(occupied)
+        placed = []
+        spacing = min_dist
+        min_spacing = TANK_BOUNDING_RADIUS * 2 # Bodies cannot touch at any angle
+        while True:
+            placed.extend(self._sample(count - len(placed), spacing, points, rng))
+            if len(placed) == count:
+                return placed
+            if spacing <= min_spacing:
+                raise ValueError(f"No free space left for {count - len(placed)} of {count} tanks")
+            spacing = max(min_spacing, spacing / 2)
+
+    def _sample(self, count, spacing, points, rng):
+        """Draws up to `count` positions spaced from `points` (which the accepted ones are appended to)."""
+        # Background grid over the points: with cells of the spacing, only the 3x3 neighbourhood can be too close
+        grid = {}
+        for x, y in points:
+            grid.setdefault((int(x // spacing), int(y // spacing)), []).append((x, y))
+        spacing_sq = spacing * spacing
+
+        accepted = []
+        blocked = self.blocked
+        total = len(blocked)
+        moved = {} # Sparse Fisher-Yates shuffle of the cell indices: every cell is drawn at most once
+        size = self.cell_size
+        for i in range(total):
+            if len(accepted) == count:
+                break
+            j = rng.randrange(i, total)
+            cell = moved.get(j, j)
+            moved[j] = moved.get(i, i)
+            if blocked[cell]:
+                continue
+            row, column = divmod(cell, self.columns)
+            x = self.left + (column + rng.random()) * size
+            y = self.top + (row + rng.random()) * size
+            gx, gy = int(x // spacing), int(y // spacing)
+            if any((x - px) ** 2 + (y - py) ** 2 < spacing_sq
+                   for cx in (gx - 1, gx, gx + 1) for cy in (gy - 1, gy, gy + 1)
+                   for px, py in grid.get((cx, cy), ())):
+                continue
+            grid.setdefault((gx, gy), []).append((x, y))
+            points.append((x, y))
+            accepted.append((x, y))
+        return accepted
@@ -1,16 +1,28 @@
 import pygame
 import math
 import random
-from constants import *
-# Note: terrain_features list is defined in main.py and passed/accessed globally via update calls
+from collections import namedtuple
+from .constants import *
+from .pools import ObjectPool
+from .fastmath import sin_deg, cos_deg, atan2_deg, heading_vector
+from .collision import segment_aabb, segment_obb
+# Note: movement gets the world's TerrainIndex (features and world bounds) passed in by the update calls
 
 # ----------------------------------------------------
 # --- BULLET CLASS ---
 # ----------------------------------------------------
 class Bullet(pygame.sprite.Sprite):
-    def __init__(self, x, y, angle, color):
+    def __init__(self, x, y, angle, color, shooter_id=EVENT_NO_SOURCE):
         super().__init__()
         
+        self.pool = None # Set by ObjectPool.acquire() for pooled bullets
+        
+        # No per-bullet surface: the batch renderer blits one shared glyph per color
+        self.reset(x, y, angle, color, shooter_id)
+
+    def reset(self, x, y, angle, color, shooter_id=EVENT_NO_SOURCE):
+        """(Re)initializes the bullet state. Called by __init__ and by the bullet pool."""
+        self.shooter_id = shooter_id # tank_id of the tank that fired it (credited with its hit)
         self.x = x
         self.y = y
         self.angle = angle
@@ -18,57 +30,117 @@ class Bullet(pygame.sprite.Sprite):
         self.start_y = y 
         
         # Calculate velocity components
-        self.vx = BULLET_SPEED * math.cos(math.radians(self.angle))
-        self.vy = BULLET_SPEED * math.sin(math.radians(self.angle))
+        self.vx = BULLET_SPEED * cos_deg(self.angle)
+        self.vy = BULLET_SPEED * sin_deg(self.angle)
         
-        # Create a simple circular surface for the bullet
-        self.image = pygame.Surface((BULLET_RADIUS * 2, BULLET_RADIUS * 2), pygame.SRCALPHA)
-        pygame.draw.circle(self.image, color, (BULLET_RADIUS, BULLET_RADIUS), BULLET_RADIUS)
-        self.rect = self.image.get_rect(center=(x, y))
+        self.color = color
         
         self.lifespan = BULLET_LIFESPAN
+        self.save_pose()
 
-    def update(self, camera_offset_x, camera_offset_y, features):
-        """Updates bullet position, checks range, lifespan, bounds, and terrain collision."""
-        self.x += self.vx
-        self.y -= self.vy 
-        
-        # Update screen position using camera offset
-        self.rect.centerx = int(self.x + camera_offset_x)
-        self.rect.centery = int(self.y + camera_offset_y)
-
-        # 1. Check Maximum Range
-        distance_sq = (self.x - self.start_x)**2 + (self.y - self.start_y)**2
-        if distance_sq > MAX_BULLET_RANGE**2:
-            self.kill()
-            return
-
-        # 2. Check Lifespan
-        self.lifespan -= 1
-        if self.lifespan <= 0: 
-            self.kill() 
-            return
-
-        # 3. Check World Bounds
-        if (self.x < WORLD_MIN_X or self.x > WORLD_MAX_X or 
-            self.y < WORLD_MIN_Y or self.y > WORLD_MAX_Y):
-            self.kill()
-            return
-            
-        # 4. Check Collision with terrain features
-        bullet_rect_world = pygame.Rect(self.x - BULLET_RADIUS, self.y - BULLET_RADIUS, BULLET_RADIUS * 2, BULLET_RADIUS * 2)
-        for feature in features:
-            if bullet_rect_world.colliderect(feature):
-                self.kill() 
-                return
+        self.expires_in = None # Frames of flight until range, lifespan, bounds or terrain end it (set by cast())
+
+        # Set by resolve_flight() once the end of the flight is known
+        self.flight_left = None # Frames of flight until the bullet hits something or expires
+        self.impact_tank = None # Tank it hits then (None: terrain, range, lifespan or world bounds)
+
+    def save_pose(self):
+        """Remembers the position at the start of a simulation step (the renderer interpolates from it)."""
+        self.prev_x, self.prev_y = self.x, self.y
+
+    def kill(self):
+        """Removes the bullet from all groups and returns it to its pool."""
+        was_alive = self.alive()
+        super().kill()
+        if was_alive and self.pool:
+            self.pool.release(self)
+
+    def update(self, frames=1):
+        """
+        Moves the bullet `frames` frames along its path in one call (stopping at its impact point).
+        Collisions are not tested here: see resolve_flight(), and World.resolve_hits() for the kill.
+        """
+        distance = frames if self.flight_left is None else max(0.0, min(frames, self.flight_left))
+        self.x += self.vx * distance
+        self.y -= self.vy * distance
+        self.lifespan -= frames
+        self.expires_in -= frames
+        if self.flight_left is not None:
+            self.flight_left -= frames
+
+    def cast(self, terrain_index):
+        """
+        Ray cast of the rest of the straight flight against everything static: range, lifespan,
+        world bounds and terrain. Sets expires_in. Done once when the bullet is fired (and again
+        only if the terrain changes), so in-flight bullets never scan the terrain.
+        """
+        span = self.lifespan
+        dx, dy = self.vx * span, -self.vy * span # Whole remaining flight, t in [0, 1]
+
+        # 1. Range: where the distance from the firing point reaches MAX_BULLET_RANGE
+        offset_x, offset_y = self.x - self.start_x, self.y - self.start_y
+        a = dx * dx + dy * dy
+        half_b = offset_x * dx + offset_y * dy
+        c = offset_x * offset_x + offset_y * offset_y - MAX_BULLET_RANGE ** 2
+        t_end = min(1.0, max(0.0, (-half_b + math.sqrt(max(0.0, half_b * half_b - a * c))) / a))
+
+        # 2. World bounds
+        bounds = terrain_index.bounds
+        inside = segment_aabb(self.x, self.y, dx, dy, bounds.min_x, bounds.min_y, bounds.max_x, bounds.max_y)
+        t_end = 0.0 if inside is None or inside[0] > 0 else min(t_end, inside[1])
+
+        # 3. Terrain: the bullet box overlaps a feature while its center is inside the feature grown by the radius
+        radius = BULLET_RADIUS
+        end_x, end_y = self.x + dx * t_end, self.y + dy * t_end
+        path = pygame.Rect(min(self.x, end_x) - radius, min(self.y, end_y) - radius,
+                           abs(end_x - self.x) + radius * 2 + 1, abs(end_y - self.y) + radius * 2 + 1)
+        for feature in terrain_index.query_rect(path):
+            hit = segment_aabb(self.x, self.y, dx, dy, feature.left - radius, feature.top - radius,
+                               feature.right + radius, feature.bottom + radius)
+            if hit is not None and hit[0] < t_end:
+                t_end = hit[0]
+
+        self.expires_in = t_end * span
+        self.flight_left = None
+        self.impact_tank = None
+
+    def resolve_flight(self, tanks, frames=None):
+        """
+        Swept (continuous) test of the tanks along the next `frames` frames of flight, or the whole
+        rest of it if None. If a tank or the cast() expiry ends the flight within them, sets
+        flight_left (in frames, fractional) and impact_tank. Tanks are treated as static meanwhile.
+        """
+        span = self.expires_in if frames is None else min(frames, self.expires_in)
+        t_end = 1.0
+        impact_tank = None
+        if span > 0:
+            dx, dy = self.vx * span, -self.vy * span # Tested segment, t in [0, 1]
+            half_width, half_height = TANK_WIDTH / 2, TANK_HEIGHT / 2
+            for tank in tanks:
+                # The bullet center against the (rotated) body box
+                hit = segment_obb(self.x, self.y, dx, dy, tank.x, tank.y, half_width, half_height, tank.angle)
+                if hit is not None and hit[0] < t_end:
+                    t_end = hit[0]
+                    impact_tank = tank
+
+        if frames is None or impact_tank is not None or self.expires_in <= frames:
+            self.flight_left = max(0.0, t_end * span)
+            self.impact_tank = impact_tank
+
+# Result of an AI tank's think() phase, applied later in a deterministic order
+AIDecision = namedtuple('AIDecision', ['target', 'ai_keys', 'move_timer'])
+
+# Shared pool of dead bullets, reused by Tank.fire()
+bullet_pool = ObjectPool(Bullet, BULLET_POOL_SIZE)
 
 # ----------------------------------------------------
 # --- TANK BASE CLASS ---
 # ----------------------------------------------------
 class Tank(pygame.sprite.Sprite):
-    def __init__(self, x, y, allegiance, fire_sound, explosion_sound):
+    def __init__(self, x, y, allegiance):
         super().__init__()
         self.allegiance = allegiance 
+        self.tank_id = EVENT_NO_SOURCE # Assigned by World.add_tank()
         self.color = PLAYER_COLOR if allegiance == 'Friendly' else ENEMY_COLOR
         self.bullet_color = YELLOW if allegiance == 'Friendly' else RED
 
@@ -76,9 +148,6 @@ class Tank(pygame.sprite.Sprite):
         self.health = MAX_HEALTH
         self.is_alive = True
         self.is_wreck = False
-        
-        self.fire_sound = fire_sound
-        self.explosion_sound = explosion_sound
 
         self.image = pygame.Surface((TANK_WIDTH, TANK_HEIGHT), pygame.SRCALPHA)
         self.image.fill((0,0,0,0))
@@ -86,7 +155,13 @@ class Tank(pygame.sprite.Sprite):
         self.rect = self.image.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
         self.angle = random.randint(0, 360) 
         self.turret_angle = 90
+        self.save_pose()
+        
+        # Cached unit heading vector, refreshed by heading() only when self.angle changes
+        self._heading_angle = None
+        self._heading = (0.0, 0.0)
         self.speed = 0.0
+        self.blocked_frames = 0 # Frames whose move was stopped by terrain (combat statistics)
 
         # NEW: Track speeds for Independent Drive System
         self.left_track_speed = 0.0
@@ -94,6 +169,9 @@ class Tank(pygame.sprite.Sprite):
 
 
         self.fire_cooldown = 0
+        
+        # Per-tank RNG (seeded from the global one) so AI decisions do not depend on thread scheduling
+        self.rng = random.Random(random.getrandbits(32))
 
     def reset(self, x, y):
         """
@@ -104,12 +182,14 @@ class Tank(pygame.sprite.Sprite):
         self.x = x
         self.y = y
         self.rect.center = (x, y) # Update the sprite's pygame rect
+        self.save_pose() # No interpolated slide from the old position
         
         # 2. Reset Core State
         self.health = MAX_HEALTH
         self.is_wreck = False
         self.is_alive = True # Assuming you have a separate is_alive flag
         self.fire_cooldown = 0
+        self.blocked_frames = 0
         
         # 3. Reset Movement State (to prevent tank from starting with momentum)
         self.speed = 0.0
@@ -123,92 +203,51 @@ class Tank(pygame.sprite.Sprite):
         # NOTE: You may need to add a line here to reset the tank's image 
         # from a wreck image back to the normal tank image if that logic exists.
         
-    def _calculate_volume(self, player_x, player_y):
-        """Calculates volume based on distance to the player (the listener)."""
-        if MAX_SOUND_DISTANCE <= 0:
-            return SOUND_VOLUME
-            
-        distance = math.hypot(self.x - player_x, self.y - player_y)
+    def save_pose(self):
+        """Remembers the pose at the start of a simulation step (the renderer interpolates from it)."""
+        self.prev_x, self.prev_y = self.x, self.y
+        self.prev_angle, self.prev_turret_angle = self.angle, self.turret_angle
 
-        if distance >= MAX_SOUND_DISTANCE: # <--- Uses the new constant
-            return 0.0
-        
-        # Linear falloff: 1.0 at distance 0, 0.0 at MAX_SOUND_DISTANCE
-        volume_ratio = 1.0 - (distance / MAX_SOUND_DISTANCE)
-        
-        # Clamp and multiply by base volume
-        final_volume = max(0.0, min(1.0, volume_ratio)) * SOUND_VOLUME
-        return final_volume
-
-    def take_damage(self, damage, player_x, player_y):
-        """Calculates damage and plays explosion sound with distance volume."""
-
-        # FIX: Initialize sound_event to None at the start
-        sound_event = None 
+    def heading(self):
+        """Returns the unit vector the body is facing, recomputed only when the angle changed."""
+        if self.angle != self._heading_angle:
+            self._heading = heading_vector(self.angle)
+            self._heading_angle = self.angle
+        return self._heading
 
-
-        
+    def take_damage(self, damage):
+        """Applies damage; the tank becomes a wreck when its health runs out (the caller records the hit and kill events)."""
         if not self.is_alive: return 
         
         self.health -= damage
         
         if self.health <= 0:
             self.health = 0
-            
-            # Play explosion sound on destruction with distance volume
-            if self.is_alive:
-                final_volume = self._calculate_volume(player_x, player_y)
-                self.explosion_sound.set_volume(final_volume)
-                self.explosion_sound.play()
-
-                # --- NEW: Record Sound Event for Indicator ---
-                # Only record if the sound is actually audible (volume > 0)
-                if final_volume > 0.0:
-                    # [sound_type, x, y, volume]
-                    sound_event = ['explosion', self.x, self.y, final_volume] 
-                
             self.is_alive = False
             self.is_wreck = True
             self.speed = 0.0
 
-
-        return sound_event # <<< RETURN THE SOUND EVENT
-
-    def fire(self, bullets_group, player_x, player_y): 
-        """Spawns a bullet if the tank is alive and the cooldown is ready."""
-
-        # FIX: Initialize sound_event to None at the start
-        sound_event = None 
+    def fire(self, bullets_group): 
+        """Spawns a bullet if the tank is alive and the cooldown is ready. Returns True if it fired (the caller records EVENT_FIRE)."""
         if not self.is_alive or self.fire_cooldown > 0: 
-            return
-        
-        # Play firing sound with distance volume
-        final_volume = self._calculate_volume(player_x, player_y)
-        self.fire_sound.set_volume(final_volume)
-        self.fire_sound.play()
-
-        # --- NEW: Record Sound Event for Indicator ---
-        if final_volume > 0.0:
-            # [sound_type, x, y, volume]
-            sound_event = ['fire', self.x, self.y, final_volume]
+            return False
             
         # Calculate bullet spawn point at the tip of the turret
-        rad = math.radians(self.turret_angle)
-        spawn_offset_x = TURRET_LENGTH * math.cos(rad)
-        spawn_offset_y = TURRET_LENGTH * math.sin(rad)
+        spawn_offset_x = TURRET_LENGTH * cos_deg(self.turret_angle)
+        spawn_offset_y = TURRET_LENGTH * sin_deg(self.turret_angle)
         
         bullet_start_x = self.x + spawn_offset_x
         bullet_start_y = self.y - spawn_offset_y 
 
-        new_bullet = Bullet(bullet_start_x, bullet_start_y, self.turret_angle, self.bullet_color)
+        new_bullet = bullet_pool.acquire(bullet_start_x, bullet_start_y, self.turret_angle, self.bullet_color, self.tank_id)
         bullets_group.add(new_bullet)
         
         # Reset cooldown
         self.fire_cooldown = FIRE_COOLDOWN_FRAMES
 
-        return sound_event # <<< RETURN THE SOUND EVENT
+        return True
 
-    def update_movement(self, keys, is_player, features, drive_system=DRIVE_SYSTEM_STANDARD, control_keys=None):
+    def update_movement(self, keys, is_player, terrain, drive_system=DRIVE_SYSTEM_STANDARD, control_keys=None):
         """Handles acceleration, turning, collision detection, and world boundary checks."""
         if not self.is_alive: return
 
@@ -350,18 +389,16 @@ class Tank(pygame.sprite.Sprite):
 
         # Calculate Potential Movement (Same for all drive modes)
         # Note: self.angle is updated by both drive modes
-        new_x = self.x + self.speed * math.cos(math.radians(self.angle - 90))
-        new_y = self.y + self.speed * math.sin(math.radians(self.angle - 90))
+        heading_x, heading_y = self.heading()
+        new_x = self.x + self.speed * heading_x
+        new_y = self.y + self.speed * heading_y
 
-        # Collision Detection (Obstacles)
+        # Collision Detection (Obstacles near the new position only)
         temp_rect = pygame.Rect(new_x - TANK_WIDTH / 2, new_y - TANK_HEIGHT / 2, TANK_WIDTH, TANK_HEIGHT)
-        is_colliding = False
-        for feature in features:
-            if temp_rect.colliderect(feature):
-                is_colliding = True
-                break
+        is_colliding = terrain.collides(temp_rect)
 
         if is_colliding:
+            self.blocked_frames += 1
             self.speed = 0.0
             # Also reset track speeds on collision
             self.left_track_speed = 0.0
@@ -371,8 +408,9 @@ class Tank(pygame.sprite.Sprite):
         
         # World Boundary Clamping
         half_width, half_height = TANK_WIDTH / 2, TANK_HEIGHT / 2
-        clamped_x = max(WORLD_MIN_X + half_width, min(self.x, WORLD_MAX_X - half_width))
-        clamped_y = max(WORLD_MIN_Y + half_height, min(self.y, WORLD_MAX_Y - half_height))
+        bounds = terrain.bounds
+        clamped_x = max(bounds.min_x + half_width, min(self.x, bounds.max_x - half_width))
+        clamped_y = max(bounds.min_y + half_height, min(self.y, bounds.max_y - half_height))
         
         if self.x != clamped_x or self.y != clamped_y:
             self.speed = 0.0
@@ -386,77 +424,13 @@ class Tank(pygame.sprite.Sprite):
         # Allow rotation even if not alive, but the player update ensures it
         # Only use this function for AI
         self.turret_angle = target_angle
-        
-    def draw(self, surface, camera_offset_x, camera_offset_y):
-        """Draws the tank body, turret, wreck, and health bar with improved aesthetics."""
-        
-        # 1. Update rect position for screen drawing
-        self.rect.centerx = int(self.x + camera_offset_x)
-        self.rect.centery = int(self.y + camera_offset_y)
-        center_screen = self.rect.center
-
-        # Determine draw color
-        body_color = WRECK_COLOR_BODY if self.is_wreck else self.color
-        track_color = DARK_GRAY
-        
-        # 2. Draw Body and Tracks (Rotation is complex, so we'll draw shapes relative to the center)
-        
-        # Create a temporary surface to draw the non-rotated body parts
-        temp_surface = pygame.Surface((TANK_WIDTH, TANK_HEIGHT), pygame.SRCALPHA)
-        
-        # Body (Rounded Rectangle) - slightly smaller to show the tracks outside
-        body_rect = pygame.Rect(TANK_WIDTH * 0.1, TANK_HEIGHT * 0.1, TANK_WIDTH * 0.8, TANK_HEIGHT * 0.8)
-        pygame.draw.rect(temp_surface, body_color, body_rect, border_radius=5)
-        
-        # Tracks (Using rectangles on the sides)
-        track_width = TANK_WIDTH * 0.15
-        
-        # Left Track
-        track_rect_l = pygame.Rect(0, 0, track_width, TANK_HEIGHT)
-        pygame.draw.rect(temp_surface, track_color, track_rect_l, border_radius=3)
-        
-        # Right Track
-        track_rect_r = pygame.Rect(TANK_WIDTH - track_width, 0, track_width, TANK_HEIGHT)
-        pygame.draw.rect(temp_surface, track_color, track_rect_r, border_radius=3)
-        
-        # Rotate the tank body
-        rotated_tank = pygame.transform.rotate(temp_surface, -self.angle) 
-        tank_rect = rotated_tank.get_rect(center=center_screen)
-        surface.blit(rotated_tank, tank_rect.topleft)
-        
-        if self.is_wreck:
-            # WRECK details: smoke circle and black hole
-            pygame.draw.circle(surface, WRECK_COLOR_SMOKE, center_screen, TANK_WIDTH // 3, 0)
-            pygame.draw.circle(surface, BLACK, center_screen, TANK_WIDTH // 6, 0)
-            return
-
-        # 3. Draw Turret and Gun Barrel (No Rotation needed, uses turret_angle)
-        
-        # Turret Base (A circle centered on the tank's screen center)
-        pygame.draw.circle(surface, DARK_GRAY, center_screen, TANK_WIDTH // 4)
-        
-        # Gun Barrel (Line from center to tip)
-        end_x = center_screen[0] + TURRET_LENGTH * math.cos(math.radians(self.turret_angle))
-        end_y = center_screen[1] - TURRET_LENGTH * math.sin(math.radians(self.turret_angle))
-        pygame.draw.line(surface, BLACK, center_screen, (end_x, end_y), TURRET_LINE_WIDTH)
-
-        # 4. Health Bar (Drawn above the tank)
-        health_bar_width, health_bar_height = TANK_WIDTH, 5
-        health_ratio = self.health / self.max_health
-        current_hp_width = int(health_bar_width * health_ratio)
-
-        hp_bg_rect = pygame.Rect(self.rect.left, self.rect.top - 10, health_bar_width, health_bar_height)
-        pygame.draw.rect(surface, RED, hp_bg_rect)
-        
-        hp_rect = pygame.Rect(self.rect.left, self.rect.top - 10, current_hp_width, health_bar_height)
-        pygame.draw.rect(surface, HP_BAR_GREEN, hp_rect)
 
 # ----------------------------------------------------
 # --- PLAYER TANK CLASS ---
 # ----------------------------------------------------
 class PlayerTank(Tank):
-    def __init__(self, x, y, fire_sound, explosion_sound):
-        super().__init__(x, y, 'Friendly', fire_sound, explosion_sound) 
+    def __init__(self, x, y):
+        super().__init__(x, y, 'Friendly') 
         # Player-specific settings
         self.drive_system = DEFAULT_DRIVE_SYSTEM
         self.control_keys = {
@@ -470,14 +444,26 @@ class PlayerTank(Tank):
             }
         }
         
-    def update(self, keys, mouse_pos, features):
+    def update(self, keys, mouse_pos, terrain):
         """Handles player input for movement, turret aiming, and decrements cooldown."""
+        # Determine target angle (uses mouse position relative to the tank's screen position)
+        dx_mouse = mouse_pos[0] - self.rect.centerx
+        dy_mouse = mouse_pos[1] - self.rect.centery
+        target_angle = atan2_deg(-dy_mouse, dx_mouse)
+        
+        self.update_with_aim(keys, target_angle, terrain)
+
+    def update_with_aim(self, keys, target_angle, terrain):
+        """
+        Movement, turret slew towards target_angle (degrees) and cooldown.
+        keys may be pygame's key state or a dict of key code -> pressed (used by the game server).
+        """
         
         # Pass the current drive system and control keys to the base class
         self.update_movement(
             keys, 
             is_player=True, 
-            features=features, 
+            terrain=terrain, 
             drive_system=self.drive_system,
             control_keys=self.control_keys[self.drive_system]
         )
@@ -488,11 +474,6 @@ class PlayerTank(Tank):
         if self.is_alive:
             # --- Constant Speed Turret Rotation ---
             
-            # 1. Determine target angle (uses mouse position relative to the tank's screen position)
-            dx_mouse = mouse_pos[0] - self.rect.centerx
-            dy_mouse = mouse_pos[1] - self.rect.centery
-            target_angle = math.degrees(math.atan2(-dy_mouse, dx_mouse))
-            
             # 2. Calculate the difference (shortest angular distance)
             current = self.turret_angle
             target = target_angle
@@ -523,19 +504,14 @@ class PlayerTank(Tank):
             # No longer using self.rotate_turret(target_angle) to allow smooth movement.
 
 # ...
-            
-    def fire(self, bullets_group): 
-        """Player fire method, calls base fire and uses its own coordinates for max volume."""
-        # FIX: Ensure we call the super method with the required world coordinates (self.x, self.y)
-        return super().fire(bullets_group, self.x, self.y) # <<< ADD 'return'
 
 # ----------------------------------------------------
 # --- ENEMY TANK CLASS ---
 # ----------------------------------------------------
 class EnemyTank(Tank):
     
-    def __init__(self, x, y, fire_sound, explosion_sound):
-        super().__init__(x, y, 'Enemy', fire_sound, explosion_sound)
+    def __init__(self, x, y):
+        super().__init__(x, y, 'Enemy')
         self.move_timer = 0
         self.ai_keys = {
             pygame.K_w: False, 
@@ -571,7 +547,7 @@ class EnemyTank(Tank):
 
         dx = target.x - self.x
         dy = target.y - self.y
-        target_angle = math.degrees(math.atan2(-dy, dx))
+        target_angle = atan2_deg(-dy, dx)
         
         current = self.turret_angle % 360
         target_norm = target_angle % 360
@@ -589,13 +565,15 @@ class EnemyTank(Tank):
         
         return is_aimed and is_in_range
         
-    # Update signature to accept ALL targets
-    def update(self, all_friendly_units, player_x, player_y, features, bullets_group): 
-        """Handles enemy AI movement, tracking, firing, and decrements cooldown."""
-        sound_event = None 
-        
+    def think(self, all_friendly_units, frames=1):
+        """
+        Sense/think phase: selects the closest target and this frame's drive keys.
+        Read-only (only this tank's own RNG advances), so it may run on a worker thread.
+        frames > 1 is a coarse update covering that many frames (tanks far from every observer).
+        Returns an AIDecision, or None for a dead tank.
+        """
         if not self.is_alive: 
-            return sound_event 
+            return None
 
         # 1. Select Target (Closest one)
         # 'all_friendly_units' must be a list containing the player and all friendly AI tanks
@@ -603,43 +581,65 @@ class EnemyTank(Tank):
         
         if not current_target:
             # No targets alive, stop processing
-            if self.fire_cooldown > 0: self.fire_cooldown -= 1
-            self.speed = 0.0
-            return sound_event 
-        
-        # 2. Decrement Cooldown
-        if self.fire_cooldown > 0:
-            self.fire_cooldown -= 1
+            return AIDecision(None, self.ai_keys, self.move_timer)
 
         # 3. AI Movement (Simple random movement cycle - keeping original for now)
-        self.move_timer -= 1
-        if self.move_timer <= 0:
-            self.move_timer = random.randint(30, 120) 
-            self.ai_keys = {pygame.K_w: False, pygame.K_r: False, pygame.K_a: False, pygame.K_s: False}
-            action = random.choice(['forward', 'turn_left', 'turn_right', 'stop'])
+        ai_keys = self.ai_keys
+        move_timer = self.move_timer - frames
+        if move_timer <= 0:
+            move_timer = self.rng.randint(30, 120) 
+            ai_keys = {pygame.K_w: False, pygame.K_r: False, pygame.K_a: False, pygame.K_s: False}
+            action = self.rng.choice(['forward', 'turn_left', 'turn_right', 'stop'])
             
             if action == 'forward':
-                self.ai_keys[pygame.K_w] = True
+                ai_keys[pygame.K_w] = True
             elif action == 'turn_left':
-                self.ai_keys[pygame.K_w] = True 
-                self.ai_keys[pygame.K_a] = True
+                ai_keys[pygame.K_w] = True 
+                ai_keys[pygame.K_a] = True
             elif action == 'turn_right':
-                self.ai_keys[pygame.K_w] = True 
-                self.ai_keys[pygame.K_s] = True
+                ai_keys[pygame.K_w] = True 
+                ai_keys[pygame.K_s] = True
+
+        return AIDecision(current_target, ai_keys, move_timer)
+
+    def apply_decision(self, decision, frames=1):
+        """Act phase (before movement): applies a think() result. Returns True if the tank moves this frame."""
+        if decision is None:
+            return False
+
+        # 2. Decrement Cooldown
+        if self.fire_cooldown > 0:
+            self.fire_cooldown = max(0, self.fire_cooldown - frames)
+
+        if not decision.target:
+            self.speed = 0.0
+            return False
+
+        self.ai_keys = decision.ai_keys
+        self.move_timer = decision.move_timer
+        return True
+
+    def act(self, decision, bullets_group, frames=1, clear_shot=True):
+        """
+        Act phase (after movement): tracks the turret towards the decided target and fires
+        (only if clear_shot: no terrain in the line of sight). Coarse updates (frames > 1)
+        snap the turret instead of slewing it. Returns True if it fired.
+        """
+        if not self.is_alive or decision is None or not decision.target: 
+            return False
+        current_target = decision.target
 
-        self.update_movement(self.ai_keys, is_player=False, features=features)
-        
         # 4. Turret Tracking (Aims at the SELECTED Target)
         dx = current_target.x - self.x
         dy = current_target.y - self.y
-        target_angle = math.degrees(math.atan2(-dy, dx))
+        target_angle = atan2_deg(-dy, dx)
         #self.rotate_turret(target_angle)
         # 2. Calculate the difference between current and target angle
         # Use modulo to ensure we find the shortest path (e.g., don't turn 350 degrees to the right when 10 to the left works)
         angle_diff = (target_angle - self.turret_angle + 180) % 360 - 180
 
         # 3. Rotate gradually instead of snapping
-        if abs(angle_diff) <= TURRET_ROTATION_SPEED:
+        if frames > 1 or abs(angle_diff) <= TURRET_ROTATION_SPEED:
             # If the difference is small, just snap to the target to avoid "jittering"
             self.turret_angle = target_angle
         else:
@@ -651,11 +651,20 @@ class EnemyTank(Tank):
 
         
         # 5. Firing 
-        if self._can_fire_at_target(current_target): 
-            # Firing uses the target's coordinates for volume calculation
-            sound_event = self.fire(bullets_group, player_x, player_y)
-                
-        return sound_event
+        if clear_shot and self._can_fire_at_target(current_target): 
+            return self.fire(bullets_group)
+        return False
+
+    # Update signature to accept ALL targets
+    def update(self, all_friendly_units, terrain, bullets_group): 
+        """Handles enemy AI movement, tracking, firing, and decrements cooldown (scalar path). Returns True if it fired."""
+        decision = self.think(all_friendly_units)
+        if not self.apply_decision(decision):
+            return False
+
+        self.update_movement(self.ai_keys, is_player=False, terrain=terrain)
+        
+        return self.act(decision, bullets_group)
 
 
 # ----------------------------------------------------
@@ -663,9 +672,9 @@ class EnemyTank(Tank):
 # ----------------------------------------------------
 class FriendlyAITank(Tank):
     
-    def __init__(self, x, y, fire_sound, explosion_sound):
+    def __init__(self, x, y):
         # Allegiance is 'Friendly'
-        super().__init__(x, y, 'Friendly', fire_sound, explosion_sound)
+        super().__init__(x, y, 'Friendly')
         self.move_timer = 0
         self.ai_keys = {
             pygame.K_w: False, 
@@ -698,7 +707,7 @@ class FriendlyAITank(Tank):
 
         dx = target.x - self.x
         dy = target.y - self.y
-        target_angle = math.degrees(math.atan2(-dy, dx))
+        target_angle = atan2_deg(-dy, dx)
         
         current = self.turret_angle % 360
         target_norm = target_angle % 360
@@ -716,71 +725,75 @@ class FriendlyAITank(Tank):
         
         return is_aimed and is_in_range
         
-    def update(self, all_enemy_units, player_x, player_y, features, bullets_group): 
-        """Handles friendly AI movement, tracking, firing, and decrements cooldown."""
-        # The player's coordinates (player_x, player_y) are passed for sound volume calculation
-        sound_event = None 
-        
-        if not self.is_alive: 
-            return sound_event 
+    def think(self, all_enemy_units, frames=1):
+        """
+        Sense/think phase: finds the nearest enemy and decides whether to advance.
+        Read-only, so it may run on a worker thread. Returns an AIDecision, or None for a dead tank.
+        """
+        if not self.is_alive:
+            return None
 
-        # 1. Select Target (Closest one) - Must be from all_enemy_units
-        current_target = self._find_target(all_enemy_units)
+        # 1. Target Acquisition (Find the nearest enemy)
+        nearest_enemy = self._find_target(all_enemy_units)
         
-        if not current_target:
-            # No targets alive, stop processing
-            if self.fire_cooldown > 0: self.fire_cooldown -= 1
-            self.speed = 0.0
-            # Ensure AI stops moving when no target is present
-            self.ai_keys = {pygame.K_w: False, pygame.K_r: False, pygame.K_a: False, pygame.K_s: False}
-            self.update_movement(self.ai_keys, is_player=False, features=features)
-            return sound_event 
-        
-        # 2. Decrement Cooldown
-        if self.fire_cooldown > 0:
-            self.fire_cooldown -= 1
+        # 2. Slow movement: Advance if the enemy is far, stop if they are close
+        ai_keys = {pygame.K_w: False, pygame.K_r: False, pygame.K_a: False, pygame.K_s: False}
+        if nearest_enemy:
+            dist_sq = (self.x - nearest_enemy.x)**2 + (self.y - nearest_enemy.y)**2
+            if dist_sq > (MAX_BULLET_RANGE * 0.75)**2:
+                ai_keys[pygame.K_w] = True
 
-        # 3. AI Movement (Simple random movement cycle)
-        self.move_timer -= 1
-        if self.move_timer <= 0:
-            self.move_timer = random.randint(30, 120) 
-            self.ai_keys = {pygame.K_w: False, pygame.K_r: False, pygame.K_a: False, pygame.K_s: False}
-            # Keep moving forward/turning to seek the target area
-            action = random.choice(['forward', 'turn_left', 'turn_right'])
+        return AIDecision(nearest_enemy, ai_keys, self.move_timer)
+
+    def apply_decision(self, decision, frames=1):
+        """Act phase (before movement): applies a think() result. Returns True if the tank moves this frame."""
+        if decision is None:
+            return False
+        # Friendly AI tanks use the default/standard movement update, even without a target
+        self.ai_keys = decision.ai_keys
+        return True
+
+    def act(self, decision, bullets_group, frames=1, clear_shot=True):
+        """Act phase (after movement): aims at the decided target, fires when in range and in sight, decrements cooldown. Returns True if it fired."""
+        fired = False
+
+        if not self.is_alive or decision is None:
+            return fired
+
+        nearest_enemy = decision.target
+        if nearest_enemy:
+            # Aim at the enemy
+            dx = nearest_enemy.x - self.x
+            dy = nearest_enemy.y - self.y
+            self.rotate_turret(atan2_deg(-dy, dx))
             
-            if action == 'forward':
-                self.ai_keys[pygame.K_w] = True
-            elif action == 'turn_left':
-                self.ai_keys[pygame.K_w] = True 
-                self.ai_keys[pygame.K_a] = True
-            elif action == 'turn_right':
-                self.ai_keys[pygame.K_w] = True 
-                self.ai_keys[pygame.K_s] = True
+            # Fire if target is within range, in sight and cooldown is 0
+            if clear_shot and dx**2 + dy**2 <= MAX_BULLET_RANGE**2 and self.fire_cooldown == 0:
+                fired = self.fire(bullets_group)
 
-        # AI tanks always use the simple, standard drive logic
-        self.update_movement(self.ai_keys, is_player=False, features=features)
-        
-        # 4. Turret Tracking (Aims at the SELECTED Enemy Target)
-        dx = current_target.x - self.x
-        dy = current_target.y - self.y
-        target_angle = math.degrees(math.atan2(-dy, dx))
-        self.rotate_turret(target_angle)
+        # Cooldown (a coarse update covers several frames)
+        if self.fire_cooldown > 0:
+            self.fire_cooldown = max(0, self.fire_cooldown - frames)
 
-        
-        # 5. Firing 
-        if self._can_fire_at_target(current_target): 
-            # Firing uses the player's coordinates for volume calculation
-            sound_event = self.fire(bullets_group, player_x, player_y)
-                
-        return sound_event
+        return fired
+
+    def update(self, all_enemy_units, terrain, bullets_group): 
+        """Handles friendly AI movement, tracking, firing, and decrements cooldown (scalar path). Returns True if it fired."""
+        decision = self.think(all_enemy_units)
+        if not self.apply_decision(decision):
+            return False
+
+        self.update_movement(self.ai_keys, is_player=False, terrain=terrain)
+
+        return self.act(decision, bullets_group)
 
 
 # ----------------------------------------------------
 # --- DUMMY ENEMY TANK CLASS ---
 # ----------------------------------------------------
 class DummyEnemyTank(Tank):
-    def __init__(self, x, y, fire_sound, explosion_sound):
-        super().__init__(x, y, 'Enemy', fire_sound, explosion_sound)
+    def __init__(self, x, y):
+        super().__init__(x, y, 'Enemy')
         self.move_timer = 0
         self.ai_keys = {
             pygame.K_w: False, 
@@ -789,13 +802,12 @@ class DummyEnemyTank(Tank):
             pygame.K_s: False
         }
 
-    def update(self, player_tank, features, bullets_group): 
-        """Handles enemy AI movement, tracking, firing, and decrements cooldown."""
-        # FIX: Initialize sound_event here to prevent NameError
-        sound_event = None 
+    def update(self, player_tank, terrain, bullets_group): 
+        """Handles enemy AI movement, tracking, firing, and decrements cooldown. Returns True if it fired."""
+        fired = False
         
         if not self.is_alive: 
-            return sound_event # Returns None
+            return fired
 
         # 1. Decrement Cooldown
         if self.fire_cooldown > 0:
@@ -822,25 +834,19 @@ class DummyEnemyTank(Tank):
                 """
 
         # AI tanks always use the simple, standard drive logic
-        self.update_movement(self.ai_keys, is_player=False, features=features)
+        self.update_movement(self.ai_keys, is_player=False, terrain=terrain)
         
         # 3. Turret Tracking (Aims at player)
         dx = player_tank.x - self.x
         dy = player_tank.y - self.y
-        target_angle = math.degrees(math.atan2(-dy, dx))
+        target_angle = atan2_deg(-dy, dx)
         self.rotate_turret(target_angle)
 
         
         # 4. Firing 
         if self.fire_cooldown == 0:
             if random.random() < 0.1: 
-                # Enemy firing must pass the player's world coordinates for volume calculation
-                # This call will now populate the local 'sound_event' variable.
-                sound_event = self.fire(bullets_group, player_tank.x, player_tank.y)
-
-                
-
-        # NOTE: update_movement and rotate_turret do not generate sound events
+                fired = self.fire(bullets_group)
         
-        return sound_event # <<< Return the sound event
+        return fired
 
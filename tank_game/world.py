@@ -0,0 +1,410 @@
+import random
+import pygame
+from .constants import *
+from .utilities import generate_chunk
+from .sprites import PlayerTank, EnemyTank, FriendlyAITank, DummyEnemyTank
+from .spatial import TerrainIndex, SpatialGrid, WorldBounds
+from .kinematics import step_ai_tanks
+from .pipeline import AIPipeline
+from .interest import InterestManager
+from .sightline import LineOfSight
+from .spawning import SpawnPlanner
+from .factions import FactionRegistry
+from .events import EventBus
+from .metrics import MatchMetrics
+from .chunks import ChunkActivation
+
+# ----------------------------------------------------
+# --- LEVEL SETTINGS ---
+# ----------------------------------------------------
+def get_enemy_count_for_level(level):
+    """Returns the number of enemies based on the current level."""
+    if level == 1:
+        return 3
+    elif level == 2:
+        return 6
+    elif level == 3:
+        return 10
+    elif level == 4:
+        return 15
+    elif level == 5:
+        return 20
+    # For levels beyond the max, use the max level count
+    return get_enemy_count_for_level(MAX_LEVEL)
+
+def get_friendly_count_for_level(level):
+    """Returns the number of friendlies based on the current level."""
+    if level == 1:
+        return 3
+    elif level == 2:
+        return 6
+    elif level == 3:
+        return 10
+    elif level == 4:
+        return 15
+    elif level == 5:
+        return 20
+    # For levels beyond the max, use the max level count
+    return get_friendly_count_for_level(MAX_LEVEL)
+
+def get_world_bounds_for_level(level):
+    """Returns the world bounds of a level (LEVEL_WORLD_SIZES, else DEFAULT_WORLD_SIZE)."""
+    return WorldBounds.centered(LEVEL_WORLD_SIZES.get(level, DEFAULT_WORLD_SIZE))
+
+# ----------------------------------------------------
+# --- WORLD CLASS ---
+# ----------------------------------------------------
+class World:
+    """
+    Headless simulation state: terrain, tanks and bullets, plus the per-frame update steps.
+    Needs no display, so it is shared by the local game loop (game.py) and the game server (server.py).
+    """
+    def __init__(self):
+        self.terrain_index = TerrainIndex() # Grid index over the terrain features (and the world bounds) for collision queries
+        self.bounds = self.terrain_index.bounds
+        self.terrain_seed = 0 # Chunks are generated from it, so unloaded ones come back identical
+        self.chunk_features = {} # (chunk_x, chunk_y) -> features of every loaded chunk (only those near units)
+        self.chunk_activation = ChunkActivation() # Which chunks the tanks, bullets and observers need
+        self.bullets = pygame.sprite.Group()
+        self.tanks = pygame.sprite.Group()
+        self.friendly_tanks = pygame.sprite.Group() # Friendly AI tanks only
+        self.all_friendly_tanks = pygame.sprite.Group() # Players and friendly AI tanks
+        self.factions = FactionRegistry() # Live members and counts per allegiance
+        self.events = EventBus() # Fire/hit/kill/chunk events of the simulation, drained by the game or server
+        self.metrics = MatchMetrics() # Combat statistics of the current level
+        self.events.subscribe(self.metrics.consume)
+        self.ai_pipeline = AIPipeline() # Thread pool for the AI sense/think phase
+        self.interest = InterestManager() # Level-of-detail tier of every tank (distance to the nearest observer)
+        self.tank_grid = SpatialGrid(BULLET_BROADPHASE_CELL_SIZE) # Live tanks, rebuilt for the bullet sweeps
+        self.line_of_sight = LineOfSight(self.terrain_index) # Per-frame memo of AI firing lines
+        self.lod_intervals = LOD_TIER_INTERVALS # Frames per AI update in each LOD tier (lowered by the quality governor)
+        self.frame = 0
+        self.next_tank_id = 0 # Stable ids for network replication
+        self.terrain_version = 0 # Bumped when all terrain is replaced (cached drawings of it are stale)
+        self.terrain_edits = [] # Features loaded or unloaded since then (cached drawings only need patching around them)
+
+        # Destroyed tanks leave every tank group and are baked into the static scenery
+        self.wrecks = [] # In order of destruction
+        self.wreck_chunks = {} # (chunk_x, chunk_y) of the wreck center -> wrecks
+
+    def clear(self, bounds=None, seed=None):
+        """
+        Removes all terrain, tanks, wrecks and bullets, and sets the world bounds (default: DEFAULT_WORLD_SIZE)
+        and the terrain seed (default: a random one) for the next level.
+        """
+        self.bounds = self.terrain_index.bounds = bounds or WorldBounds.centered(DEFAULT_WORLD_SIZE)
+        self.terrain_seed = random.getrandbits(32) if seed is None else seed
+        self.terrain_index.rebuild([])
+        self.chunk_features = {}
+        self.chunk_activation.clear()
+        self.terrain_version += 1
+        self.terrain_edits = []
+        self.wrecks = []
+        self.wreck_chunks = {}
+        self.factions.clear()
+        self.events.clear()
+        self.metrics.clear()
+        for bullet in self.bullets.sprites():
+            bullet.kill() # Returns the bullet to the pool
+        self.tanks.empty()
+        self.friendly_tanks.empty()
+        self.all_friendly_tanks.empty()
+        self.interest.clear()
+        self.frame = 0
+        self.next_tank_id = 0
+
+    def generate_chunks_around(self, world_x, world_y, radius=CHUNK_LOAD_RADIUS):
+        """Loads the chunks within `radius` chunks of a world position (e.g. the spawn area). Returns the new features."""
+        center_chunk_x = int(world_x) // CHUNK_SIZE
+        center_chunk_y = int(world_y) // CHUNK_SIZE
+        return self.load_chunks([(x, y) for y in range(center_chunk_y - radius, center_chunk_y + radius + 1)
+                                 for x in range(center_chunk_x - radius, center_chunk_x + radius + 1)])
+
+    def load_chunks(self, chunks):
+        """
+        Generates the given chunks that are not loaded yet (chunks entirely outside the world bounds are
+        skipped) in one batch: one index update and one terrain refresh. Returns the new features.
+        """
+        new_features = []
+        for x, y in chunks:
+            if (x, y) in self.chunk_features:
+                continue
+            left, top = x * CHUNK_SIZE, y * CHUNK_SIZE
+            if not self.bounds.overlaps(left, top, left + CHUNK_SIZE, top + CHUNK_SIZE):
+                continue
+            features = generate_chunk(x, y, self.bounds, self.terrain_seed)
+            self.chunk_features[(x, y)] = features
+            self.chunk_activation.loaded((x, y), self.frame)
+            new_features.extend(features)
+            self.events.emit(EVENT_CHUNK_LOADED, self.frame, left + CHUNK_SIZE / 2, top + CHUNK_SIZE / 2)
+        if new_features:
+            self.terrain_index.add(new_features)
+            self._terrain_edited(new_features)
+        return new_features
+
+    def unload_chunks(self, chunks):
+        """Unloads the given loaded chunks in one batch (one terrain refresh). Returns True if any were unloaded."""
+        removed = []
+        for chunk in chunks:
+            removed.extend(self.chunk_features.pop(chunk, ()))
+        if not removed:
+            return False
+        self.terrain_index.remove(removed)
+        self._terrain_edited(removed)
+        return True
+
+    def update_chunks(self, observers=()):
+        """
+        Keeps the terrain loaded around every live tank, bullet in flight and observer (list of (x, y), e.g.
+        a camera no tank is under), so collisions are correct wherever a unit is. Newly needed chunks are
+        generated at once; chunks no unit has needed for CHUNK_EVICT_DELAY frames are unloaded.
+        Does nothing between CHUNK_ACTIVATION_INTERVAL frames. Returns (new features, True if any chunk was unloaded).
+        """
+        if self.frame % CHUNK_ACTIVATION_INTERVAL:
+            return [], False
+        units = [(tank, tank.x, tank.y) for tank in self.tanks]
+        units.extend((bullet, bullet.x, bullet.y) for bullet in self.bullets)
+        units.extend((index, x, y) for index, (x, y) in enumerate(observers))
+        needed, expired = self.chunk_activation.update(units, self.frame)
+        new_features = self.load_chunks(needed) if needed else []
+        unloaded = self.unload_chunks(expired) if expired else False
+        return new_features, unloaded
+
+    def _terrain_edited(self, features):
+        """Records loaded or unloaded features for the renderer's cache, and refreshes what depends on the terrain."""
+        self.terrain_edits.extend(features)
+        if len(self.terrain_edits) > MAX_TERRAIN_EDITS:
+            self.terrain_version += 1 # Redrawing everything is cheaper than keeping a long edit log
+            self.terrain_edits = []
+        self.terrain_changed()
+
+    def terrain_changed(self):
+        """Drops everything derived from the terrain: bullet expiries are recomputed, cached sight lines forgotten."""
+        for bullet in self.bullets:
+            bullet.cast(self.terrain_index)
+        self.line_of_sight.clear()
+
+    def emit(self, kind, tank, other_id=EVENT_NO_SOURCE):
+        """Records a gameplay event at a tank's position (e.g. EVENT_FIRE after a player fired)."""
+        self.events.emit(kind, self.frame, tank.x, tank.y, tank.tank_id, other_id)
+
+    def bake_wreck(self, tank):
+        """
+        Moves a destroyed tank out of the simulation: it leaves every tank group (so no AI, interest,
+        collision or draw pass iterates it again) and is kept only as static scenery in the wreck lists.
+        """
+        tank.kill()
+        self.factions.killed(tank)
+        self.metrics.sample([tank]) # Its last movement, before it leaves the sampled tanks
+        self.wrecks.append(tank)
+        chunk = (int(tank.x) // CHUNK_SIZE, int(tank.y) // CHUNK_SIZE)
+        self.wreck_chunks.setdefault(chunk, []).append(tank)
+
+    def wrecks_near_chunk(self, chunk_x, chunk_y):
+        """Wrecks that may overlap a chunk (centered in it or in a neighbouring one)."""
+        for y in range(chunk_y - 1, chunk_y + 2):
+            for x in range(chunk_x - 1, chunk_x + 2):
+                yield from self.wreck_chunks.get((x, y), ())
+
+    def wrecks_within(self, x, y, radius):
+        """Wrecks whose center is within radius of a position."""
+        x0, x1 = int(x - radius) // CHUNK_SIZE, int(x + radius) // CHUNK_SIZE
+        y0, y1 = int(y - radius) // CHUNK_SIZE, int(y + radius) // CHUNK_SIZE
+        radius_sq = radius * radius
+        return [wreck for chunk_y in range(y0, y1 + 1) for chunk_x in range(x0, x1 + 1)
+                for wreck in self.wreck_chunks.get((chunk_x, chunk_y), ())
+                if (wreck.x - x) ** 2 + (wreck.y - y) ** 2 <= radius_sq]
+
+    def add_tank(self, tank):
+        """Adds a tank to the simulation and to its allegiance groups."""
+        tank.tank_id = self.next_tank_id
+        self.next_tank_id = (self.next_tank_id + 1) % 65536 # Fits the 16-bit id on the wire
+        self.tanks.add(tank)
+        self.factions.add(tank)
+        self.metrics.add_tank(tank)
+        if tank.allegiance == 'Friendly':
+            self.all_friendly_tanks.add(tank)
+        if isinstance(tank, FriendlyAITank):
+            self.friendly_tanks.add(tank)
+
+    def remove_tank(self, tank):
+        """Takes a live tank out of the simulation (e.g. a disconnected player's)."""
+        self.metrics.sample([tank])
+        tank.kill()
+        self.factions.remove(tank)
+
+    def spawn_planner(self, spawn_area_size):
+        """
+        Returns a SpawnPlanner for a spawn area around the world center, after loading every chunk that
+        overlaps it plus one ring around them (features are centered on their chunk's grid, so they can
+        stick out of it). Otherwise terrain loaded later under a placed tank could trap it.
+        """
+        half_size = (spawn_area_size * CHUNK_SIZE) // 2
+        first = -half_size // CHUNK_SIZE - 1
+        last = (half_size - 1) // CHUNK_SIZE + 1
+        self.load_chunks([(x, y) for y in range(first, last + 1) for x in range(first, last + 1)])
+        return SpawnPlanner(self.terrain_index.features, spawn_area_size, bounds=self.bounds)
+
+    def spawn_player(self, player_tank=None):
+        """
+        Places a player tank (new, or an existing one reset for a new level) near the world center.
+        The spawn area doubles until the tank fits; raises ValueError once it covers the whole world.
+        """
+        occupied = [(t.x, t.y) for t in self.tanks]
+        bounds = self.bounds
+        world_extent = max(-bounds.min_x, -bounds.min_y, bounds.max_x, bounds.max_y)
+        spawn_area_size = 1
+        while True:
+            planner = self.spawn_planner(spawn_area_size)
+            try:
+                (start_x, start_y), = planner.place(1, SPAWN_MIN_DISTANCE, occupied)
+                break
+            except ValueError:
+                if (spawn_area_size * CHUNK_SIZE) // 2 >= world_extent:
+                    raise
+                spawn_area_size *= 2
+        if player_tank is None:
+            player_tank = PlayerTank(start_x, start_y)
+        else:
+            player_tank.reset(start_x, start_y)
+        self.add_tank(player_tank)
+        return player_tank
+
+    def populate(self, level, num_dummies=0):
+        """Spawns the friendly and enemy AI tanks for a level (placed in one batch, clear of each other and the players)."""
+        tank_classes = ([FriendlyAITank] * get_friendly_count_for_level(level) +
+                        [EnemyTank] * get_enemy_count_for_level(level) +
+                        [DummyEnemyTank] * num_dummies)
+        occupied = [(t.x, t.y) for t in self.tanks]
+        planner = self.spawn_planner(spawn_area_size=4)
+        positions = planner.place(len(tank_classes), SPAWN_MIN_DISTANCE, occupied)
+        for tank_class, (x, y) in zip(tank_classes, positions):
+            self.add_tank(tank_class(x, y))
+
+    def update_interest(self, observers):
+        """
+        Sets this frame's observers (list of (x, y): players or the camera) and re-tiers the tanks.
+        Without a call, every tank counts as observed and is simulated at full rate.
+        """
+        self.interest.update(self.tanks, observers)
+
+    def update_ai(self):
+        """
+        Runs one frame of every AI tank: think (parallel), apply, batched move, line of sight, act.
+        Tanks in LOD tier n update only once every LOD_TIER_INTERVALS[n] frames (staggered
+        by tank id), with a timestep of that many frames. Shots are recorded as EVENT_FIRE events.
+        """
+        self.frame += 1
+        self.line_of_sight.clear()
+
+        # Target lists are built once per frame and shared (read-only) by every AI think()
+        friendly_units = self.factions.members('Friendly')
+        enemy_units = self.factions.members('Enemy')
+
+        # 1. SENSE/THINK: target selection and drive decisions for all AI tanks (parallel)
+        ai_jobs = []
+        for tank in self.tanks:
+            if isinstance(tank, EnemyTank):
+                targets = friendly_units
+            elif isinstance(tank, FriendlyAITank) and tank.is_alive:
+                targets = enemy_units
+            else:
+                continue
+            interval = self.lod_intervals[self.interest.tier(tank)]
+            if interval == 1 or (self.frame + tank.tank_id) % interval == 0:
+                ai_jobs.append((tank, targets, interval))
+        ai_decisions = self.ai_pipeline.think_all(ai_jobs)
+
+        # 2. APPLY: decisions are applied in tank order, independent of the thread count
+        ai_movers = []
+        ai_timesteps = []
+        for (tank, _, frames), decision in zip(ai_jobs, ai_decisions):
+            if tank.apply_decision(decision, frames):
+                ai_movers.append(tank)
+                ai_timesteps.append(frames)
+
+        # 3. MOVE: all AI tanks in one batched NumPy step (distant tiers take larger timesteps)
+        step_ai_tanks(ai_movers, self.terrain_index, ai_timesteps)
+
+        # 4. LINE OF SIGHT: one batched (memoized) query for every AI tank that could fire this frame
+        shooters = [i for i, ((tank, _, _), decision) in enumerate(zip(ai_jobs, ai_decisions))
+                    if decision is not None and decision.target and tank.fire_cooldown == 0]
+        clear_shots = [True] * len(ai_jobs)
+        pairs = [(ai_jobs[i][0], ai_decisions[i].target) for i in shooters]
+        for i, clear in zip(shooters, self.line_of_sight.check_many(pairs)):
+            clear_shots[i] = clear
+
+        # 5. ACT: turret tracking & firing (after movement)
+        for (tank, _, frames), decision, clear_shot in zip(ai_jobs, ai_decisions, clear_shots):
+            # Every shot is an event; the consumers attenuate it for their listener
+            if tank.act(decision, self.bullets, frames, clear_shot):
+                self.emit(EVENT_FIRE, tank)
+
+    def sample_metrics(self):
+        """Samples the tanks' movement for the combat statistics (call once per step: it runs every few)."""
+        if self.frame % METRICS_SAMPLE_INTERVAL == 0:
+            self.metrics.sample(self.tanks)
+
+    def write_metrics(self, path, level):
+        """Appends the level's combat statistics to a CSV file (pending events and movement are taken in first)."""
+        self.events.flush()
+        self.metrics.sample(self.tanks)
+        self.metrics.write(path, level, self.frame)
+
+    def save_poses(self):
+        """Saves every tank and bullet pose before a simulation step, for render interpolation."""
+        for tank in self.tanks:
+            tank.save_pose()
+        for bullet in self.bullets:
+            bullet.save_pose()
+
+    def update_bullets(self, frames=1):
+        """
+        Advances all bullets by `frames` frames.
+        Newly fired bullets are ray cast against the terrain once; after that each step is only
+        swept against the tanks, so a large step cannot tunnel through anything.
+        A bullet outside every observer's interest radius gets the whole rest of its flight resolved
+        once instead, then only moves until its impact (applied by resolve_hits()).
+        """
+        self.tank_grid.rebuild([t for t in self.tanks if t.is_alive])
+        step_reach = frames * BULLET_SPEED + TANK_BOUNDING_RADIUS
+        for bullet in self.bullets.sprites():
+            if bullet.expires_in is None:
+                bullet.cast(self.terrain_index)
+            if bullet.flight_left is None:
+                if self.interest.tier_at(bullet.x, bullet.y) > 0:
+                    nearby = self.tank_grid.query_radius(bullet.x, bullet.y, MAX_BULLET_RANGE + TANK_BOUNDING_RADIUS)
+                    bullet.resolve_flight(nearby)
+                else:
+                    nearby = self.tank_grid.query_radius(bullet.x, bullet.y, step_reach)
+                    bullet.resolve_flight(nearby, frames)
+            bullet.update(frames)
+
+    def resolve_hits(self):
+        """
+        Removes the bullets whose flight ended in the last update_bullets() and applies their damage,
+        recording EVENT_HIT (and EVENT_KILL when the tank is destroyed) events.
+        """
+        for bullet in self.bullets.sprites():
+            if bullet.flight_left is None or bullet.flight_left > 0:
+                continue
+            tank_hit = bullet.impact_tank
+            if tank_hit is not None and not tank_hit.is_alive:
+                # Destroyed by an earlier bullet: this one flies on (and is swept again)
+                bullet.flight_left = bullet.impact_tank = None
+                continue
+            bullet.kill()
+            if tank_hit is not None:
+                tank_hit.take_damage(BULLET_DAMAGE)
+                self.emit(EVENT_HIT, tank_hit, bullet.shooter_id)
+                if not tank_hit.is_alive:
+                    self.emit(EVENT_KILL, tank_hit, bullet.shooter_id)
+                    self.bake_wreck(tank_hit)
+
+    def enemies_left(self):
+        """Returns the number of live enemy tanks."""
+        return self.factions.live_count('Enemy')
+
+    def shutdown(self):
+        """Releases the AI worker threads."""
+        self.ai_pipeline.shutdown()
@@ -0,0 +1,42 @@
+import math
+
+import pytest
+
+from tank_game import fastmath
+from tank_game.constants import TRIG_TABLE_STEPS_PER_DEGREE
+
+
+@pytest.fixture
+def resolution():
+    """Sets a table resolution for one test and restores the game's afterwards."""
+    yield fastmath.set_resolution
+    fastmath.set_resolution(TRIG_TABLE_STEPS_PER_DEGREE)
+
+
+@pytest.mark.parametrize('steps', [1, 4, TRIG_TABLE_STEPS_PER_DEGREE, 100])
+def test_max_error_within_bound(resolution, steps):
+    resolution(steps)
+    assert fastmath.max_error() <= fastmath.error_bound() + 1e-12
+
+
+@pytest.mark.parametrize('steps', [1, 4, TRIG_TABLE_STEPS_PER_DEGREE])
+def test_bound_is_reached_half_a_step_off_the_grid(resolution, steps):
+    # The worst case: an angle halfway between two entries, where the slope of sine is steepest
+    resolution(steps)
+    step = 1.0 / steps
+    angle = step / 2
+    error = abs(fastmath.sin_deg(angle) - math.sin(math.radians(angle)))
+    assert error == pytest.approx(fastmath.error_bound(), rel=0.01)
+
+
+def test_bound_exceeds_old_estimate():
+    # sin(step / 2) understated the worst case
+    assert fastmath.error_bound(1) > math.sin(math.radians(0.5))
+
+
+def test_batched_lookup_matches_scalar():
+    np = pytest.importorskip('numpy')
+    angles = np.linspace(-720.0, 720.0, 1001)
+    sin, cos = fastmath.sin_cos_deg_array(angles)
+    assert sin.tolist() == [fastmath.sin_deg(a) for a in angles.tolist()]
+    assert cos.tolist() == [fastmath.cos_deg(a) for a in angles.tolist()]
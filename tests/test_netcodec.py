@@ -0,0 +1,106 @@
+import random
+
+import pytest
+
+from tank_game import netcodec
+from tank_game.constants import NET_NUMPY_MIN_ROWS, NET_SNAPSHOT_HISTORY
+from tank_game.netcodec import encode_frame, decode_frame, table_rows, SnapshotHistory
+
+
+def random_row(rng, tank_id):
+    return (tank_id, rng.randint(-80000, 80000), rng.randint(-80000, 80000), rng.randrange(360),
+            rng.randrange(360), rng.randrange(256), rng.randrange(8))
+
+def make_table(rows):
+    """A tank table in the representation snapshot_tanks() produces."""
+    rows = sorted(rows)
+    if netcodec.np is None:
+        return rows
+    return netcodec.np.array(rows, dtype=netcodec.TANK_DTYPE)
+
+def next_rows(rng, rows, next_id):
+    """One tick later: some tanks move (a few by more than an int16 offset), turn, get hit, die or appear."""
+    changed = []
+    for row in rows:
+        if rng.random() < 0.05:
+            continue # Removed
+        tank_id, x, y, angle, turret, health, flags = row
+        roll = rng.random()
+        if roll < 0.5:
+            x, y = x + rng.randint(-40, 40), y + rng.randint(-40, 40)
+        elif roll < 0.55:
+            x, y = x + rng.choice((-1, 1)) * 40000, y - rng.choice((-1, 1)) * 40000 # Beyond the int16 range
+        if rng.random() < 0.3:
+            angle, turret = (angle + rng.randint(1, 10)) % 360, rng.randrange(360)
+        if rng.random() < 0.1:
+            health, flags = max(0, health - rng.randint(1, 50)), rng.randrange(8)
+        changed.append((tank_id, x, y, angle, turret, health, flags))
+    for _ in range(rng.randint(0, 3)):
+        changed.append(random_row(rng, next_id))
+        next_id += 1
+    return changed, next_id
+
+
+@pytest.mark.parametrize('num_tanks', [3, NET_NUMPY_MIN_ROWS - 1, NET_NUMPY_MIN_ROWS, 200])
+def test_delta_stream_round_trips(num_tanks):
+    # Sender and receiver as in server.py/client.py, with acknowledgements that lag, get lost,
+    # or fall out of the sender's history (which forces a full frame)
+    rng = random.Random(num_tanks)
+    rows = [random_row(rng, tank_id) for tank_id in range(1, num_tanks + 1)]
+    next_id = num_tanks + 1
+    sent, received = SnapshotHistory(), SnapshotHistory()
+    acked_tick = 0
+    for tick in range(1, 120):
+        rows, next_id = next_rows(rng, rows, next_id)
+        tanks = make_table(rows)
+        base_tanks = sent.get(acked_tick)
+        base_tick = acked_tick if base_tanks is not None else 0
+        payload = encode_frame(tick, tanks, [], [], base_tick, base_tanks)
+        sent.add(tick, tanks)
+
+        decoded_tick, table, _, _ = decode_frame(payload, received)
+        received.add(decoded_tick, table)
+        assert decoded_tick == tick
+        assert table_rows(table) == sorted(rows)
+
+        roll = rng.random()
+        if roll < 0.6:
+            acked_tick = max(0, tick - rng.randint(0, 4))
+        elif roll < 0.65:
+            acked_tick = max(0, tick - NET_SNAPSHOT_HISTORY - 1) # Too old: the next frame is full
+
+
+@pytest.mark.parametrize('num_tanks', [3, NET_NUMPY_MIN_ROWS - 1, NET_NUMPY_MIN_ROWS, 200])
+def test_numpy_and_tuple_diffs_encode_the_same_bytes(monkeypatch, num_tanks):
+    pytest.importorskip('numpy')
+    rng = random.Random(num_tanks)
+    base_rows = [random_row(rng, tank_id) for tank_id in range(1, num_tanks + 1)]
+    rows, _ = next_rows(rng, base_rows, num_tanks + 1)
+    tanks, base_tanks = make_table(rows), make_table(base_rows)
+
+    payloads = []
+    for threshold in (0, 10 ** 9): # Every table through NumPy, then every table as tuples
+        monkeypatch.setattr(netcodec, 'NET_NUMPY_MIN_ROWS', threshold)
+        payloads.append((encode_frame(2, tanks, [], [], 1, base_tanks), encode_frame(2, tanks, [], [])))
+    assert payloads[0] == payloads[1]
+
+
+def test_full_frame_decodes_without_history():
+    rng = random.Random(0)
+    rows = [random_row(rng, tank_id) for tank_id in range(1, 50)]
+    bullets = [(rng.randint(-8000, 8000), rng.randint(-8000, 8000), rng.randrange(2)) for _ in range(5)]
+    events = [(rng.randrange(3), rng.randint(-8000, 8000), rng.randint(-8000, 8000), rng.randrange(256))]
+    payload = encode_frame(7, make_table(rows), bullets, events)
+
+    tick, table, bullet_rows, event_rows = decode_frame(payload, SnapshotHistory())
+    assert tick == 7
+    assert table_rows(table) == sorted(rows)
+    assert [tuple(row) for row in bullet_rows] == bullets
+    assert [tuple(row) for row in event_rows] == events
+
+
+def test_delta_against_unknown_baseline_is_rejected():
+    rows = [random_row(random.Random(0), 1)]
+    payload = encode_frame(5, make_table(rows), [], [], 3, make_table(rows))
+    with pytest.raises(KeyError):
+        decode_frame(payload, SnapshotHistory())
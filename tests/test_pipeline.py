@@ -0,0 +1,42 @@
+import os
+import random
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pytest
+
+from tank_game.constants import *
+from tank_game.pipeline import AIPipeline
+from tank_game.sprites import EnemyTank, FriendlyAITank
+from tank_game.world import World
+
+
+def run_battle(workers, num_tanks=80, frames=120, seed=3):
+    """Final state of a headless AI battle whose think phase runs on `workers` threads."""
+    random.seed(seed)
+    world = World()
+    world.ai_pipeline.shutdown()
+    world.ai_pipeline = AIPipeline(workers, min_parallel=1) # Parallel even for a small battle
+    world.clear(seed=seed)
+    world.generate_chunks_around(0, 0)
+    planner = world.spawn_planner(spawn_area_size=4)
+    for i, (x, y) in enumerate(planner.place(num_tanks, SPAWN_MIN_DISTANCE)):
+        world.add_tank((FriendlyAITank if i % 2 else EnemyTank)(x, y))
+    for _ in range(frames):
+        world.update_ai()
+        world.update_bullets()
+        world.resolve_hits()
+        world.update_chunks()
+        world.events.flush()
+    state = sorted((t.tank_id, t.x, t.y, t.angle, t.turret_angle, t.health, t.is_alive) for t in world.tanks)
+    bullets = sorted((b.x, b.y) for b in world.bullets)
+    fired = world.events.totals[EVENT_FIRE]
+    world.shutdown()
+    return state, bullets, fired
+
+
+@pytest.mark.parametrize('workers', [2, 8])
+def test_outcome_does_not_depend_on_worker_count(workers):
+    serial = run_battle(1)
+    assert serial[2] > 0 # The tanks did fight
+    assert run_battle(workers) == serial
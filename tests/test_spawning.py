@@ -0,0 +1,28 @@
+import os
+import random
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+import pytest
+
+from tank_game.constants import *
+from tank_game.world import World, get_world_bounds_for_level
+
+
+@pytest.mark.parametrize('seed', range(30))
+def test_spawned_tanks_clear_of_terrain_loaded_under_them(seed):
+    random.seed(seed)
+    level = 5
+    world = World()
+    world.clear(get_world_bounds_for_level(level), seed=seed)
+    world.generate_chunks_around(0, 0)
+    world.spawn_player()
+    world.populate(level)
+    world.update_chunks() # Loads the chunks around every placed tank
+
+    box = pygame.Rect(0, 0, TANK_WIDTH, TANK_HEIGHT)
+    for tank in world.tanks:
+        box.center = (tank.x, tank.y)
+        assert not world.terrain_index.collides(box), (type(tank).__name__, tank.x, tank.y)
+    world.shutdown()